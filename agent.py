@@ -1,71 +1,39 @@
-from langchain_openai import ChatOpenAI
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from typing import TypedDict, List, Dict, Optional
-from langgraph.graph import END, StateGraph
+from typing import Annotated, TypedDict, List, Dict, Optional, get_type_hints
+from langgraph.graph import END, START, StateGraph
 from datetime import datetime, timedelta
-from enum import Enum
 import json
+import os
 import uuid
 from dotenv import load_dotenv
 
+import resources
+from db import PersistenceError
+from goal_retrieval import stress_band
+from habits import HabitTracker, empty_habits
+from availability import events_from_ics, plan_time_blocks
+from next_action import NextActionQueue, describe
+from scheduler import schedule_day, schedule_more, unschedule
+from suggestions import available_minutes, candidate_goals, open_minutes, suggest_tasks
+from task_store import TaskStore
+# Enums and Task are shared with the helper modules (see task_types.py)
+from task_types import OPEN_STATUSES, EnergyLevel, MoodLevel, Task, TaskPriority, TaskStatus
+
 load_dotenv()
 
-# Initialize components
-embeddings = OpenAIEmbeddings()
-llm = ChatOpenAI(temperature=0.7)
-
-# Load existing vector store (your goal memory)
-try:
-    vectorstore = FAISS.load_local("goal_memory_index", embeddings, allow_dangerous_deserialization=True)
-    print("✅ Loaded existing goal memory")
-except FileNotFoundError:
-    vectorstore = FAISS.from_texts(["Personal goals and habits"], embeddings)
-    print("🆕 Created new goal memory")
-
-# Enums for better type safety
-class MoodLevel(Enum):
-    VERY_LOW = 1
-    LOW = 2
-    NEUTRAL = 3
-    GOOD = 4
-    EXCELLENT = 5
-
-class EnergyLevel(Enum):
-    EXHAUSTED = 1
-    LOW = 2
-    MODERATE = 3
-    HIGH = 4
-    PEAK = 5
-
-class TaskPriority(Enum):
-    LOW = 1
-    MEDIUM = 2
-    HIGH = 3
-    URGENT = 4
-
-class TaskStatus(Enum):
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    MISSED = "missed"
-    RESCHEDULED = "rescheduled"
+# Embeddings, LLM and goal memory are built lazily on first use; see resources.py.
+_LAZY_RESOURCES = {
+    "embeddings": resources.get_embeddings,
+    "llm": resources.get_llm,
+    "vectorstore": resources.get_vectorstore,
+}
 
-# Data structures
-class Task(TypedDict):
-    id: str
-    title: str
-    description: str
-    priority: TaskPriority
-    estimated_time: int  # minutes
-    category: str  # work, personal, health, learning
-    deadline: Optional[str]
-    energy_required: EnergyLevel
-    status: TaskStatus
-    created_at: str
-    completed_at: Optional[str]
-    user_created: bool  # NEW: Track if user created this task
+def __getattr__(name):
+    """Keep `agent.llm`, `agent.embeddings` and `agent.vectorstore` working without eager init"""
+    if name in _LAZY_RESOURCES:
+        return _LAZY_RESOURCES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+# Data structures
 class UserProfile(TypedDict):
     name: str
     timezone: str
@@ -85,22 +53,141 @@ class DailyContext(TypedDict):
     weather: Optional[str]
     stress_level: int  # 1-10
 
+# State reducers. Nodes and task helpers return only the keys they change;
+# list fields are append-only channels, so a step sends just its new items
+# instead of a copy of the whole state.
+class Replace(list):
+    """Wrap a list update to overwrite a list field instead of appending to it"""
+
+def append_items(previous: List, update: List) -> List:
+    """Append-semantics reducer for list fields
+    
+    Returns a new list: the previous value may be shared with earlier
+    checkpoints and snapshots, so it is never modified.
+    """
+    if isinstance(update, Replace) or previous is None:
+        return list(update)
+    return previous + list(update)
+
+def merge_tasks(previous: List[Task], update: List[Task]) -> List[Task]:
+    """Reducer for the plan's task lists: like `append_items`, but a task whose
+    id is already listed replaces the old copy in place
+    
+    An edit then sends just the tasks it added or changed (e.g. completed).
+    """
+    if isinstance(update, Replace) or previous is None:
+        return list(update)
+    changes = {task["id"]: task for task in update}
+    merged = [changes.pop(task["id"], task) for task in previous] if changes else list(previous)
+    return merged + list(changes.values())
+
+def latest_status(previous: str, update: str) -> str:
+    """Parallel nodes each report a status; keep the most recent one"""
+    return update
+
 # Main Agent State
 class LifeCoachState(TypedDict):
     user_profile: UserProfile
     daily_context: DailyContext
-    current_tasks: List[Task]
-    completed_tasks: List[Task]
-    missed_tasks: List[Task]
+    current_tasks: Annotated[List[Task], merge_tasks]
+    completed_tasks: Annotated[List[Task], append_items]
+    missed_tasks: Annotated[List[Task], append_items]
     goals: List[str]
-    habits_tracking: Dict[str, List[bool]]  # habit_name: [day1, day2, ...]
+    habits_tracking: Dict  # bit-packed history, see habits.HabitTracker.to_dict
     motivation_message: str
-    daily_todo_list: List[Task]
+    daily_todo_list: Annotated[List[Task], merge_tasks]
     reflection_insights: str
     next_action: str
-    agent_status: str
+    agent_status: Annotated[str, latest_status]
     user_input_mode: bool  # NEW: Flag for user input mode
     pending_user_tasks: List[Dict]  # NEW: Store user's custom tasks
+    schedule: Dict  # tasks packed into time blocks, see scheduler.schedule_day
+
+STATE_REDUCERS = {
+    key: hint.__metadata__[0]
+    for key, hint in get_type_hints(LifeCoachState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+def apply_update(state: LifeCoachState, update: Dict) -> LifeCoachState:
+    """Merge a partial update into a state outside the graph, using the graph's reducers"""
+    for key, value in update.items():
+        reducer = STATE_REDUCERS.get(key)
+        state[key] = reducer(state.get(key), value) if reducer else value
+    return state
+
+# =============================================================================
+# STATE CONSTRUCTION
+# =============================================================================
+
+def make_time_blocks(hours: int, start: Optional[datetime] = None) -> List[Dict[str, str]]:
+    """Split the available hours into 2-hour blocks starting at the current hour"""
+    available_time_blocks = []
+    current_time = (start or datetime.now()).replace(minute=0, second=0, microsecond=0)
+    
+    for i in range(0, hours, 2):  # 2-hour blocks
+        block_duration = min(2, hours - i)
+        start_time = current_time + timedelta(hours=i)
+        end_time = start_time + timedelta(hours=block_duration)
+        available_time_blocks.append({
+            "start": start_time.strftime("%I:%M %p"),
+            "end": end_time.strftime("%I:%M %p")
+        })
+    
+    return available_time_blocks
+
+DEFAULT_SLEEP_SCHEDULE = {"bedtime": "11:00 PM", "wake_time": "7:00 AM"}
+DEFAULT_WORK_SCHEDULE = {"days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], "hours": ["9 AM", "5 PM"]}
+
+def events_on(events: List[Dict[str, str]], day: str) -> List[Dict[str, str]]:
+    """Calendar events overlapping the given YYYY-MM-DD day"""
+    return [event for event in events if event["start"][:10] <= day <= event["end"][:10]]
+
+def build_initial_state(user_data: Dict, goals: List[str], custom_tasks: List[Dict]) -> LifeCoachState:
+    """Initial graph state from the collected user data, goals and custom tasks"""
+    # Create user profile
+    user_profile = UserProfile(
+        name=user_data["name"],
+        timezone="Local",
+        sleep_schedule=dict(DEFAULT_SLEEP_SCHEDULE),
+        work_schedule={key: list(value) for key, value in DEFAULT_WORK_SCHEDULE.items()},
+        gym_schedule=["Monday", "Wednesday", "Friday"],
+        personality_traits=["motivated", "goal-oriented"],
+        motivation_style=user_data.get("motivation_style", "encouraging"),
+        procrastination_patterns={}
+    )
+    
+    # Create daily context
+    daily_context = DailyContext(
+        date=datetime.now().strftime("%Y-%m-%d"),
+        mood=user_data["mood"],
+        energy=user_data["energy"],
+        available_time_blocks=user_data["available_time_blocks"],
+        calendar_events=user_data.get("calendar_events", []),
+        weather="Unknown",
+        stress_level=user_data["stress_level"]
+    )
+    
+    # Create initial state
+    initial_state = LifeCoachState(
+        user_profile=user_profile,
+        daily_context=daily_context,
+        current_tasks=[],
+        completed_tasks=[],
+        missed_tasks=[],
+        goals=goals,
+        habits_tracking=user_data.get("habits_tracking") or empty_habits(),
+        motivation_message="",
+        daily_todo_list=[],
+        reflection_insights="",
+        next_action="",
+        agent_status="initialized",
+        user_input_mode=True,
+        pending_user_tasks=custom_tasks,
+        schedule={"blocks": [], "unscheduled": []}
+    )
+    
+    return initial_state
 
 # =============================================================================
 # USER INTERACTION FUNCTIONS
@@ -139,26 +226,30 @@ class LifeCoachInterface:
         print("\nHow many hours do you have available today for tasks?")
         available_hours = input("Hours (e.g., 4): ") or "4"
         
-        # Create time blocks based on available hours
-        available_time_blocks = []
-        hours = int(float(available_hours))
-        current_time = datetime.now().replace(minute=0, second=0, microsecond=0)
+        # Calendar events (.ics) are blocked out along with sleep and work hours
+        calendar_path = input("Calendar file (.ics, optional): ").strip() or os.getenv("LIFE_COACH_CALENDAR", "")
+        calendar_events = []
+        if calendar_path:
+            try:
+                calendar_events = events_on(events_from_ics([calendar_path]), datetime.now().strftime("%Y-%m-%d"))
+                print(f"📅 {len(calendar_events)} calendar event(s) today")
+            except (OSError, ValueError) as error:
+                print(f"⚠️  Could not read calendar: {error}")
         
-        for i in range(0, hours, 2):  # 2-hour blocks
-            block_duration = min(2, hours - i)
-            start_time = current_time + timedelta(hours=i)
-            end_time = start_time + timedelta(hours=block_duration)
-            available_time_blocks.append({
-                "start": start_time.strftime("%I:%M %p"),
-                "end": end_time.strftime("%I:%M %p")
-            })
+        # Create time blocks from today's free time
+        available_time_blocks = plan_time_blocks(
+            DEFAULT_SLEEP_SCHEDULE, DEFAULT_WORK_SCHEDULE, calendar_events, float(available_hours)
+        )
+        if not available_time_blocks:
+            print("🌙 No free time left today outside sleep, work and calendar events")
         
         return {
             "name": name,
             "mood": mood,
             "energy": energy,
             "stress_level": stress_level,
-            "available_time_blocks": available_time_blocks
+            "available_time_blocks": available_time_blocks,
+            "calendar_events": calendar_events
         }
     
     def get_user_goals(self):
@@ -234,6 +325,36 @@ class LifeCoachInterface:
             print(f"   📊 {task['priority'].name} priority | 📂 {task['category']}")
             print()
     
+    def display_schedule(self, schedule: Optional[Dict]):
+        """Display the tasks packed into each time block"""
+        if not schedule or not schedule["blocks"]:
+            return
+        
+        print("\n🗓️  YOUR SCHEDULE:")
+        print("=" * 50)
+        
+        for block in schedule["blocks"]:
+            print(f"{block['start']} - {block['end']} (⚡ energy {block['energy']}/5, {block['free_minutes']} min free)")
+            for entry in block["tasks"]:
+                print(f"   {entry['start']} - {entry['end']}  {entry['title']}")
+        if schedule["unscheduled"]:
+            print(f"⏳ {len(schedule['unscheduled'])} task(s) don't fit today")
+    
+    def display_habits(self, tracker: HabitTracker):
+        """Display streaks and recent adherence for every habit"""
+        if not tracker.habits:
+            return
+        
+        print("\n🔁 YOUR HABITS:")
+        print("=" * 50)
+        
+        streaks = tracker.streaks()
+        adherence = tracker.adherence()
+        for name in tracker.habits:
+            rates = adherence[name]
+            print(f"{name}: 🔥 {streaks[name]['current']} day streak (best {streaks[name]['longest']}), "
+                  f"{rates[7]:.0%} last 7 days, {rates[30]:.0%} last 30 days")
+    
     def interactive_session(self):
         """Run an interactive session with the user"""
         # Get user input
@@ -241,48 +362,7 @@ class LifeCoachInterface:
         goals = self.get_user_goals()
         custom_tasks = self.get_custom_tasks()
         
-        # Create user profile
-        user_profile = UserProfile(
-            name=user_data["name"],
-            timezone="Local",
-            sleep_schedule={"bedtime": "11:00 PM", "wake_time": "7:00 AM"},
-            work_schedule={"days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], "hours": ["9 AM", "5 PM"]},
-            gym_schedule=["Monday", "Wednesday", "Friday"],
-            personality_traits=["motivated", "goal-oriented"],
-            motivation_style="encouraging",
-            procrastination_patterns={}
-        )
-        
-        # Create daily context
-        daily_context = DailyContext(
-            date=datetime.now().strftime("%Y-%m-%d"),
-            mood=user_data["mood"],
-            energy=user_data["energy"],
-            available_time_blocks=user_data["available_time_blocks"],
-            calendar_events=[],
-            weather="Unknown",
-            stress_level=user_data["stress_level"]
-        )
-        
-        # Create initial state
-        initial_state = LifeCoachState(
-            user_profile=user_profile,
-            daily_context=daily_context,
-            current_tasks=[],
-            completed_tasks=[],
-            missed_tasks=[],
-            goals=goals,
-            habits_tracking={},
-            motivation_message="",
-            daily_todo_list=[],
-            reflection_insights="",
-            next_action="",
-            agent_status="initialized",
-            user_input_mode=True,
-            pending_user_tasks=custom_tasks
-        )
-        
-        return initial_state
+        return build_initial_state(user_data, goals, custom_tasks)
 
 # =============================================================================
 # ENHANCED NODES WITH USER TASK INTEGRATION
@@ -312,7 +392,6 @@ def user_task_integrator_node(state: LifeCoachState) -> LifeCoachState:
         user_tasks.append(task)
     
     return {
-        **state,
         "current_tasks": user_tasks,
         "agent_status": "User tasks integrated"
     }
@@ -321,65 +400,42 @@ def enhanced_task_generator_node(state: LifeCoachState) -> LifeCoachState:
     """Enhanced task generator that respects user tasks"""
     
     daily_context = state["daily_context"]
-    goals = state["goals"]
     user_tasks = state["current_tasks"]  # User's custom tasks
     
-    # Start with user tasks
-    all_tasks = user_tasks.copy()
-    task_counter = len(user_tasks) + 1
-    
-    # Add AI-suggested tasks only if there's room
-    total_user_time = sum(task["estimated_time"] for task in user_tasks)
-    available_time = sum(2 * 60 for _ in daily_context["available_time_blocks"])  # 2 hours per block in minutes
-    remaining_time = available_time - total_user_time
-    
-    if remaining_time > 30:  # At least 30 minutes left
-        # Add goal-based tasks if user has goals
-        for goal in goals[:1]:  # Only 1 additional goal task
-            if remaining_time > 45:
-                goal_task = Task(
-                    id=f"ai_task_{task_counter}",
-                    title=f"Progress: {goal[:25]}...",
-                    description=f"Take a step towards: {goal}",
-                    priority=TaskPriority.MEDIUM,
-                    estimated_time=30,
-                    category="personal",
-                    deadline=None,
-                    energy_required=EnergyLevel.MODERATE,
-                    status=TaskStatus.PENDING,
-                    created_at=datetime.now().isoformat(),
-                    completed_at=None,
-                    user_created=False
-                )
-                all_tasks.append(goal_task)
-                remaining_time -= 30
-                task_counter += 1
-    
-    # Add wellness task if stressed
-    if daily_context["stress_level"] >= 6 and remaining_time > 15:
-        wellness_task = Task(
-            id=f"ai_task_{task_counter}",
-            title="Stress Relief Break",
-            description="Take time for yourself - breathe, walk, or relax",
-            priority=TaskPriority.HIGH,
-            estimated_time=15,
-            category="health",
-            deadline=None,
-            energy_required=EnergyLevel.LOW,
-            status=TaskStatus.PENDING,
-            created_at=datetime.now().isoformat(),
-            completed_at=None,
-            user_created=False
-        )
-        all_tasks.append(wellness_task)
+    # AI suggestions are appended after the user's tasks
+    remaining_time = available_minutes(daily_context) - open_minutes(user_tasks)
+    goals = candidate_goals(state) if remaining_time > 30 else []
+    ai_tasks = suggest_tasks(daily_context, goals, remaining_time, {task["id"] for task in user_tasks})
     
+    # the to-do list is rebuilt on every run, so a replan never duplicates it
     return {
-        **state,
-        "daily_todo_list": all_tasks,
-        "current_tasks": all_tasks,
+        "daily_todo_list": Replace(user_tasks + ai_tasks),
+        "current_tasks": ai_tasks,
         "agent_status": "Enhanced tasks generated with user input"
     }
 
+def plan_schedule(state: LifeCoachState) -> Dict:
+    """Pack today's open tasks into the available time blocks"""
+    daily_context = state["daily_context"]
+    open_tasks = [task for task in state["current_tasks"] if task["status"] in OPEN_STATUSES]
+    return schedule_day(open_tasks, daily_context["available_time_blocks"],
+                        daily_context["energy"], daily_context["date"])
+
+def scheduler_node(state: LifeCoachState) -> LifeCoachState:
+    """Assigns tasks to time blocks by priority, deadline and energy"""
+    return {
+        "schedule": plan_schedule(state),
+        "agent_status": "Tasks scheduled into time blocks"
+    }
+
+def next_action_node(state: LifeCoachState) -> LifeCoachState:
+    """Picks the single best task to start now"""
+    queue = NextActionQueue(state["current_tasks"], state["daily_context"]["energy"])
+    return {
+        "next_action": describe(queue.peek()),
+        "agent_status": "Next action selected"
+    }
+
 def context_analyzer_node(state: LifeCoachState) -> LifeCoachState:
     """Analyzes current context and mood to understand the user's situation"""
     
@@ -403,11 +459,50 @@ def context_analyzer_node(state: LifeCoachState) -> LifeCoachState:
         context_analysis += "\n🧘 High stress detected - prioritizing self-care"
     
     return {
-        **state,
         "reflection_insights": context_analysis,
         "agent_status": "Context analyzed"
     }
 
+# Set LIFE_COACH_LLM_COACHING=1 to have the LLM write the coaching message
+LLM_COACHING = os.getenv("LIFE_COACH_LLM_COACHING", "0") == "1"
+
+def build_coaching_prompt(state: LifeCoachState) -> str:
+    """Name-free prompt so cached answers can be reused across users with similar days"""
+    daily_context = state["daily_context"]
+    user_tasks = [t for t in state["current_tasks"] if t.get("user_created", False)]
+    ai_tasks = len(state["current_tasks"]) - len(user_tasks)
+    
+    return (
+        "You are a warm personal life coach. Write a short motivational message (max 80 words) "
+        "for someone about to start their day. Address them as {name} (keep the braces). "
+        f"Mood: {daily_context['mood'].name.lower()}. Energy: {daily_context['energy'].name.lower()}. "
+        f"Stress: {stress_band(daily_context['stress_level'])}. "
+        f"They planned {len(user_tasks)} tasks themselves and you suggested {ai_tasks}. "
+        f"Coaching style: {state['user_profile']['motivation_style']}."
+    )
+
+def coaching_bucket(state: LifeCoachState) -> str:
+    """The structured context a coaching message is written for; cached
+    messages are only reused within the same bucket"""
+    daily_context = state["daily_context"]
+    return "|".join([
+        daily_context["mood"].name,
+        daily_context["energy"].name,
+        stress_band(daily_context["stress_level"]),
+        state["user_profile"]["motivation_style"],
+    ])
+
+def generate_coaching_message(state: LifeCoachState) -> str:
+    """LLM coaching text, served from the response cache for repeat contexts"""
+    prompt = build_coaching_prompt(state)
+    bucket = coaching_bucket(state)
+    cache = resources.get_response_cache()
+    message = cache.get(prompt, bucket)
+    if message is None:
+        message = resources.get_llm_scheduler().invoke(prompt).content
+        cache.put(prompt, message, bucket)
+    return message.replace("{name}", state["user_profile"]["name"])
+
 def motivation_coach_node(state: LifeCoachState) -> LifeCoachState:
     """Generates personalized motivational messages"""
     
@@ -449,8 +544,13 @@ def motivation_coach_node(state: LifeCoachState) -> LifeCoachState:
         You've got this, {name}!
         """
     
+    if LLM_COACHING:
+        try:
+            coaching_message = generate_coaching_message(state)
+        except Exception as error:  # keep the template message if the LLM is unreachable
+            print(f"⚠️  LLM coaching unavailable: {error}")
+    
     return {
-        **state,
         "motivation_message": coaching_message,
         "agent_status": "Motivation message ready"
     }
@@ -459,56 +559,140 @@ def motivation_coach_node(state: LifeCoachState) -> LifeCoachState:
 # ENHANCED GRAPH CONSTRUCTION
 # =============================================================================
 
-def create_enhanced_life_coach_graph():
-    """Creates the enhanced Life Coach Agent workflow with user integration"""
+# Each node lists the nodes whose output it reads. Nodes without
+# dependencies start together; a node runs once all its dependencies are
+# done, so latency is bounded by the longest chain, not the sum of nodes.
+GRAPH_NODES = {
+    "context_analyzer": context_analyzer_node,
+    "user_task_integrator": user_task_integrator_node,
+    "enhanced_task_generator": enhanced_task_generator_node,
+    "motivation_coach": motivation_coach_node,
+    "scheduler": scheduler_node,
+    "next_action": next_action_node,
+}
+
+NODE_DEPENDENCIES = {
+    "context_analyzer": [],                               # daily_context, user_profile
+    "user_task_integrator": [],                           # pending_user_tasks
+    "enhanced_task_generator": ["user_task_integrator"],  # current_tasks
+    "motivation_coach": ["enhanced_task_generator"],      # current_tasks
+    "scheduler": ["enhanced_task_generator"],             # current_tasks, daily_context
+    "next_action": ["enhanced_task_generator"],           # current_tasks, daily_context
+}
+
+def create_enhanced_life_coach_graph(checkpointer=None):
+    """Creates the enhanced Life Coach Agent workflow with user integration
+    
+    With a checkpointer (see `resources.get_checkpointer`) every step is saved
+    under the run's `thread_id`, so a session can resume and replan from it.
+    """
     
     graph = StateGraph(LifeCoachState)
     
     # Add nodes
-    graph.add_node("context_analyzer", context_analyzer_node)
-    graph.add_node("user_task_integrator", user_task_integrator_node)
-    graph.add_node("enhanced_task_generator", enhanced_task_generator_node)
-    graph.add_node("motivation_coach", motivation_coach_node)
+    for name, node in GRAPH_NODES.items():
+        graph.add_node(name, node)
+    
+    # Wire the DAG from the dependency declarations
+    for name, dependencies in NODE_DEPENDENCIES.items():
+        if not dependencies:
+            graph.add_edge(START, name)
+        elif len(dependencies) == 1:
+            graph.add_edge(dependencies[0], name)
+        else:
+            graph.add_edge(list(dependencies), name)  # waits for all of them
     
-    # Set entry point
-    graph.set_entry_point("context_analyzer")
+    # Nodes nothing depends on finish the run
+    downstream = {dep for dependencies in NODE_DEPENDENCIES.values() for dep in dependencies}
+    for name in NODE_DEPENDENCIES:
+        if name not in downstream:
+            graph.add_edge(name, END)
     
-    # Define workflow
-    graph.add_edge("context_analyzer", "user_task_integrator")
-    graph.add_edge("user_task_integrator", "enhanced_task_generator")
-    graph.add_edge("enhanced_task_generator", "motivation_coach")
-    graph.add_edge("motivation_coach", END)
+    return graph.compile(checkpointer=checkpointer)
+
+# =============================================================================
+# CHECKPOINTED SESSIONS
+# =============================================================================
+
+def session_config(user_id: str, date: Optional[str] = None) -> Dict:
+    """Checkpoint thread for one user's day"""
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    return {"configurable": {"thread_id": f"{user_id}:{date}"}}
+
+# What the context analyzer and coach read; time blocks are left out because
+# they start at "now" and would differ on every resume. They only feed the
+# task generator and scheduler, which `plan_session` reruns when they change.
+CONTEXT_FIELDS = ("date", "mood", "energy", "stress_level")
+TIME_FIELDS = ("available_time_blocks", "calendar_events")
+
+def same_context(previous: LifeCoachState, state: LifeCoachState) -> bool:
+    """True if only the task list (or today's remaining time) differs between two states"""
+    return (
+        all(previous["daily_context"][field] == state["daily_context"][field] for field in CONTEXT_FIELDS)
+        and previous["goals"] == state["goals"]
+        and previous["user_profile"] == state["user_profile"]
+    )
+
+def replan_tasks(app, config: Dict, update: Dict) -> LifeCoachState:
+    """Apply a task-list or time-block change and rerun only the nodes downstream of it
     
-    return graph.compile()
+    The update is recorded as if `user_task_integrator` had produced it, so the
+    graph resumes at the task generator and motivation coach; the context
+    analysis from the checkpoint is reused as is.
+    """
+    app.update_state(config, update, as_node="user_task_integrator")
+    return app.invoke(None, config)
+
+def record_update(app, config: Dict, update: Dict):
+    """Save a change (e.g. a completed task) to the checkpoint without rerunning anything"""
+    app.update_state(config, update, as_node="motivation_coach")
+
+def plan_session(app, initial_state: LifeCoachState, config: Dict) -> LifeCoachState:
+    """Today's plan, resuming from the checkpointed session when there is one"""
+    snapshot = app.get_state(config)
+    if snapshot.next:  # an earlier run stopped part-way; finish it first
+        app.invoke(None, config)
+        snapshot = app.get_state(config)
+    
+    previous = snapshot.values
+    if previous and same_context(previous, initial_state):
+        update = {}
+        if any(previous["daily_context"].get(field) != initial_state["daily_context"].get(field)
+               for field in TIME_FIELDS):
+            update["daily_context"] = initial_state["daily_context"]
+        if initial_state["pending_user_tasks"]:
+            update.update(user_task_integrator_node(initial_state))
+        if not update:
+            return previous
+        # only new tasks or free time: replan downstream of them
+        return replan_tasks(app, config, update)
+    
+    # first run today, or the context changed: run the whole graph (list
+    # fields append, so tasks already in the checkpoint are kept)
+    if previous:
+        # habits_tracking has no reducer; the input would replace the
+        # checkpointed history, which is kept current on every habit logged
+        initial_state = {key: value for key, value in initial_state.items() if key != "habits_tracking"}
+    return app.invoke(initial_state, config)
 
 # =============================================================================
 # TASK MANAGEMENT FUNCTIONS
 # =============================================================================
 
-def mark_task_complete(state: LifeCoachState, task_id: str) -> LifeCoachState:
-    """Mark a specific task as completed"""
-    updated_tasks = []
-    completed_task = None
-    
-    for task in state["current_tasks"]:
-        if task["id"] == task_id:
+def mark_task_complete(state: LifeCoachState, task_id: str, store: Optional[TaskStore] = None) -> Dict:
+    """Mark a specific task as completed; returns the state update"""
+    if store is not None:
+        task = store.set_status(task_id, TaskStatus.COMPLETED, completed_at=datetime.now().isoformat())
+    else:
+        task = next((t for t in state["current_tasks"] if t["id"] == task_id), None)
+        if task is not None:
             task["status"] = TaskStatus.COMPLETED
             task["completed_at"] = datetime.now().isoformat()
-            completed_task = task
-        updated_tasks.append(task)
     
-    completed_tasks = state.get("completed_tasks", [])
-    if completed_task:
-        completed_tasks.append(completed_task)
-    
-    return {
-        **state,
-        "current_tasks": updated_tasks,
-        "completed_tasks": completed_tasks
-    }
+    return {"completed_tasks": [task]} if task is not None else {}
 
-def add_new_task(state: LifeCoachState, title: str, description: str = "", priority: TaskPriority = TaskPriority.MEDIUM, estimated_time: int = 30, category: str = "personal") -> LifeCoachState:
-    """Add a new task during the day"""
+def add_new_task(state: LifeCoachState, title: str, description: str = "", priority: TaskPriority = TaskPriority.MEDIUM, estimated_time: int = 30, category: str = "personal", store: Optional[TaskStore] = None) -> Dict:
+    """Add a new task during the day; returns the state update"""
     new_task = Task(
         id=str(uuid.uuid4()),
         title=title,
@@ -523,14 +707,12 @@ def add_new_task(state: LifeCoachState, title: str, description: str = "", prior
         completed_at=None,
         user_created=True
     )
-    
-    current_tasks = state["current_tasks"] + [new_task]
-    daily_todo_list = state["daily_todo_list"] + [new_task]
+    if store is not None:
+        store.add(new_task)
     
     return {
-        **state,
-        "current_tasks": current_tasks,
-        "daily_todo_list": daily_todo_list
+        "current_tasks": [new_task],
+        "daily_todo_list": [new_task]
     }
 
 # =============================================================================
@@ -547,10 +729,50 @@ def main():
     
     # Get user input and create initial state
     initial_state = interface.interactive_session()
-    
-    # Create and run the enhanced graph
-    life_coach_app = create_enhanced_life_coach_graph()
-    final_state = life_coach_app.invoke(initial_state)
+    user_id = initial_state["user_profile"]["name"]
+    
+    # Today's session is checkpointed per user and day
+    life_coach_app = create_enhanced_life_coach_graph(resources.get_checkpointer())
+    config = session_config(user_id, initial_state["daily_context"]["date"])
+    checkpoint = life_coach_app.get_state(config).values
+    
+    db = resources.get_db()
+    journal = resources.get_task_journal()
+    # the stored history, whether or not today's session is being resumed
+    initial_state["habits_tracking"] = db.load_habits(user_id) or empty_habits()
+    if checkpoint:
+        known_ids = {task["id"] for task in checkpoint["current_tasks"]}
+        print(f"📂 Resuming today's session ({len(known_ids)} task(s) so far)")
+    else:
+        # Bring back open tasks saved by earlier sessions
+        from task_model import task_from_jsonable
+        if journal.has_history(user_id):
+            # latest snapshot + short journal tail
+            saved = [task for task in journal.recover(user_id) if task["status"] == TaskStatus.PENDING.name]
+        else:
+            saved = db.load_tasks(user_id, status=TaskStatus.PENDING)
+        restored = [task_from_jsonable(task) for task in saved]
+        if restored:
+            initial_state["current_tasks"] = restored
+            print(f"📂 Restored {len(restored)} open task(s) from earlier sessions")
+        known_ids = {task["id"] for task in restored}
+    
+    def persist_new_tasks(tasks: List[Task]):
+        """Save tasks not seen before (queued; written in the background)"""
+        for task in tasks:
+            if task["id"] not in known_ids:
+                known_ids.add(task["id"])
+                db.save_task(user_id, task)
+                journal.task_added(user_id, task, source="user" if task.get("user_created") else "ai_suggestion")
+    
+    # Run (or resume) the enhanced graph
+    final_state = plan_session(life_coach_app, initial_state, config)
+    
+    # Persist the plan
+    db.save_daily_context(user_id, final_state["daily_context"]["date"], final_state["daily_context"])
+    for goal in final_state["goals"]:
+        db.save_goal(user_id, uuid.uuid5(uuid.NAMESPACE_OID, goal).hex, goal)
+    persist_new_tasks(final_state["current_tasks"])
     
     # Display results
     print("\n🎯 YOUR PERSONALIZED DAILY PLAN")
@@ -560,10 +782,52 @@ def main():
     print(final_state['motivation_message'])
     
     interface.display_tasks(final_state['daily_todo_list'])
+    interface.display_schedule(final_state.get('schedule'))
+    if final_state.get('next_action'):
+        print(f"\n👉 NEXT ACTION: {final_state['next_action']}")
     
     print(f"\n🔍 INSIGHTS:")
     print(final_state['reflection_insights'])
     
+    habits = HabitTracker.from_dict(final_state["habits_tracking"])
+    interface.display_habits(habits)
+    
+    # Mid-day edits replan incrementally (no graph run); the planner keeps an
+    # indexed view over the session's tasks plus the time/suggestion aggregates
+    from planner import IncrementalPlanner
+    planner = IncrementalPlanner(final_state)
+    next_actions = NextActionQueue(final_state["current_tasks"], final_state["daily_context"]["energy"])
+    
+    def commit_edit(update: Dict):
+        """Merge a planner update, then persist and checkpoint what it changed
+        
+        Only the added and changed tasks are rescheduled, queued and sent to
+        the checkpoint (the task lists merge them by id).
+        """
+        persist_new_tasks(update.get("current_tasks", []))
+        changed = {task["id"]: task for task in update.get("current_tasks", []) + planner.changed}
+        tasks = list(changed.values())
+        # closed tasks free their slot, open ones are fitted into free time
+        schedule = unschedule(final_state["schedule"], changed)
+        schedule = schedule_more(schedule, [task for task in tasks if task["status"] in OPEN_STATUSES],
+                                 final_state["daily_context"]["date"])
+        # O(log n) per changed task; closed tasks drop out of the queue
+        for task in tasks:
+            next_actions.push(task)
+        for task in planner.changed:
+            db.save_task(user_id, task)
+            record = journal.task_completed if task["status"] == TaskStatus.COMPLETED else journal.task_updated
+            record(user_id, task["id"], status=task["status"], completed_at=task["completed_at"])
+        delta = {
+            "current_tasks": tasks,
+            "daily_todo_list": tasks,
+            "completed_tasks": update.get("completed_tasks", []),
+            "schedule": schedule,
+            "next_action": describe(next_actions.peek()),
+        }
+        apply_update(final_state, delta)
+        record_update(life_coach_app, config, delta)
+    
     # Interactive task management
     while True:
         print("\n" + "=" * 30)
@@ -571,9 +835,10 @@ def main():
         print("1. Add a new task")
         print("2. Mark task as complete")
         print("3. View current tasks")
-        print("4. Exit")
+        print("4. Log a habit")
+        print("5. Exit")
         
-        choice = input("Enter choice (1-4): ").strip()
+        choice = input("Enter choice (1-5): ").strip()
         
         if choice == "1":
             title = input("Task title: ").strip()
@@ -586,8 +851,17 @@ def main():
                 estimated_time = int(time_input)
                 category = input("Category (work/personal/health/learning): ") or "personal"
                 
-                final_state = add_new_task(final_state, title, description, priority, estimated_time, category)
+                new_task = add_new_task(final_state, title, description, priority, estimated_time, category)["current_tasks"][0]
+                update = planner.add(new_task)
+                commit_edit(update)
                 print(f"✅ Added task: {title}")
+                for task in update["current_tasks"][1:]:
+                    print(f"🤖 Suggested: {task['title']}")
+                for task in planner.changed:
+                    if task["status"] == TaskStatus.RESCHEDULED:
+                        print(f"⏸️  Withdrew suggestion: {task['title']}")
+                print(f"⏱️  {planner.remaining_time} minutes left to plan")
+                print(f"👉 Next: {final_state['next_action']}")
         
         elif choice == "2":
             interface.display_tasks(final_state['current_tasks'])
@@ -596,8 +870,14 @@ def main():
                 task_index = int(task_num) - 1
                 if 0 <= task_index < len(final_state['current_tasks']):
                     task_id = final_state['current_tasks'][task_index]['id']
-                    final_state = mark_task_complete(final_state, task_id)
+                    update = planner.complete(task_id, datetime.now().isoformat())
+                    if update:
+                        commit_edit(update)
+                    for task in update.get("current_tasks", []):
+                        print(f"🤖 Suggested: {task['title']}")
                     print("✅ Task marked as complete!")
+                    if final_state.get("next_action"):
+                        print(f"👉 Next: {final_state['next_action']}")
                 else:
                     print("Invalid task number.")
             except ValueError:
@@ -605,8 +885,27 @@ def main():
         
         elif choice == "3":
             interface.display_tasks(final_state['current_tasks'])
+            interface.display_schedule(final_state.get('schedule'))
         
         elif choice == "4":
+            if habits.habits:
+                print("Habits: " + ", ".join(habits.habits))
+            name = input("Habit done today: ").strip()
+            if name:
+                # reuse an existing habit's spelling
+                name = next((habit for habit in habits.habits if habit.lower() == name.lower()), name)
+                habits.record(name)
+                final_state["habits_tracking"] = habits.to_dict()
+                db.save_habits(user_id, final_state["habits_tracking"])
+                record_update(life_coach_app, config, {"habits_tracking": final_state["habits_tracking"]})
+                interface.display_habits(habits)
+        
+        elif choice == "5":
+            try:
+                db.flush()
+            except PersistenceError as error:
+                print(f"⚠️  Some changes could not be saved: {error}")
+            journal.sync()
             print("🌟 Great job today! Remember: Progress > Perfection")
             break
         
@@ -3,6 +3,26 @@ import pandas as pd
 from datetime import datetime, timedelta
 import uuid
 import json
+import os
+
+from app_tasks import create_task, suggest_tasks
+from db import LifeCoachDB
+from next_action import NextActionQueue
+from task_journal import TaskJournal
+from task_store import TaskStore
+
+# Tasks, goals and daily context are persisted per local user
+USER_ID = os.getenv("LIFE_COACH_USER", "local")
+
+@st.cache_resource
+def get_db():
+    """One database (and background writer) shared by all sessions of this server"""
+    return LifeCoachDB()
+
+@st.cache_resource
+def get_journal():
+    """Append-only task event journal (group-committed, snapshotted)"""
+    return TaskJournal()
 
 # Configure Streamlit page
 st.set_page_config(
@@ -78,16 +98,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'tasks' not in st.session_state:
-    st.session_state.tasks = []
-if 'completed_tasks' not in st.session_state:
-    st.session_state.completed_tasks = []
+if 'task_store' not in st.session_state:
+    # indexed by id, status, category, priority; recovered from the journal's
+    # latest snapshot + tail, or seeded from the database on first use
+    if get_journal().has_history(USER_ID):
+        st.session_state.task_store = TaskStore(get_journal().recover(USER_ID))
+    else:
+        st.session_state.task_store = TaskStore(get_db().load_tasks(USER_ID))
 if 'user_profile' not in st.session_state:
     st.session_state.user_profile = {}
 if 'daily_context' not in st.session_state:
-    st.session_state.daily_context = {}
+    st.session_state.daily_context = get_db().load_daily_context(USER_ID, datetime.now().strftime("%Y-%m-%d")) or {}
 if 'goals' not in st.session_state:
-    st.session_state.goals = []
+    st.session_state.goals = [text for _, text in get_db().load_goals(USER_ID)]
+if 'next_actions' not in st.session_state:
+    # heap of open tasks by priority, deadline and energy match
+    st.session_state.next_actions = NextActionQueue(
+        st.session_state.task_store, st.session_state.daily_context.get('energy', 'Moderate')
+    )
 if 'show_setup' not in st.session_state:
     st.session_state.show_setup = True
 
@@ -104,21 +132,9 @@ MOOD_LEVELS = ["Very Low", "Low", "Neutral", "Good", "Excellent"]
 CATEGORIES = ["Work", "Personal", "Health", "Learning", "Social"]
 
 # Helper functions
-def create_task(title, description, priority, estimated_time, category, energy_required, user_created=True):
-    """Create a new task dictionary"""
-    return {
-        'id': str(uuid.uuid4()),
-        'title': title,
-        'description': description,
-        'priority': priority,
-        'estimated_time': estimated_time,
-        'category': category,
-        'energy_required': energy_required,
-        'status': 'Pending',
-        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M"),
-        'user_created': user_created,
-        'completed_at': None
-    }
+def goal_id(goal):
+    """Stable id for a goal's text"""
+    return uuid.uuid5(uuid.NAMESPACE_OID, goal).hex
 
 def display_task_card(task, index):
     """Display a task as a card"""
@@ -157,66 +173,29 @@ def display_task_card(task, index):
 
 def complete_task(task_id):
     """Mark a task as completed"""
-    for i, task in enumerate(st.session_state.tasks):
-        if task['id'] == task_id:
-            task['status'] = 'Completed'
-            task['completed_at'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-            completed_task = st.session_state.tasks.pop(i)
-            st.session_state.completed_tasks.append(completed_task)
-            break
+    completed_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+    task = st.session_state.task_store.set_status(task_id, 'Completed', completed_at=completed_at)
+    if task is not None:
+        get_db().save_task(USER_ID, task)
+        get_journal().task_completed(USER_ID, task_id, status='Completed', completed_at=completed_at)
+        st.session_state.next_actions.complete(task_id)
 
 def delete_task(task_id):
     """Delete a task"""
-    st.session_state.tasks = [task for task in st.session_state.tasks if task['id'] != task_id]
+    st.session_state.task_store.remove(task_id)
+    get_db().delete_task(USER_ID, task_id)
+    get_journal().task_deleted(USER_ID, task_id)
+    st.session_state.next_actions.remove(task_id)
 
 def generate_ai_suggestions():
     """Generate sample AI task suggestions based on user context"""
-    suggestions = []
-    
-    # Get user context
-    mood = st.session_state.daily_context.get('mood', 'Neutral')
-    energy = st.session_state.daily_context.get('energy', 'Moderate')
-    stress = st.session_state.daily_context.get('stress_level', 5)
-    
-    # Wellness suggestions based on stress
-    if stress >= 7:
-        suggestions.append(create_task(
-            "Stress Relief Activity",
-            "Take 15 minutes for deep breathing, meditation, or a short walk",
-            "High", 15, "Health", "Low", False
-        ))
-    
-    # Energy-based suggestions
-    if energy in ["High", "Peak"]:
-        suggestions.append(create_task(
-            "Tackle Challenging Project",
-            "Work on your most important but difficult task while energy is high",
-            "High", 60, "Work", "High", False
-        ))
-    elif energy in ["Exhausted", "Low"]:
-        suggestions.append(create_task(
-            "Gentle Self-Care",
-            "Do something nurturing - read, listen to music, or organize",
-            "Medium", 30, "Personal", "Low", False
-        ))
-    
-    # Goal-based suggestions
-    for goal in st.session_state.goals[:2]:  # Max 2 goal-based tasks
-        suggestions.append(create_task(
-            f"Progress on: {goal[:25]}...",
-            f"Take a concrete step towards: {goal}",
-            "Medium", 45, "Personal", "Moderate", False
-        ))
-    
-    # Mood-based suggestions
-    if mood in ["Very Low", "Low"]:
-        suggestions.append(create_task(
-            "Connect with Someone",
-            "Call a friend, family member, or write in a journal",
-            "High", 20, "Social", "Low", False
-        ))
-    
-    return suggestions
+    daily_context = st.session_state.daily_context
+    return suggest_tasks(
+        daily_context.get('mood', 'Neutral'),
+        daily_context.get('energy', 'Moderate'),
+        daily_context.get('stress_level', 5),
+        st.session_state.goals,
+    )
 
 # Main App Layout
 def main():
@@ -264,6 +243,8 @@ def main():
                     'available_hours': available_hours,
                     'date': datetime.now().strftime("%Y-%m-%d")
                 }
+                get_db().save_daily_context(USER_ID, st.session_state.daily_context['date'], st.session_state.daily_context)
+                st.session_state.next_actions.refresh(energy=energy)
                 st.success("Context updated!")
         
         # Goals Section
@@ -271,6 +252,7 @@ def main():
             new_goal = st.text_input("Add a new goal")
             if st.button("Add Goal") and new_goal:
                 st.session_state.goals.append(new_goal)
+                get_db().save_goal(USER_ID, goal_id(new_goal), new_goal)
                 st.success(f"Goal added: {new_goal}")
             
             if st.session_state.goals:
@@ -281,7 +263,8 @@ def main():
                         st.write(f"• {goal}")
                     with col2:
                         if st.button("🗑️", key=f"delete_goal_{i}"):
-                            st.session_state.goals.pop(i)
+                            removed_goal = st.session_state.goals.pop(i)
+                            get_db().delete_goal(USER_ID, goal_id(removed_goal))
                             st.rerun()
         
         # Quick Actions
@@ -289,13 +272,18 @@ def main():
         if st.button("🤖 Get AI Suggestions", type="primary"):
             suggestions = generate_ai_suggestions()
             for suggestion in suggestions:
-                st.session_state.tasks.append(suggestion)
+                st.session_state.task_store.add(suggestion)
+                st.session_state.next_actions.push(suggestion)
+                get_journal().task_added(USER_ID, suggestion, source="ai_suggestion")
+            get_db().save_tasks(USER_ID, suggestions)
             st.success(f"Added {len(suggestions)} AI suggestions!")
             st.rerun()
         
         if st.button("🔄 Clear All Tasks"):
-            st.session_state.tasks = []
-            st.session_state.completed_tasks = []
+            st.session_state.task_store.clear()
+            st.session_state.next_actions.clear()
+            get_db().delete_user_tasks(USER_ID)
+            get_journal().tasks_cleared(USER_ID)
             st.success("All tasks cleared!")
             st.rerun()
     
@@ -328,15 +316,25 @@ def main():
                             task_title, task_desc or task_title, task_priority,
                             task_time, task_category, task_energy, True
                         )
-                        st.session_state.tasks.append(new_task)
+                        st.session_state.task_store.add(new_task)
+                        st.session_state.next_actions.push(new_task)
+                        get_db().save_task(USER_ID, new_task)
+                        get_journal().task_added(USER_ID, new_task)
                         st.success(f"Task '{task_title}' added!")
                         st.rerun()
                     else:
                         st.error("Please enter a task title!")
         
+        store = st.session_state.task_store
+        pending_tasks = store.by_status('Pending')
+        completed_task_list = store.by_status('Completed')
+        
         # Current Tasks
         st.subheader("📝 Today's Tasks")
-        if st.session_state.tasks:
+        next_task = st.session_state.next_actions.peek()
+        if next_task is not None:
+            st.info(f"👉 **Do this next:** {next_task['title']} ({next_task['estimated_time']} min)")
+        if pending_tasks:
             # Filter and sort options
             col_filter1, col_filter2, col_filter3 = st.columns(3)
             with col_filter1:
@@ -344,17 +342,19 @@ def main():
             with col_filter2:
                 category_filter = st.multiselect("Filter by Category", CATEGORIES, key="category_filter")
             with col_filter3:
-                sort_by = st.selectbox("Sort by", ["Priority", "Time", "Category", "Created"])
+                sort_by = st.selectbox("Sort by", ["Next Action", "Priority", "Time", "Category", "Created"])
             
-            # Apply filters
-            filtered_tasks = st.session_state.tasks
-            if priority_filter:
-                filtered_tasks = [t for t in filtered_tasks if t['priority'] in priority_filter]
-            if category_filter:
-                filtered_tasks = [t for t in filtered_tasks if t['category'] in category_filter]
+            # Apply filters (index lookups, no scan over the backlog)
+            filtered_tasks = store.where(
+                status='Pending',
+                priority=priority_filter or None,
+                category=category_filter or None
+            )
             
             # Apply sorting
-            if sort_by == "Priority":
+            if sort_by == "Next Action":
+                filtered_tasks = st.session_state.next_actions.ranked(filtered_tasks)
+            elif sort_by == "Priority":
                 priority_order = {"Urgent": 4, "High": 3, "Medium": 2, "Low": 1}
                 filtered_tasks = sorted(filtered_tasks, key=lambda x: priority_order[x['priority']], reverse=True)
             elif sort_by == "Time":
@@ -369,20 +369,20 @@ def main():
             st.info("No tasks yet. Add some tasks or get AI suggestions!")
         
         # Completed Tasks Section
-        if st.session_state.completed_tasks:
-            with st.expander(f"✅ Completed Tasks ({len(st.session_state.completed_tasks)})"):
-                for task in st.session_state.completed_tasks:
+        if completed_task_list:
+            with st.expander(f"✅ Completed Tasks ({len(completed_task_list)})"):
+                for task in completed_task_list:
                     st.success(f"✅ {task['title']} - Completed at {task['completed_at']}")
     
     with col2:
         # Daily Overview
         st.header("📊 Daily Overview")
         
-        # Statistics
-        total_tasks = len(st.session_state.tasks)
-        completed_tasks = len(st.session_state.completed_tasks)
-        total_time = sum(task['estimated_time'] for task in st.session_state.tasks)
-        completed_time = sum(task['estimated_time'] for task in st.session_state.completed_tasks)
+        # Statistics (index bucket sizes)
+        total_tasks = store.count('status', 'Pending')
+        completed_tasks = store.count('status', 'Completed')
+        total_time = sum(task['estimated_time'] for task in pending_tasks)
+        completed_time = sum(task['estimated_time'] for task in completed_task_list)
         
         # Stats cards
         st.markdown(f"""
@@ -399,21 +399,17 @@ def main():
             st.metric("Completion Rate", f"{completion_rate:.1f}%")
         
         # Task breakdown by category
-        if st.session_state.tasks:
+        if pending_tasks:
             st.subheader("📂 Tasks by Category")
-            category_counts = {}
-            for task in st.session_state.tasks:
-                category_counts[task['category']] = category_counts.get(task['category'], 0) + 1
+            category_counts = store.counts('category', status='Pending')
             
             category_df = pd.DataFrame(list(category_counts.items()), columns=['Category', 'Count'])
             st.bar_chart(category_df.set_index('Category'))
         
         # Priority breakdown
-        if st.session_state.tasks:
+        if pending_tasks:
             st.subheader("🎯 Tasks by Priority")
-            priority_counts = {}
-            for task in st.session_state.tasks:
-                priority_counts[task['priority']] = priority_counts.get(task['priority'], 0) + 1
+            priority_counts = store.counts('priority', status='Pending')
             
             for priority, count in priority_counts.items():
                 color = PRIORITY_COLORS[priority]
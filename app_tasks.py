@@ -0,0 +1,77 @@
+"""Task dicts of the Streamlit app and its AI suggestion policy.
+
+The app's tasks use display strings for their fields ("High", "Pending", ...)
+rather than the CLI's Enums. These helpers live outside app.py because
+importing a Streamlit script runs it (page setup, database, session state).
+"""
+import uuid
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+from ranking import rank_tasks
+
+MAX_AI_SUGGESTIONS = 4
+
+
+def create_task(title, description, priority, estimated_time, category, energy_required, user_created=True):
+    """Create a new task dictionary"""
+    return {
+        'id': str(uuid.uuid4()),
+        'title': title,
+        'description': description,
+        'priority': priority,
+        'estimated_time': estimated_time,
+        'category': category,
+        'energy_required': energy_required,
+        'status': 'Pending',
+        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M"),
+        'user_created': user_created,
+        'completed_at': None
+    }
+
+
+def suggest_tasks(mood: str, energy: str, stress: int, goals: Sequence[str]) -> List[Dict]:
+    """Sample AI task suggestions for today's mood, energy, stress and goals"""
+    candidates = []
+
+    # Wellness suggestions based on stress
+    if stress >= 7:
+        candidates.append(create_task(
+            "Stress Relief Activity",
+            "Take 15 minutes for deep breathing, meditation, or a short walk",
+            "High", 15, "Health", "Low", False
+        ))
+
+    # Energy-based suggestions, only offered when they suit today's energy
+    # (ranking alone would still put the high-priority project first on a tired day)
+    if energy in ["High", "Peak"]:
+        candidates.append(create_task(
+            "Tackle Challenging Project",
+            "Work on your most important but difficult task while energy is high",
+            "High", 60, "Work", "High", False
+        ))
+    elif energy in ["Exhausted", "Low"]:
+        candidates.append(create_task(
+            "Gentle Self-Care",
+            "Do something nurturing - read, listen to music, or organize",
+            "Medium", 30, "Personal", "Low", False
+        ))
+
+    # Goal-based suggestions
+    for goal in goals:
+        candidates.append(create_task(
+            f"Progress on: {goal[:25]}...",
+            f"Take a concrete step towards: {goal}",
+            "Medium", 45, "Personal", "Moderate", False
+        ))
+
+    # Mood-based suggestions
+    if mood in ["Very Low", "Low"]:
+        candidates.append(create_task(
+            "Connect with Someone",
+            "Call a friend, family member, or write in a journal",
+            "High", 20, "Social", "Low", False
+        ))
+
+    # One vectorized pass scores every candidate; keep the best few
+    return rank_tasks(candidates, k=MAX_AI_SUGGESTIONS, energy=energy)
@@ -0,0 +1,295 @@
+"""Free/busy engine for planning horizons of a day to several weeks.
+
+Busy time (calendar events, sleep, work hours) is kept as a sorted list of
+merged, non-overlapping intervals in minutes from the horizon start. The free
+intervals are its complement; they are indexed by a segment tree holding the
+longest free interval per range, so "the first free slot of at least N
+minutes after t" is a binary search plus one O(log n) descent.
+
+Adding busy time only marks the index stale; it is rebuilt (O(n)) on the next
+query, so bulk imports (an .ics file, weeks of sleep/work recurrences) pay for
+one rebuild.
+
+`events_from_ics` reads VEVENTs from local .ics files (timed and all-day
+events; recurrence rules are not expanded). `plan_time_blocks` turns what is
+left of today into the `available_time_blocks` the graph plans with.
+"""
+import bisect
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+BLOCK_FORMAT = "%I:%M %p"
+MAX_BLOCK_MINUTES = 120
+MIN_BLOCK_MINUTES = 15
+
+Slot = Tuple[datetime, datetime]
+
+
+def parse_clock(text: str) -> time:
+    """'11:00 PM', '9 AM' or '21:30' -> time"""
+    text = text.strip().upper()
+    for fmt in ("%I:%M %p", "%I %p", "%H:%M"):
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized time of day: {text!r}")
+
+
+def local_datetime(text: str) -> datetime:
+    """ISO time -> naive local time (offsets and 'Z' are converted, naive times kept)"""
+    value = datetime.fromisoformat(text)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _minutes(delta: timedelta) -> int:
+    return int(delta // timedelta(minutes=1))
+
+
+class _MaxTree:
+    """Segment tree of interval lengths answering 'first index >= i with length >= n'"""
+
+    def __init__(self, lengths: Sequence[int]):
+        self.size = 1
+        while self.size < max(1, len(lengths)):
+            self.size *= 2
+        self.tree = [0] * (2 * self.size)
+        self.tree[self.size:self.size + len(lengths)] = lengths
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def first_at_least(self, need: int, start: int = 0) -> Optional[int]:
+        return self._descend(1, 0, self.size, start, need)
+
+    def _descend(self, node: int, lo: int, hi: int, start: int, need: int) -> Optional[int]:
+        if hi <= start or self.tree[node] < need:
+            return None
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        found = self._descend(2 * node, lo, mid, start, need)
+        return found if found is not None else self._descend(2 * node + 1, mid, hi, start, need)
+
+
+class Availability:
+    def __init__(self, start: datetime, end: datetime):
+        if end <= start:
+            raise ValueError("Availability horizon must end after it starts")
+        self.start = start
+        self.end = end
+        self._horizon = _minutes(end - start)
+        self._busy_starts: List[int] = []
+        self._busy_ends: List[int] = []
+        self._free: Optional[List[Tuple[int, int]]] = None
+        self._tree: Optional[_MaxTree] = None
+
+    # -------------------------------------------------------------------------
+    # busy time
+    # -------------------------------------------------------------------------
+
+    def add_busy(self, start: datetime, end: datetime):
+        """Mark [start, end) busy (clipped to the horizon, merged with neighbours)"""
+        lo = max(0, _minutes(start - self.start))
+        hi = min(self._horizon, -_minutes(self.start - end))  # round the end up
+        if hi <= lo:
+            return
+        # merge with every interval that overlaps or touches [lo, hi)
+        first = bisect.bisect_left(self._busy_ends, lo)
+        last = bisect.bisect_right(self._busy_starts, hi)
+        if first < last:
+            lo = min(lo, self._busy_starts[first])
+            hi = max(hi, self._busy_ends[last - 1])
+        self._busy_starts[first:last] = [lo]
+        self._busy_ends[first:last] = [hi]
+        self._free = self._tree = None
+
+    def add_events(self, events: Iterable[Dict[str, str]]):
+        """Calendar events as {"start": iso, "end": iso, ...} dicts (UTC offsets allowed)"""
+        for event in events:
+            self.add_busy(local_datetime(event["start"]), local_datetime(event["end"]))
+
+    def add_daily(self, start: time, end: time, weekdays: Optional[Iterable[int]] = None):
+        """A recurring block every day (or on the given weekdays, Monday = 0);
+        a block whose end is earlier than its start runs past midnight"""
+        weekdays = None if weekdays is None else set(weekdays)
+        day = self.start.date() - timedelta(days=1)  # catches last night's overnight block
+        while day <= self.end.date():
+            if weekdays is None or day.weekday() in weekdays:
+                begin = datetime.combine(day, start)
+                finish = datetime.combine(day, end)
+                if finish <= begin:
+                    finish += timedelta(days=1)
+                self.add_busy(begin, finish)
+            day += timedelta(days=1)
+
+    def add_sleep(self, sleep_schedule: Dict[str, str]):
+        """`UserProfile.sleep_schedule`: {"bedtime": "11:00 PM", "wake_time": "7:00 AM"}"""
+        self.add_daily(parse_clock(sleep_schedule["bedtime"]), parse_clock(sleep_schedule["wake_time"]))
+
+    def add_work(self, work_schedule: Dict[str, List[str]]):
+        """`UserProfile.work_schedule`: {"days": ["Monday", ...], "hours": ["9 AM", "5 PM"]}"""
+        names = [day.strftime("%A") for day in (date(2024, 1, 1) + timedelta(days=i) for i in range(7))]
+        weekdays = [names.index(day.capitalize()) for day in work_schedule.get("days", []) if day.capitalize() in names]
+        hours = work_schedule.get("hours", [])
+        if weekdays and len(hours) == 2:
+            self.add_daily(parse_clock(hours[0]), parse_clock(hours[1]), weekdays)
+
+    # -------------------------------------------------------------------------
+    # free time
+    # -------------------------------------------------------------------------
+
+    def _index(self) -> List[Tuple[int, int]]:
+        if self._free is None:
+            free, cursor = [], 0
+            for lo, hi in zip(self._busy_starts, self._busy_ends):
+                if lo > cursor:
+                    free.append((cursor, lo))
+                cursor = hi
+            if cursor < self._horizon:
+                free.append((cursor, self._horizon))
+            self._free = free
+            self._tree = _MaxTree([hi - lo for lo, hi in free])
+        return self._free
+
+    def _slot(self, lo: int, hi: int) -> Slot:
+        return self.start + timedelta(minutes=lo), self.start + timedelta(minutes=hi)
+
+    def free_slots(self, min_minutes: int = 0, after: Optional[datetime] = None,
+                   before: Optional[datetime] = None) -> List[Slot]:
+        """Free intervals (at least `min_minutes` long) within [after, before)"""
+        free = self._index()
+        lo_bound = 0 if after is None else max(0, _minutes(after - self.start))
+        hi_bound = self._horizon if before is None else min(self._horizon, _minutes(before - self.start))
+        slots = []
+        for lo, hi in free[max(0, bisect.bisect_right(free, (lo_bound, self._horizon)) - 1):]:
+            if lo >= hi_bound:
+                break
+            lo, hi = max(lo, lo_bound), min(hi, hi_bound)
+            if hi - lo >= max(1, min_minutes):
+                slots.append(self._slot(lo, hi))
+        return slots
+
+    def first_free(self, minutes: int, after: Optional[datetime] = None) -> Optional[Slot]:
+        """Earliest free slot of at least `minutes` starting at or after `after` (O(log n))"""
+        free = self._index()
+        offset = 0 if after is None else max(0, _minutes(after - self.start))
+        position = bisect.bisect_right(free, (offset, self._horizon)) - 1
+        if position >= 0 and free[position][1] - max(offset, free[position][0]) >= minutes:
+            return self._slot(max(offset, free[position][0]), free[position][1])
+        found = self._tree.first_at_least(minutes, position + 1)
+        return None if found is None else self._slot(*free[found])
+
+    def free_minutes(self) -> int:
+        return sum(hi - lo for lo, hi in self._index())
+
+
+# =============================================================================
+# CALENDAR IMPORT
+# =============================================================================
+
+def _ics_lines(text: str) -> List[str]:
+    """Unfold continuation lines (RFC 5545 3.1)"""
+    lines: List[str] = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+
+def _ics_datetime(value: str) -> datetime:
+    if "T" not in value:  # a date, with or without VALUE=DATE
+        return datetime.strptime(value, "%Y%m%d")
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")  # floating or TZID: read as local
+
+
+def _ics_duration(value: str) -> timedelta:
+    """'PT1H30M', 'P1D', '-PT15M'"""
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-")[1:]  # drop 'P'
+    amounts = {"W": 0, "D": 0, "H": 0, "M": 0, "S": 0}
+    number = ""
+    for char in value:
+        if char.isdigit():
+            number += char
+        elif char in amounts:
+            amounts[char] = int(number or 0)
+            number = ""
+    return sign * timedelta(weeks=amounts["W"], days=amounts["D"], hours=amounts["H"],
+                            minutes=amounts["M"], seconds=amounts["S"])
+
+
+def events_from_ics(paths: Iterable[str]) -> List[Dict[str, str]]:
+    """VEVENTs from local .ics files as {"title", "start", "end"} (ISO, local time)"""
+    events = []
+    for path in paths:
+        with open(path, encoding="utf-8") as ics_file:
+            lines = _ics_lines(ics_file.read())
+        current: Optional[Dict] = None
+        for line in lines:
+            if line == "BEGIN:VEVENT":
+                current = {}
+            elif line == "END:VEVENT" and current is not None:
+                start = current.get("start")
+                end = current.get("end")
+                if start is not None:
+                    if end is None:
+                        end = start + current.get("duration", timedelta(days=1) if current.get("all_day") else timedelta())
+                    events.append({
+                        "title": current.get("title", "Busy"),
+                        "start": start.isoformat(),
+                        "end": end.isoformat(),
+                    })
+                current = None
+            elif current is not None and ":" in line:
+                head, value = line.split(":", 1)
+                name = head.partition(";")[0].upper()
+                if name == "DTSTART":
+                    current["start"] = _ics_datetime(value)
+                    current["all_day"] = "T" not in value
+                elif name == "DTEND":
+                    current["end"] = _ics_datetime(value)
+                elif name == "DURATION":
+                    current["duration"] = _ics_duration(value)
+                elif name == "SUMMARY":
+                    current["title"] = value.replace("\\,", ",").replace("\\;", ";").replace("\\n", " ")
+    events.sort(key=lambda event: event["start"])
+    return events
+
+
+# =============================================================================
+# TIME BLOCKS
+# =============================================================================
+
+def plan_time_blocks(sleep_schedule: Dict[str, str], work_schedule: Dict[str, List[str]],
+                     events: Sequence[Dict[str, str]], hours: float, start: Optional[datetime] = None,
+                     max_block: int = MAX_BLOCK_MINUTES, min_block: int = MIN_BLOCK_MINUTES) -> List[Dict[str, str]]:
+    """Up to `hours` of today's free time (after sleep, work and events) as
+    `available_time_blocks`, split into blocks of at most `max_block` minutes"""
+    start = (start or datetime.now()).replace(second=0, microsecond=0)
+    start += timedelta(minutes=-start.minute % 5)  # next 5-minute mark
+    end_of_day = datetime.combine(start.date() + timedelta(days=1), time())
+    if start >= end_of_day:
+        return []
+
+    availability = Availability(start, end_of_day)
+    availability.add_sleep(sleep_schedule)
+    availability.add_work(work_schedule)
+    availability.add_events(events)
+
+    budget = int(hours * 60)
+    blocks = []
+    for slot_start, slot_end in availability.free_slots(min_block):
+        while budget >= min_block and _minutes(slot_end - slot_start) >= min_block:
+            length = min(max_block, budget, _minutes(slot_end - slot_start))
+            block_end = slot_start + timedelta(minutes=length)
+            blocks.append({"start": slot_start.strftime(BLOCK_FORMAT), "end": block_end.strftime(BLOCK_FORMAT)})
+            budget -= length
+            slot_start = block_end
+    return blocks
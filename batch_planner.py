@@ -0,0 +1,72 @@
+"""Concurrent daily planning for many users through one compiled graph.
+
+`aplan_many` keeps at most `concurrency` graph runs in flight, pulls new
+states from the input as slots free up (so the input can be a lazy iterator
+over tens of thousands of users) and yields each result as soon as it
+finishes. A failure for one user is yielded as that user's result instead of
+aborting the batch. If the consumer stops early, closing the generator
+(`aclose()`, `contextlib.aclosing`, or garbage collection) cancels the runs
+still in flight.
+"""
+import asyncio
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from agent import LifeCoachState, create_enhanced_life_coach_graph
+
+DEFAULT_CONCURRENCY = 64
+
+PlanResult = Union[LifeCoachState, Exception]
+
+
+async def aplan_many(states: Iterable[LifeCoachState], concurrency: int = DEFAULT_CONCURRENCY,
+                     app=None) -> AsyncIterator[Tuple[int, PlanResult]]:
+    """Yield (input index, final state or exception) in completion order"""
+    app = app or create_enhanced_life_coach_graph()
+    pending = {}
+    source = enumerate(states)
+
+    def start_next() -> bool:
+        try:
+            index, state = next(source)
+        except StopIteration:
+            return False
+        pending[asyncio.ensure_future(app.ainvoke(state))] = index
+        return True
+
+    while len(pending) < concurrency and start_next():
+        pass
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                error = future.exception()
+                yield index, error if error is not None else future.result()
+                start_next()
+    finally:
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def plan_many(states: Iterable[LifeCoachState], concurrency: int = DEFAULT_CONCURRENCY,
+              app=None) -> List[PlanResult]:
+    """Blocking variant returning results in input order"""
+    async def collect():
+        results = {}
+        async for index, result in aplan_many(states, concurrency, app):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    return asyncio.run(collect())
+
+
+async def aplan_many_ordered(states: List[LifeCoachState], concurrency: int = DEFAULT_CONCURRENCY,
+                             app: Optional[object] = None) -> List[PlanResult]:
+    """Awaitable variant returning results in input order"""
+    results: List[Optional[PlanResult]] = [None] * len(states)
+    async for index, result in aplan_many(states, concurrency, app):
+        results[index] = result
+    return results
@@ -0,0 +1,34 @@
+"""Vectorized scoring + top-k vs. sorting with a per-task Python key.
+
+    python benchmarks/bench_ranking.py [n_tasks] [k]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from next_action import action_score  # noqa: E402
+from ranking import TaskColumns, rank_tasks  # noqa: E402
+from bench_state_updates import make_task  # noqa: E402
+
+
+def timed(label, fn, n):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<32}{(time.perf_counter() - started) * 1000:>10.1f} ms ({n} tasks)")
+    return result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    random.seed(0)
+    tasks = [make_task(i) for i in range(n)]
+    for task in tasks:
+        task["estimated_time"] = random.choice([15, 30, 45, 60, 90])
+
+    timed("sorted(key=action_score)", lambda: sorted(tasks, key=lambda t: -action_score(t, 3))[:k], n)
+    columns = timed("TaskColumns (encode once)", lambda: TaskColumns(tasks), n)
+    timed(f"rank_tasks top-{k}", lambda: rank_tasks(columns, k), n)
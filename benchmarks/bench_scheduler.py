@@ -0,0 +1,27 @@
+"""Time to pack a large backlog into a day's time blocks.
+
+    python benchmarks/bench_scheduler.py [n_tasks]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agent import make_time_blocks  # noqa: E402
+from scheduler import schedule_day  # noqa: E402
+from bench_state_updates import make_task  # noqa: E402
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    tasks = [make_task(i) for i in range(n)]
+    blocks = make_time_blocks(10, start=datetime.now().replace(hour=8))
+
+    for label, batch in (("exact (6 tasks)", tasks[:6]), (f"greedy ({n} tasks)", tasks)):
+        started = time.perf_counter()
+        schedule = schedule_day(batch, blocks)
+        elapsed = (time.perf_counter() - started) * 1000
+        placed = sum(len(block["tasks"]) for block in schedule["blocks"])
+        print(f"{label:<24}{elapsed:>10.1f} ms  {placed} placed, {len(schedule['unscheduled'])} unscheduled")
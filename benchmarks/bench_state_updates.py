@@ -0,0 +1,101 @@
+"""Per-step allocation of whole-state copies vs delta updates.
+
+Builds a long-lived session (many tasks, years of habit history) and compares
+the old `{**state, ...}` helpers, which rebuilt the task lists on every call,
+with the delta + reducer helpers now in agent.py.
+
+    python benchmarks/bench_state_updates.py [n_tasks] [steps]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agent import (  # noqa: E402
+    EnergyLevel, TaskPriority, TaskStatus, Task,
+    add_new_task, apply_update, mark_task_complete,
+)
+
+
+def make_task(i: int) -> Task:
+    return Task(
+        id=str(uuid.uuid4()), title=f"Task {i}", description=f"Task {i}",
+        priority=TaskPriority.MEDIUM, estimated_time=30, category="personal",
+        deadline=None, energy_required=EnergyLevel.MODERATE, status=TaskStatus.PENDING,
+        created_at=datetime.now().isoformat(), completed_at=None, user_created=True,
+    )
+
+
+def make_state(n_tasks: int) -> dict:
+    tasks = [make_task(i) for i in range(n_tasks)]
+    return {
+        "current_tasks": tasks,
+        "daily_todo_list": list(tasks),
+        "completed_tasks": [],
+        "missed_tasks": [],
+        "habits_tracking": {f"habit_{h}": [True] * 3650 for h in range(20)},
+        "goals": [f"goal {g}" for g in range(100)],
+    }
+
+
+# The helpers as they were before delta updates
+def legacy_add_new_task(state, title):
+    new_task = make_task(-1)
+    new_task["title"] = title
+    return {
+        **state,
+        "current_tasks": state["current_tasks"] + [new_task],
+        "daily_todo_list": state["daily_todo_list"] + [new_task],
+    }
+
+
+def legacy_mark_task_complete(state, task_id):
+    updated_tasks = []
+    completed_task = None
+    for task in state["current_tasks"]:
+        if task["id"] == task_id:
+            task["status"] = TaskStatus.COMPLETED
+            completed_task = task
+        updated_tasks.append(task)
+    completed_tasks = state.get("completed_tasks", [])
+    if completed_task:
+        completed_tasks.append(completed_task)
+    return {**state, "current_tasks": updated_tasks, "completed_tasks": completed_tasks}
+
+
+def measure(label, n_tasks, steps, step):
+    state = make_state(n_tasks)
+    tracemalloc.start()
+    peak_growth = 0
+    started = time.perf_counter()
+    for i in range(steps):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        state = step(state, i)
+        peak_growth += tracemalloc.get_traced_memory()[1] - current
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+    print(f"{label:<28}{elapsed / steps * 1e6:>12.1f} us/step{peak_growth / steps / 1024:>12.1f} KiB allocated/step")
+
+
+def legacy_step(state, i):
+    state = legacy_add_new_task(state, f"new {i}")
+    return legacy_mark_task_complete(state, state["current_tasks"][i]["id"])
+
+
+def delta_step(state, i):
+    apply_update(state, add_new_task(state, f"new {i}"))
+    apply_update(state, mark_task_complete(state, state["current_tasks"][i]["id"]))
+    return state
+
+
+if __name__ == "__main__":
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{n_tasks} tasks, 20 habits x 10 years, {steps} add+complete steps")
+    measure("whole-state copies", n_tasks, steps, legacy_step)
+    measure("delta updates + reducers", n_tasks, steps, delta_step)
@@ -0,0 +1,43 @@
+"""Memory and bulk encode/decode cost of Task dicts vs CompactTask.
+
+    python benchmarks/bench_task_model.py [n_tasks]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from serialization import to_jsonable  # noqa: E402
+from task_model import CompactTask, decode_compact, encode_tasks  # noqa: E402
+from bench_state_updates import make_task  # noqa: E402
+
+
+def allocated(build):
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(label, fn, n):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<32}{(time.perf_counter() - started) * 1000:>10.1f} ms ({n} tasks)")
+    return result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tasks, dict_bytes = allocated(lambda: [make_task(i) for i in range(n)])
+    compact, compact_bytes = allocated(lambda: [CompactTask.from_task(task) for task in tasks])
+    print(f"Task dicts:    {dict_bytes / n:>8.0f} bytes/task")
+    print(f"CompactTask:   {compact_bytes / n:>8.0f} bytes/task")
+
+    timed("json.dumps(list of dicts)", lambda: json.dumps(to_jsonable(tasks)), n)
+    data = timed("encode_tasks(CompactTask)", lambda: encode_tasks(compact), n)
+    timed("decode_compact", lambda: decode_compact(data), n)
+    print(f"encoded size: {len(data) / n:.0f} bytes/task")
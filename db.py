@@ -0,0 +1,310 @@
+"""SQLite persistence for tasks, goals and daily contexts.
+
+- WAL journal, so readers never block the writer (or each other).
+- Writes are queued and applied by one background thread in batched
+  transactions (`executemany` per statement), so a click only pays for a
+  queue put. `flush()` waits until everything queued so far is committed;
+  reads flush first, so callers always read their own writes.
+- A batch that fails is retried, then applied one statement at a time, so a
+  bad write never takes other users' writes down with it. Writes that still
+  fail are reported by the next `flush()` as a `PersistenceError`.
+- Tasks are indexed on (user_id, status, date) for the common "today's open
+  tasks" queries.
+- Statements are fixed SQL strings, so sqlite3's per-connection statement
+  cache prepares each one once and reuses it.
+
+Rows store the task/context as JSON (Enums as names, see serialization.py);
+`task_model.task_from_jsonable` turns CLI tasks back into `Task` dicts.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from serialization import to_jsonable
+
+DB_PATH = "life_coach.db"
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.05  # seconds the writer waits to gather a batch
+WRITE_RETRIES = 3  # attempts per batch before falling back to one statement at a time
+RETRY_DELAY = 0.05  # seconds, doubled after each failed attempt
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    user_id    TEXT NOT NULL,
+    task_id    TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    category   TEXT,
+    priority   TEXT,
+    payload    TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_user_status_date ON tasks (user_id, status, date);
+CREATE INDEX IF NOT EXISTS tasks_user_date ON tasks (user_id, date);
+
+CREATE TABLE IF NOT EXISTS goals (
+    user_id    TEXT NOT NULL,
+    goal_id    TEXT NOT NULL,
+    text       TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (user_id, goal_id)
+);
+
+CREATE TABLE IF NOT EXISTS habits (
+    user_id    TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_contexts (
+    user_id    TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, date)
+);
+"""
+
+UPSERT_TASK = (
+    "INSERT INTO tasks (user_id, task_id, status, date, category, priority, payload, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (user_id, task_id) DO UPDATE SET status = excluded.status, date = excluded.date, "
+    "category = excluded.category, priority = excluded.priority, payload = excluded.payload, "
+    "updated_at = excluded.updated_at"
+)
+DELETE_TASK = "DELETE FROM tasks WHERE user_id = ? AND task_id = ?"
+DELETE_USER_TASKS = "DELETE FROM tasks WHERE user_id = ?"
+UPSERT_GOAL = (
+    "INSERT INTO goals (user_id, goal_id, text, created_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (user_id, goal_id) DO UPDATE SET text = excluded.text"
+)
+DELETE_GOAL = "DELETE FROM goals WHERE user_id = ? AND goal_id = ?"
+UPSERT_CONTEXT = (
+    "INSERT INTO daily_contexts (user_id, date, payload, updated_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (user_id, date) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at"
+)
+UPSERT_HABITS = (
+    "INSERT INTO habits (user_id, payload, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (user_id) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at"
+)
+
+_STOP = object()
+
+
+class PersistenceError(sqlite3.Error):
+    """Queued writes that could not be committed: (sql, params, error) per write"""
+
+    def __init__(self, failures: List[Tuple[str, tuple, sqlite3.Error]]):
+        self.failures = failures
+        super().__init__(f"{len(failures)} write(s) failed, first: {failures[0][2]}")
+
+
+def _label(value: Any) -> Any:
+    return getattr(value, "name", value)
+
+
+class LifeCoachDB:
+    def __init__(self, path: str = DB_PATH, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._local = threading.local()
+        self._failures: List[Tuple[str, tuple, sqlite3.Error]] = []
+        self._failures_lock = threading.Lock()
+
+        writer = self._connect()
+        writer.executescript(SCHEMA)
+        writer.commit()
+        self._writer_thread = threading.Thread(target=self._write_loop, args=(writer,),
+                                               name="life-coach-db-writer", daemon=True)
+        self._writer_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # -------------------------------------------------------------------------
+    # background writer
+    # -------------------------------------------------------------------------
+
+    def _write_loop(self, conn: sqlite3.Connection):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            self._apply(conn, [item for item in batch if item is not _STOP])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        if not batch:
+            return
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with conn:  # one transaction per batch
+                    # consecutive writes with the same statement go through one executemany
+                    start = 0
+                    while start < len(batch):
+                        sql = batch[start][0]
+                        end = start
+                        while end < len(batch) and batch[end][0] == sql:
+                            end += 1
+                        conn.executemany(sql, [params for _, params in batch[start:end]])
+                        start = end
+                return
+            except sqlite3.OperationalError:  # locked, busy, disk I/O: try again
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+            except sqlite3.Error:  # a bad statement or constraint: retrying won't help
+                break
+
+        # isolate the failing writes; everything else in the batch still lands
+        failures = []
+        for sql, params in batch:
+            try:
+                with conn:
+                    conn.execute(sql, params)
+            except sqlite3.Error as error:
+                failures.append((sql, params, error))
+        if failures:
+            print(f"⚠️  Failed to persist {len(failures)} of {len(batch)} change(s): {failures[0][2]}")
+            with self._failures_lock:
+                self._failures.extend(failures)
+
+    def _enqueue(self, sql: str, params: tuple):
+        self._queue.put((sql, params))
+
+    def _drain(self):
+        self._queue.join()
+
+    def flush(self):
+        """Block until every write queued so far is committed
+
+        Raises PersistenceError (once) for writes that failed since the last flush.
+        """
+        self._drain()
+        with self._failures_lock:
+            failures, self._failures = self._failures, []
+        if failures:
+            raise PersistenceError(failures)
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer_thread.join()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -------------------------------------------------------------------------
+    # tasks
+    # -------------------------------------------------------------------------
+
+    def save_task(self, user_id: str, task: Dict):
+        """Insert or update a task (CLI Task dict or app task dict)"""
+        self._enqueue(UPSERT_TASK, (
+            user_id,
+            task["id"],
+            str(_label(task["status"])),
+            (task.get("created_at") or "")[:10],
+            task.get("category"),
+            str(_label(task.get("priority"))),
+            json.dumps(to_jsonable(task)),
+            time.time(),
+        ))
+
+    def save_tasks(self, user_id: str, tasks: List[Dict]):
+        for task in tasks:
+            self.save_task(user_id, task)
+
+    def delete_task(self, user_id: str, task_id: str):
+        self._enqueue(DELETE_TASK, (user_id, task_id))
+
+    def delete_user_tasks(self, user_id: str):
+        self._enqueue(DELETE_USER_TASKS, (user_id,))
+
+    def load_tasks(self, user_id: str, status: Optional[Any] = None, date: Optional[str] = None) -> List[Dict]:
+        """Tasks for a user (optionally one status and/or creation date), oldest first"""
+        self._drain()
+        sql = "SELECT payload FROM tasks WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(str(_label(status)))
+        if date is not None:
+            sql += " AND date = ?"
+            params.append(date)
+        sql += " ORDER BY rowid"
+        return [json.loads(payload) for (payload,) in self._reader().execute(sql, params)]
+
+    def count_tasks(self, user_id: str, status: Optional[Any] = None) -> int:
+        self._drain()
+        if status is None:
+            row = self._reader().execute("SELECT COUNT(*) FROM tasks WHERE user_id = ?", (user_id,)).fetchone()
+        else:
+            row = self._reader().execute(
+                "SELECT COUNT(*) FROM tasks WHERE user_id = ? AND status = ?", (user_id, str(_label(status)))
+            ).fetchone()
+        return row[0]
+
+    # -------------------------------------------------------------------------
+    # goals, habits and daily contexts
+    # -------------------------------------------------------------------------
+
+    def save_goal(self, user_id: str, goal_id: str, text: str):
+        self._enqueue(UPSERT_GOAL, (user_id, goal_id, text, time.time()))
+
+    def delete_goal(self, user_id: str, goal_id: str):
+        self._enqueue(DELETE_GOAL, (user_id, goal_id))
+
+    def load_goals(self, user_id: str) -> List[Tuple[str, str]]:
+        """(goal_id, text) pairs in creation order"""
+        self._drain()
+        return list(self._reader().execute(
+            "SELECT goal_id, text FROM goals WHERE user_id = ? ORDER BY created_at", (user_id,)
+        ))
+
+    def save_habits(self, user_id: str, habits: Dict):
+        """Compact habit form (see habits.HabitTracker.to_dict)"""
+        self._enqueue(UPSERT_HABITS, (user_id, json.dumps(habits), time.time()))
+
+    def load_habits(self, user_id: str) -> Optional[Dict]:
+        self._drain()
+        row = self._reader().execute("SELECT payload FROM habits WHERE user_id = ?", (user_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save_daily_context(self, user_id: str, date: str, context: Dict):
+        self._enqueue(UPSERT_CONTEXT, (user_id, date, json.dumps(to_jsonable(context)), time.time()))
+
+    def load_daily_context(self, user_id: str, date: str) -> Optional[Dict]:
+        self._drain()
+        row = self._reader().execute(
+            "SELECT payload FROM daily_contexts WHERE user_id = ? AND date = ?", (user_id, date)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
@@ -0,0 +1,169 @@
+"""Persistent, content-addressed cache in front of any LangChain embeddings object.
+
+Vectors are stored in a small SQLite file keyed by sha256(model name, text), so
+rebuilding or reloading the goal memory costs no embedding calls for text that
+has been seen before. The cache is bounded by entry count; the least recently
+used vectors are evicted first.
+
+Hits are pure reads: their `last_used` stamps are buffered in memory and
+written in one batch every `TOUCH_BATCH` hits or `TOUCH_INTERVAL` seconds
+(and always before evicting), so the LRU order is at most that far behind.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_CACHE_PATH = ".embedding_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 200_000
+
+TOUCH_BATCH = 1000
+TOUCH_INTERVAL = 30.0  # seconds
+
+# SQLite's default limit on bound parameters per statement
+_SQLITE_MAX_VARS = 900
+
+
+def _model_name(embeddings: Embeddings) -> str:
+    for attr in ("model", "model_name", "model_id"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embeddings).__name__
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an `Embeddings` object with an on-disk vector cache"""
+
+    def __init__(self, underlying: Embeddings, path: str = DEFAULT_CACHE_PATH,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, model_name: Optional[str] = None):
+        self.underlying = underlying
+        self.model_name = model_name or _model_name(underlying)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        # running row count, so stores don't scan the table to decide on eviction
+        (self._count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        self._touched: Dict[str, float] = {}  # key -> last use not yet written
+        self._touched_at = time.monotonic()
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        for start in range(0, len(keys), _SQLITE_MAX_VARS):
+            chunk = keys[start:start + _SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+        return found
+
+    def _store(self, items: Dict[str, List[float]]):
+        now = time.time()
+        inserted = self._conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            [(key, array("f", vector).tobytes(), now) for key, vector in items.items()],
+        ).rowcount
+        self._count += max(0, inserted)
+        if self._count > self.max_entries:
+            self._write_touches()
+            self._evict()
+        self._conn.commit()
+
+    def _touch(self, keys: List[str]):
+        """Note cache hits; written lazily (see module docstring)"""
+        now = time.time()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH or time.monotonic() - self._touched_at >= TOUCH_INTERVAL:
+            self._write_touches()
+            self._conn.commit()
+
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched = {}
+        self._touched_at = time.monotonic()
+
+    def _evict(self):
+        excess = self._count - self.max_entries
+        if excess > 0:
+            deleted = self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            ).rowcount
+            self._count -= deleted
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, calling the underlying model only for unseen ones"""
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            cached = self._lookup(list(set(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        fresh: Dict[str, List[float]] = {}
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+
+        with self._lock:
+            self._touch(list(cached))
+            if fresh:
+                self._store(fresh)
+
+        return [cached[key] if key in cached else fresh[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query, going through the same cache"""
+        key = self._key(text)
+        with self._lock:
+            cached = self._lookup([key])
+        if key in cached:
+            self.hits += 1
+            with self._lock:
+                self._touch([key])
+            return cached[key]
+
+        self.misses += 1
+        vector = self.underlying.embed_query(text)
+        with self._lock:
+            self._store({key: vector})
+        return vector
+
+    def close(self):
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,204 @@
+"""FAISS index backends for the goal memory.
+
+Small memories use an exact flat index. Once a memory grows past
+`switch_over` vectors it is migrated to the configured approximate backend:
+
+- ``hnsw``:  graph index, no training, best latency, vectors kept in full
+- ``ivf``:   inverted lists over k-means cells (trained at switch-over)
+- ``ivfpq``: IVF with product-quantized codes, a fraction of the memory
+- ``fp16``:  exact scan over float16 vectors, half the memory of ``flat``
+
+`recall_latency_report` measures recall@k against exact search together with
+per-query latency and index size, to pick a backend for a given corpus.
+"""
+import math
+import os
+import time
+from typing import Dict, List, Optional, Sequence, TypedDict
+
+import faiss
+import numpy as np
+
+INDEX_KINDS = ("flat", "hnsw", "ivf", "ivfpq", "fp16")
+
+
+class IndexConfig(TypedDict, total=False):
+    kind: str          # one of INDEX_KINDS
+    switch_over: int   # stay flat below this many vectors
+    hnsw_m: int        # graph degree
+    ef_search: int     # HNSW search breadth
+    nlist: int         # IVF cells; 0 picks ~4*sqrt(n)
+    nprobe: int        # IVF cells visited per query
+    pq_m: int          # PQ sub-quantizers (must divide the dimension)
+    pq_bits: int       # bits per PQ code
+
+
+DEFAULT_INDEX_CONFIG: IndexConfig = {
+    "kind": "flat",
+    "switch_over": 50_000,
+    "hnsw_m": 32,
+    "ef_search": 64,
+    "nlist": 0,
+    "nprobe": 16,
+    "pq_m": 64,
+    "pq_bits": 8,
+}
+
+
+def index_config(**overrides) -> IndexConfig:
+    config = IndexConfig(**DEFAULT_INDEX_CONFIG)
+    config.update(overrides)
+    if config["kind"] not in INDEX_KINDS:
+        raise ValueError(f"Unknown index kind {config['kind']!r}; expected one of {INDEX_KINDS}")
+    return config
+
+
+def index_config_from_env() -> IndexConfig:
+    """Read GOAL_INDEX_KIND / GOAL_INDEX_SWITCH_OVER, falling back to the defaults"""
+    overrides = {}
+    if os.getenv("GOAL_INDEX_KIND"):
+        overrides["kind"] = os.environ["GOAL_INDEX_KIND"]
+    if os.getenv("GOAL_INDEX_SWITCH_OVER"):
+        overrides["switch_over"] = int(os.environ["GOAL_INDEX_SWITCH_OVER"])
+    return index_config(**overrides)
+
+
+def _nlist(config: IndexConfig, n: int) -> int:
+    if config["nlist"]:
+        return config["nlist"]
+    # ~4*sqrt(n) cells, but keep >= 39 training points per cell
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def build_index(config: IndexConfig, dimension: int, training: Optional[np.ndarray] = None) -> faiss.Index:
+    """Create an empty index of the configured kind, trained on `training` if required"""
+    kind = config["kind"]
+    if kind == "flat":
+        return faiss.IndexFlatL2(dimension)
+    if kind == "fp16":
+        return faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2)
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, config["hnsw_m"])
+        index.hnsw.efSearch = config["ef_search"]
+        return index
+
+    if training is None or len(training) == 0:
+        raise ValueError(f"{kind} index needs training vectors")
+    quantizer = faiss.IndexFlatL2(dimension)
+    nlist = _nlist(config, len(training))
+    if kind == "ivf":
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_L2)
+    else:
+        index = faiss.IndexIVFPQ(quantizer, dimension, nlist, config["pq_m"], config["pq_bits"])
+    index.train(training)
+    index.nprobe = config["nprobe"]
+    return index
+
+
+def is_flat(index: faiss.Index) -> bool:
+    return isinstance(faiss.downcast_index(index), faiss.IndexFlat)
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """True if remove_ids() compacts the index so positions stay contiguous"""
+    flat_codes = getattr(faiss, "IndexFlatCodes", faiss.IndexFlat)
+    return isinstance(faiss.downcast_index(index), flat_codes)
+
+
+def rebuild_index(vectors: np.ndarray, config: IndexConfig) -> faiss.Index:
+    """Build a populated index of the configured kind; positions follow row order"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = build_index(config, vectors.shape[1], vectors)
+    if len(vectors):
+        index.add(vectors)
+    return index
+
+
+RECONSTRUCT_BATCH = 65_536
+
+
+def reconstruct(index: faiss.Index, positions: Sequence[int]) -> np.ndarray:
+    """Stored vectors at `positions` (exact, except PQ which returns its decoded codes)"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVF):
+        index.make_direct_map()  # IVF lists are not addressable by position otherwise
+    positions = np.asarray(positions, dtype=np.int64)
+    vectors = np.empty((len(positions), index.d), dtype=np.float32)
+    for start in range(0, len(positions), RECONSTRUCT_BATCH):
+        chunk = positions[start:start + RECONSTRUCT_BATCH]
+        vectors[start:start + len(chunk)] = index.reconstruct_batch(chunk)
+    return vectors
+
+
+def refill_index(index: faiss.Index, vectors: np.ndarray) -> faiss.Index:
+    """Empty copy of a trained index holding `vectors`, without retraining"""
+    refilled = faiss.clone_index(index)
+    refilled.reset()
+    if len(vectors):
+        refilled.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    return refilled
+
+
+def should_switch(index: faiss.Index, config: IndexConfig) -> bool:
+    return config["kind"] != "flat" and is_flat(index) and index.ntotal >= config["switch_over"]
+
+
+def index_bytes(index: faiss.Index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def recall_latency_report(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                          configs: Optional[List[IndexConfig]] = None) -> List[Dict]:
+    """Compare backends on the same data: recall@k vs exact search, latency and size"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    if configs is None:
+        configs = [index_config(kind=kind) for kind in INDEX_KINDS]
+
+    exact = rebuild_index(vectors, index_config(kind="flat"))
+    _, truth = exact.search(queries, k)
+
+    rows = []
+    for config in configs:
+        started = time.perf_counter()
+        index = rebuild_index(vectors, config)
+        build_s = time.perf_counter() - started
+
+        latencies = []
+        found = np.empty((len(queries), k), dtype=np.int64)
+        for row, query in enumerate(queries):
+            started = time.perf_counter()
+            _, ids = index.search(query[None, :], k)
+            latencies.append(time.perf_counter() - started)
+            found[row] = ids[0]
+
+        hits = sum(len(np.intersect1d(found[row], truth[row])) for row in range(len(queries)))
+        latencies_ms = np.array(latencies) * 1000
+        rows.append({
+            "kind": config["kind"],
+            f"recall@{k}": hits / (len(queries) * k),
+            "p50_ms": float(np.percentile(latencies_ms, 50)),
+            "p99_ms": float(np.percentile(latencies_ms, 99)),
+            "build_s": build_s,
+            "mbytes": index_bytes(index) / 1e6,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n, dimension = int(os.getenv("REPORT_N", "100000")), int(os.getenv("REPORT_DIM", "256"))
+    data = rng.standard_normal((n, dimension), dtype=np.float32)
+    probes = data[rng.choice(n, 200, replace=False)] + 0.01 * rng.standard_normal((200, dimension), dtype=np.float32)
+
+    print(f"{n} vectors x {dimension} dims, 200 queries")
+    print(f"{'kind':<8}{'recall@10':>10}{'p50 ms':>9}{'p99 ms':>9}{'build s':>9}{'MB':>9}")
+    for result in recall_latency_report(data, probes, k=10, configs=[
+        index_config(kind="flat"),
+        index_config(kind="fp16"),
+        index_config(kind="hnsw"),
+        index_config(kind="ivf"),
+        index_config(kind="ivfpq", pq_m=32),
+    ]):
+        print(f"{result['kind']:<8}{result['recall@10']:>10.3f}{result['p50_ms']:>9.3f}"
+              f"{result['p99_ms']:>9.3f}{result['build_s']:>9.2f}{result['mbytes']:>9.1f}")
@@ -1,32 +1,602 @@
+import base64
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 
 from dotenv import load_dotenv
-embeddings = OpenAIEmbeddings()
+
+import goal_index
+import resources
+
 load_dotenv()
 
-goals = [
-    Document(
-        page_content="Become an expert in building AI agents using LangChain and LangGraph.",
-        metadata={"category": "career", "importance": "high"}
-    ),
-    Document(
-        page_content="Maintain hair and skin health by following a weekly self-care routine.",
-        metadata={"category": "health", "importance": "medium"}
-    ),
-    Document(
-        page_content="Improve relationship communication skills with thoughtful WhatsApp responses.",
-        metadata={"category": "relationship", "importance": "high"}
-    ),
+DELTA_LOG = "delta.jsonl"
+SNAPSHOT_ID_FILE = "snapshot.id"  # changes with every compaction
+COMPACT_AFTER = 1000  # delta records before the log is folded into a new snapshot
+MAPPED_DIR = "mapped"  # pickle-free export read by MappedGoalMemory
+VECTORS_FILE = "vectors.faiss"
+DOCS_FILE = "docs.sqlite"
+CURRENT_FILE = "CURRENT"  # names the export version readers should open
+KEEP_EXPORTS = 2  # the current export and the one before it
+REFRESH_INTERVAL = 1.0  # seconds between a reader's checks of CURRENT
+EXPORT_INTERVAL = 60.0  # seconds an existing mapped export may lag behind flushed edits
+
+
+def _encode_vector(vector: List[float]) -> str:
+    return base64.b64encode(array("f", vector).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> List[float]:
+    return array("f", base64.b64decode(data)).tolist()
+
+
+def embed_queries(embeddings, queries: Sequence[str]) -> np.ndarray:
+    """Embed many queries in a single request as an (n, d) float32 matrix"""
+    return np.asarray(embeddings.embed_documents(list(queries)), dtype=np.float32)
+
+
+class GoalMemory:
+    """FAISS goal memory with upsert/delete by stable goal id.
+
+    The on-disk layout is the usual `save_local` snapshot plus an append-only
+    `delta.jsonl` holding every upsert/delete since that snapshot (vectors
+    included, so replaying it never calls the embedding model). Edits only
+    append to the log; `compact()` folds it into a fresh snapshot, which
+    `flush()` does automatically once the log grows past `compact_after`.
+
+    The index starts flat and is migrated to `index_config["kind"]` once it
+    holds `switch_over` vectors (see goal_index.py). Backends whose
+    remove_ids() would leave positions non-contiguous (HNSW, IVF) delete by
+    tombstoning: the position keeps its vector but loses its docstore entry,
+    searches over-fetch to skip it, and `compact()` rebuilds without it.
+
+    Edits, flushes and compactions hold the memory's own lock. `close()`
+    flushes under it; a closed memory rejects further edits, so a caller
+    still holding it cannot write changes that would never reach disk.
+    """
+
+    def __init__(self, path: str = resources.GOAL_MEMORY_PATH, embeddings=None,
+                 compact_after: int = COMPACT_AFTER,
+                 index_config: Optional[goal_index.IndexConfig] = None):
+        self.path = path
+        self.embeddings = embeddings or resources.get_embeddings()
+        self.compact_after = compact_after
+        self.index_config = index_config or goal_index.index_config()
+        self.store: Optional[FAISS] = None
+        self._positions: Optional[Dict[str, int]] = None
+        self._pending: List[Dict] = []
+        self._log_records = 0
+        self.version = 0  # bumped on every edit since the snapshot; see cache_key
+        self._snapshot = ""  # id of the snapshot the delta log applies to
+        self.closed = False
+        self._lock = threading.RLock()
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # loading
+    # -------------------------------------------------------------------------
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.path, DELTA_LOG)
+
+    def _load(self):
+        if os.path.exists(os.path.join(self.path, "index.faiss")):
+            self.store = FAISS.load_local(self.path, self.embeddings, allow_dangerous_deserialization=True)
+            try:
+                with open(os.path.join(self.path, SNAPSHOT_ID_FILE), encoding="utf-8") as snapshot_id:
+                    self._snapshot = snapshot_id.read().strip()
+            except FileNotFoundError:
+                self._snapshot = str(os.stat(os.path.join(self.path, "index.faiss")).st_mtime_ns)
+        if os.path.exists(self._log_path):
+            intact = 0  # bytes up to the end of the last complete record
+            with open(self._log_path, "rb") as log:
+                for line in log:
+                    if not line.endswith(b"\n"):
+                        break  # torn final write; everything before it is intact
+                    if line.strip():
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            break
+                        self._apply(record)
+                        self._log_records += 1
+                    intact += len(line)
+            if intact < os.path.getsize(self._log_path):
+                # drop the torn tail so the next flush starts on a fresh line
+                with open(self._log_path, "r+b") as log:
+                    log.truncate(intact)
+
+    def _apply(self, record: Dict):
+        if record["op"] == "upsert":
+            self._remove(record["id"])
+            self._add(record["id"], record["text"], record.get("metadata") or {}, _decode_vector(record["vector"]))
+        elif record["op"] == "delete":
+            self._remove(record["id"])
+
+    def _ensure_store(self, dimension: int):
+        if self.store is None:
+            self.store = FAISS(
+                embedding_function=self.embeddings,
+                index=goal_index.build_index(goal_index.index_config(kind="flat"), dimension),
+                docstore=InMemoryDocstore(),
+                index_to_docstore_id={},
+            )
+
+    def _position_of(self, goal_id: str) -> int:
+        if self._positions is None:
+            self._positions = {doc_id: position for position, doc_id in self.store.index_to_docstore_id.items()}
+        return self._positions[goal_id]
+
+    def _add(self, goal_id: str, text: str, metadata: Dict, vector: List[float]):
+        self._ensure_store(len(vector))
+        position = self.store.index.ntotal
+        self.store.index.add(np.asarray([vector], dtype=np.float32))
+        self.store.docstore.add({goal_id: Document(page_content=text, metadata=metadata)})
+        self.store.index_to_docstore_id[position] = goal_id
+        self.version += 1
+        if self._positions is not None:
+            self._positions[goal_id] = position
+
+    def _remove(self, goal_id: str) -> bool:
+        if goal_id not in self:
+            return False
+        self.version += 1
+        if goal_index.supports_removal(self.store.index):
+            self.store.delete([goal_id])  # compacts the index and renumbers positions
+            self._positions = None
+        else:
+            del self.store.index_to_docstore_id[self._position_of(goal_id)]
+            self.store.docstore.delete([goal_id])
+            self._positions.pop(goal_id)
+        return True
+
+    @property
+    def cache_key(self) -> Tuple:
+        """Identifies the contents across reopening: replaying the same
+        snapshot and delta log counts the same edits, so a shard that was
+        evicted and reopened gets the key it had when it was closed"""
+        return self.path, self._snapshot, self.version
+
+    @property
+    def tombstones(self) -> int:
+        """Deleted positions still occupying the approximate index"""
+        if self.store is None:
+            return 0
+        return self.store.index.ntotal - len(self.store.index_to_docstore_id)
+
+    def _maybe_switch_index(self):
+        if self.store is not None and goal_index.should_switch(self.store.index, self.index_config):
+            flat = self.store.index
+            self.store.index = goal_index.rebuild_index(flat.reconstruct_n(0, flat.ntotal), self.index_config)
+            self.compact()
+
+    def search_by_vectors(self, vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+        """One FAISS search for a (n, d) query matrix; per-query (document, L2 distance) lists"""
+        if self.store is None or not len(self):
+            return [[] for _ in range(len(vectors))]
+        fetch = min(k + self.tombstones, self.store.index.ntotal)
+        distances, positions = self.store.index.search(np.ascontiguousarray(vectors, dtype=np.float32), fetch)
+
+        mapping = self.store.index_to_docstore_id
+        docs = self.store.docstore._dict
+        results = []
+        for row_distances, row_positions in zip(distances, positions):
+            row = []
+            for distance, position in zip(row_distances, row_positions):
+                goal_id = mapping.get(int(position))
+                if goal_id is None:
+                    continue  # -1 padding or a tombstone
+                row.append((docs[goal_id], float(distance)))
+                if len(row) == k:
+                    break
+            results.append(row)
+        return results
+
+    # -------------------------------------------------------------------------
+    # public API
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, goal_id: str) -> bool:
+        return self.store is not None and goal_id in self.store.docstore._dict
+
+    def __len__(self) -> int:
+        return 0 if self.store is None else len(self.store.index_to_docstore_id)
+
+    def ids(self) -> List[str]:
+        return [] if self.store is None else list(self.store.index_to_docstore_id.values())
+
+    def get(self, goal_id: str) -> Optional[Document]:
+        if goal_id not in self:
+            return None
+        return self.store.docstore.search(goal_id)
+
+    def upsert(self, goal_id: str, text: str, metadata: Optional[Dict] = None) -> bool:
+        """Insert or replace one goal; returns False if nothing changed"""
+        return self.upsert_many([(goal_id, text, metadata)]) == 1
+
+    def upsert_many(self, goals: Iterable[Tuple[str, str, Optional[Dict]]]) -> int:
+        """Insert or replace several goals with a single embedding call"""
+        with self._lock:
+            self._check_open()
+            changed = []
+            for goal_id, text, metadata in goals:
+                metadata = metadata or {}
+                existing = self.get(goal_id)
+                if existing is not None and existing.page_content == text and existing.metadata == metadata:
+                    continue
+                changed.append((goal_id, text, metadata))
+            if not changed:
+                return 0
+
+            vectors = self.embeddings.embed_documents([text for _, text, _ in changed])
+            for (goal_id, text, metadata), vector in zip(changed, vectors):
+                self._remove(goal_id)
+                self._add(goal_id, text, metadata, vector)
+                self._pending.append({
+                    "op": "upsert", "id": goal_id, "text": text,
+                    "metadata": metadata, "vector": _encode_vector(vector),
+                })
+            self._maybe_switch_index()
+            return len(changed)
+
+    def delete(self, goal_id: str) -> bool:
+        """Remove a goal by id; returns False if it was not stored"""
+        with self._lock:
+            self._check_open()
+            if not self._remove(goal_id):
+                return False
+            self._pending.append({"op": "delete", "id": goal_id})
+            return True
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        if self.store is None:
+            return []
+        return self.search_by_vectors(np.asarray([self.embeddings.embed_query(query)]), k)[0]
+
+    def search_batch(self, queries: Sequence[str], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Top-k per query with one embedding request and one vectorized FAISS search"""
+        if self.store is None or not queries:
+            return [[] for _ in queries]
+        return self.search_by_vectors(embed_queries(self.embeddings, queries), k)
+
+    def flush(self):
+        """Append unflushed edits to the delta log (and compact if it got long)
+
+        Only the edits are written. A mapped export is a full copy, so it is
+        rewritten on `compact()` and on explicit `export_mapped()` calls, and
+        by a flush only once the existing one is `EXPORT_INTERVAL` seconds
+        old: MappedGoalMemory readers lag behind by at most that long.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._log_path, "a", encoding="utf-8") as log:
+                for record in self._pending:
+                    log.write(json.dumps(record) + "\n")
+                log.flush()
+                os.fsync(log.fileno())
+            self._log_records += len(self._pending)
+            self._pending = []
+            if self._log_records >= self.compact_after:
+                self.compact()
+            elif self.store is not None and self._export_is_stale():
+                self.export_mapped()
+
+    def compact(self):
+        """Write a full snapshot and truncate the delta log, dropping tombstones"""
+        with self._lock:
+            self._pending = []
+            if self.store is not None and self.tombstones:
+                self._rebuild_live()
+            if self.store is not None:
+                self.store.save_local(self.path)
+                self._write_snapshot_id()
+                self.export_mapped()
+            if os.path.exists(self._log_path):
+                os.remove(self._log_path)
+            self._log_records = 0
+            self.version = 0  # counts edits since the snapshot, like a reopened memory
+
+    def _write_snapshot_id(self):
+        self._snapshot = uuid.uuid4().hex
+        tmp = os.path.join(self.path, SNAPSHOT_ID_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as snapshot_id:
+            snapshot_id.write(self._snapshot)
+        os.replace(tmp, os.path.join(self.path, SNAPSHOT_ID_FILE))
+
+    def close(self):
+        """Flush pending edits and reject any further ones"""
+        with self._lock:
+            if not self.closed:
+                self.flush()
+                self.closed = True
+
+    def _export_is_stale(self) -> bool:
+        # export versions are their creation time in nanoseconds
+        version = MappedGoalMemory._current_version(os.path.join(self.path, MAPPED_DIR))
+        return version is not None and time.time_ns() - int(version) >= EXPORT_INTERVAL * 1e9
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError(f"Goal memory {self.path} is closed")
+
+    def export_mapped(self, path: Optional[str] = None):
+        """Write the pickle-free layout read by MappedGoalMemory (default: <path>/mapped)
+
+        Each export is a new version directory holding both files; the
+        `CURRENT` pointer is swapped atomically once it is complete, so a
+        reader always opens a matching docs/vectors pair.
+        """
+        import faiss
+
+        path = path or os.path.join(self.path, MAPPED_DIR)
+        os.makedirs(path, exist_ok=True)
+        version = f"{time.time_ns():020d}"
+        staging = os.path.join(path, version + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        faiss.write_index(self.store.index, os.path.join(staging, VECTORS_FILE))
+        docs = self.store.docstore._dict
+        conn = sqlite3.connect(os.path.join(staging, DOCS_FILE))
+        conn.execute(
+            "CREATE TABLE docs (position INTEGER PRIMARY KEY, goal_id TEXT NOT NULL UNIQUE, "
+            "page_content TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO docs VALUES (?, ?, ?, ?)",
+            ((position, goal_id, docs[goal_id].page_content, json.dumps(docs[goal_id].metadata))
+             for position, goal_id in self.store.index_to_docstore_id.items()),
+        )
+        conn.commit()
+        conn.close()
+
+        os.replace(staging, os.path.join(path, version))
+        pointer_tmp = os.path.join(path, CURRENT_FILE + ".tmp")
+        with open(pointer_tmp, "w", encoding="utf-8") as pointer:
+            pointer.write(version)
+            pointer.flush()
+            os.fsync(pointer.fileno())
+        os.replace(pointer_tmp, os.path.join(path, CURRENT_FILE))
+
+        # Readers that already opened an older version keep their inodes.
+        versions = sorted(name for name in os.listdir(path) if name.isdigit())
+        for old in versions[:-KEEP_EXPORTS]:
+            shutil.rmtree(os.path.join(path, old), ignore_errors=True)
+
+    def _rebuild_live(self):
+        # Live vectors are read back from the index itself, never re-embedded;
+        # the trained index is refilled as is, so IVF cells and PQ codebooks
+        # are not retrained (PQ codes re-encode to themselves).
+        live = sorted(self.store.index_to_docstore_id.items())
+        vectors = goal_index.reconstruct(self.store.index, [position for position, _ in live])
+        if len(live) < self.index_config["switch_over"]:
+            self.store.index = goal_index.rebuild_index(vectors, goal_index.index_config(kind="flat"))
+        else:
+            self.store.index = goal_index.refill_index(self.store.index, vectors)
+        self.store.index_to_docstore_id = {position: goal_id for position, (_, goal_id) in enumerate(live)}
+        self._positions = None
+
+
+class _MappedExport:
+    """One opened export version: mapped vectors plus the docs database
+
+    `users` counts lookups in progress; a retired export (superseded by a
+    newer one) is closed as soon as the last of them finishes.
+    """
+
+    def __init__(self, path: str, version: str, doc_cache_size: int):
+        import faiss
+
+        flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        self.version = version
+        self.index = faiss.read_index(os.path.join(path, version, VECTORS_FILE), flags)
+        self.conn = sqlite3.connect(
+            f"file:{os.path.join(path, version, DOCS_FILE)}?mode=ro", uri=True, check_same_thread=False
+        )
+        (self.count,) = self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()
+        self.doc_at = lru_cache(maxsize=doc_cache_size)(self._load_doc)
+        self.users = 0
+        self.retired = False
+
+    def close(self):
+        """Release the docs connection and the mapped index right away (the
+        lru_cache refers back to this object, so it would otherwise wait for
+        the cyclic GC)"""
+        self.doc_at.cache_clear()
+        self.doc_at = None
+        self.conn.close()
+        self.index = None
+
+    def _load_doc(self, position: int) -> Optional[Tuple[str, Document]]:
+        row = self.conn.execute(
+            "SELECT goal_id, page_content, metadata FROM docs WHERE position = ?", (position,)
+        ).fetchone()
+        if row is None:
+            return None  # tombstoned position
+        return row[0], Document(page_content=row[1], metadata=json.loads(row[2]))
+
+
+class MappedGoalMemory:
+    """Read-only goal memory that never unpickles anything.
+
+    Vectors are memory-mapped from `vectors.faiss` (read-only, so every worker
+    process shares the same page-cache pages) and documents are fetched from
+    `docs.sqlite` by position only when a search returns them. Opening one
+    costs a couple of file handles, independent of how many goals it holds.
+
+    Both files live in the version directory named by `CURRENT`. Lookups
+    check it at most every `refresh_interval` seconds and switch to a newer
+    export once the writer publishes one; the export they replace is closed
+    once no lookup is using it.
+    """
+
+    def __init__(self, path: str = os.path.join(resources.GOAL_MEMORY_PATH, MAPPED_DIR),
+                 embeddings=None, doc_cache_size: int = 4096, refresh_interval: float = REFRESH_INTERVAL):
+        self.path = path
+        self.embeddings = embeddings or resources.get_embeddings()
+        self.doc_cache_size = doc_cache_size
+        self.refresh_interval = refresh_interval
+        version = self._current_version(path)
+        if version is None:
+            raise FileNotFoundError(f"No mapped goal memory export in {path}")
+        self._export = _MappedExport(path, version, doc_cache_size)
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _current_version(path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as pointer:
+                return pointer.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def exists(path: str = os.path.join(resources.GOAL_MEMORY_PATH, MAPPED_DIR)) -> bool:
+        version = MappedGoalMemory._current_version(path)
+        return version is not None and os.path.exists(os.path.join(path, version, DOCS_FILE))
+
+    def refresh(self, force: bool = False) -> bool:
+        """Switch to the latest export if there is a newer one; True if it switched
+
+        Without `force`, CURRENT is only read if `refresh_interval` seconds
+        have passed since the last check.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return False
+        self._checked_at = now
+        version = self._current_version(self.path)
+        if version is None or version == self._export.version:
+            return False
+        export = _MappedExport(self.path, version, self.doc_cache_size)
+        with self._lock:
+            if version == self._export.version:  # another thread got there first
+                export.close()
+                return False
+            # one reference swap: concurrent lookups see the old export or the new one, never a mix
+            old, self._export = self._export, export
+            old.retired = True
+            if not old.users:
+                old.close()
+        return True
+
+    @contextmanager
+    def _current(self):
+        """The export to run one lookup against, kept open until it is done"""
+        self.refresh()
+        with self._lock:
+            export = self._export
+            export.users += 1
+        try:
+            yield export
+        finally:
+            with self._lock:
+                export.users -= 1
+                if export.retired and not export.users:
+                    export.close()
+
+    @property
+    def version(self) -> str:
+        """Export version; changes whenever the contents do (memo keys use it)"""
+        self.refresh()
+        return self._export.version
+
+    @property
+    def cache_key(self) -> Tuple:
+        return self.path, self.version
+
+    @property
+    def index(self):
+        return self._export.index
+
+    def __len__(self) -> int:
+        self.refresh()
+        return self._export.count
+
+    def __contains__(self, goal_id: str) -> bool:
+        with self._current() as export:
+            return export.conn.execute("SELECT 1 FROM docs WHERE goal_id = ?", (goal_id,)).fetchone() is not None
+
+    def get(self, goal_id: str) -> Optional[Document]:
+        with self._current() as export:
+            row = export.conn.execute("SELECT position FROM docs WHERE goal_id = ?", (goal_id,)).fetchone()
+            return None if row is None else export.doc_at(row[0])[1]
+
+    def search_by_vectors(self, vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+        """One FAISS search for a (n, d) query matrix; per-query (document, L2 distance) lists"""
+        with self._current() as export:
+            if not export.count:
+                return [[] for _ in range(len(vectors))]
+            fetch = min(k + export.index.ntotal - export.count, export.index.ntotal)
+            distances, positions = export.index.search(np.ascontiguousarray(vectors, dtype=np.float32), fetch)
+            results = []
+            for row_distances, row_positions in zip(distances, positions):
+                row = []
+                for distance, position in zip(row_distances, row_positions):
+                    entry = export.doc_at(int(position)) if position >= 0 else None
+                    if entry is None:
+                        continue
+                    row.append((entry[1], float(distance)))
+                    if len(row) == k:
+                        break
+                results.append(row)
+            return results
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        return self.search_by_vectors(np.asarray([self.embeddings.embed_query(query)]), k)[0]
+
+    def search_batch(self, queries: Sequence[str], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Top-k per query with one embedding request and one vectorized FAISS search"""
+        if not queries:
+            return []
+        return self.search_by_vectors(embed_queries(self.embeddings, queries), k)
+
+    def close(self):
+        with self._lock:
+            self._export.retired = True
+            if not self._export.users:
+                self._export.close()
+
+
+SAMPLE_GOALS = [
+    ("career-ai-agents",
+     "Become an expert in building AI agents using LangChain and LangGraph.",
+     {"category": "career", "importance": "high"}),
+    ("health-self-care",
+     "Maintain hair and skin health by following a weekly self-care routine.",
+     {"category": "health", "importance": "medium"}),
+    ("relationship-communication",
+     "Improve relationship communication skills with thoughtful WhatsApp responses.",
+     {"category": "relationship", "importance": "high"}),
 ]
 
-vectorstore = FAISS.from_documents(goals, embeddings)
-vectorstore.save_local("goal_memory_index")
 
-print("Successfully created and saved the goal memory index.")
+if __name__ == "__main__":
+    memory = GoalMemory()
+    changed = memory.upsert_many(SAMPLE_GOALS)
+    memory.flush()
+    if changed or not MappedGoalMemory.exists():
+        memory.export_mapped()
 
-retriever = vectorstore.as_retriever(k=2)
+    print(f"Successfully updated the goal memory index ({changed} changed, {len(memory)} total).")
 
-result = retriever.invoke("What are my career goals?")
-print("Result: ", result[0].page_content)
\ No newline at end of file
+    queries = ["What are my career goals?", "How do I look after my health?"]
+    for query, hits in zip(queries, memory.search_batch(queries, k=2)):
+        print(f"{query} -> {hits[0][0].page_content} (distance {hits[0][1]:.3f})")
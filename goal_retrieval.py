@@ -0,0 +1,92 @@
+"""Retrieval of stored goals that fit the day's context.
+
+The planner asks "which of my goals make sense today?" with a handful of
+context queries (mood/energy, stress, task categories). All queries are
+embedded together and answered by one FAISS search, and the merged result is
+memoized per (user, context fingerprint) so replans with an unchanged context
+skip retrieval entirely.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+import resources
+
+MEMO_SIZE = 4096
+STRESS_QUERY_LEVEL = 6  # stress at which goals about relaxation are searched too
+
+
+def stress_band(stress_level: int) -> str:
+    if stress_level >= 7:
+        return "high"
+    if stress_level >= 4:
+        return "moderate"
+    return "low"
+
+
+def context_queries(daily_context: Dict, categories: Sequence[str]) -> List[str]:
+    """Natural-language probes describing today's context"""
+    mood = daily_context["mood"].name.replace("_", " ").lower()
+    energy = daily_context["energy"].name.lower()
+    queries = [f"Goals to work on when feeling {mood} with {energy} energy"]
+    if daily_context["stress_level"] >= STRESS_QUERY_LEVEL:
+        queries.append("Goals about relaxation, health and reducing stress")
+    queries.extend(f"My {category} goals" for category in categories)
+    return queries
+
+
+def context_fingerprint(daily_context: Dict, categories: Sequence[str]) -> str:
+    """Stable key for the context: a digest of the queries it produces, so two
+    contexts share a memo entry exactly when they would run the same searches"""
+    queries = context_queries(daily_context, sorted(set(categories)))
+    return hashlib.sha1("\n".join(queries).encode("utf-8")).hexdigest()
+
+
+class GoalRetriever:
+    """Memoized, batched context -> goals lookup over the per-user goal memory"""
+
+    def __init__(self, memo_size: int = MEMO_SIZE):
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple, List[Tuple[Document, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _memory_for(self, user_id: str):
+        memory = resources.get_user_goal_memory(user_id)
+        if not len(memory):
+            memory = resources.get_goal_memory_reader()  # shared, pre-sharding index
+        return memory
+
+    def retrieve(self, user_id: str, daily_context: Dict, categories: Sequence[str],
+                 k: int = 3) -> List[Tuple[Document, float]]:
+        """Top-k goals (document, L2 distance) across all context queries, best first"""
+        memory = self._memory_for(user_id)
+        key = (user_id, memory.cache_key, context_fingerprint(daily_context, categories), k)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        best: Dict[str, Tuple[Document, float]] = {}
+        for hits in memory.search_batch(context_queries(daily_context, sorted(set(categories))), k):
+            for doc, distance in hits:
+                text = doc.page_content
+                if text not in best or distance < best[text][1]:
+                    best[text] = (doc, distance)
+        results = sorted(best.values(), key=lambda hit: hit[1])[:k]
+
+        with self._lock:
+            self._memo[key] = results
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return results
+
+
+_retriever = GoalRetriever()
+
+
+def retrieve_goals_for_context(user_id: str, daily_context: Dict, categories: Sequence[str],
+                               k: int = 3) -> List[Tuple[Document, float]]:
+    return _retriever.retrieve(user_id, daily_context, categories, k)
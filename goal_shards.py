@@ -0,0 +1,269 @@
+"""Per-user goal memories with an in-process LRU of open shards.
+
+Each user (namespace) gets its own GoalMemory directory under
+`goal_memory_index/users/`. Open shards are kept in an LRU bounded by an
+estimated memory budget; the least recently used ones are flushed and closed
+first. Recently active users are remembered on disk so a restarted server can
+warm their shards in the background before their first request.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+import goal_index
+import resources
+from goal_memory import GoalMemory, embed_queries
+
+USERS_DIR = "users"
+RECENT_FILE = "recent_users.json"
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+DOC_OVERHEAD_BYTES = 1024  # docstore entry + id mapping, roughly
+MAX_RECENT = 1000
+SAVE_RECENT_INTERVAL = 60.0  # seconds between saves of the recent-user list
+
+
+def shard_dirname(user_id: str) -> str:
+    """Filesystem-safe, collision-free directory name for a user id"""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", user_id).strip("-")[:40] or "user"
+    return f"{slug}-{hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:12]}"
+
+
+def estimate_bytes(memory: GoalMemory) -> int:
+    """Approximate resident size of an open shard"""
+    if memory.store is None:
+        return 0
+    index = memory.store.index
+    code_size = index.sa_code_size() if hasattr(index, "sa_code_size") else index.d * 4
+    return index.ntotal * code_size + len(memory) * DOC_OVERHEAD_BYTES
+
+
+class GoalMemoryShards:
+    """LRU of per-user GoalMemory shards bounded by `memory_budget` bytes"""
+
+    def __init__(self, root: str = os.path.join(resources.GOAL_MEMORY_PATH, USERS_DIR), embeddings=None,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 index_config: Optional[goal_index.IndexConfig] = None, preload_workers: int = 2):
+        self.root = root
+        self.embeddings = embeddings
+        self.memory_budget = memory_budget
+        self.index_config = index_config
+        self._open: "OrderedDict[str, GoalMemory]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._loading: Dict[str, Future] = {}
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._recent_saved_at = time.monotonic()
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=preload_workers, thread_name_prefix="goal-shard-preload")
+        self._load_recent()
+
+    # -------------------------------------------------------------------------
+    # shard access
+    # -------------------------------------------------------------------------
+
+    def path_for(self, user_id: str) -> str:
+        return os.path.join(self.root, shard_dirname(user_id))
+
+    def _open_shard(self, user_id: str) -> GoalMemory:
+        return GoalMemory(self.path_for(user_id), self.embeddings or resources.get_embeddings(),
+                          index_config=self.index_config)
+
+    def get(self, user_id: str, touch: bool = True) -> GoalMemory:
+        """Return the user's shard, loading it (or waiting for a preload or an eviction) if needed"""
+        if touch:
+            with self._lock:
+                save_due = self._touch(user_id)
+            if save_due:
+                self.save_recent()
+        while True:
+            with self._lock:
+                if user_id in self._open:
+                    self._open.move_to_end(user_id)
+                    return self._open[user_id]
+                future = self._loading.get(user_id)
+                if future is None:
+                    future = Future()
+                    self._loading[user_id] = future
+                    break
+            memory = future.result()
+            if memory is not None:
+                return memory
+            # the shard was being evicted; its files are final now, so reopen it
+
+        try:
+            memory = self._open_shard(user_id)
+        except BaseException as error:
+            with self._lock:
+                self._loading.pop(user_id, None)
+            future.set_exception(error)
+            raise
+        with self._lock:
+            self._loading.pop(user_id, None)
+            self._open[user_id] = memory
+            self._sizes[user_id] = estimate_bytes(memory)
+            victims = self._over_budget(keep=user_id)
+        future.set_result(memory)
+        self._close_detached(victims)
+        return memory
+
+    def resize(self, user_id: str):
+        """Re-estimate a shard's size after writes and enforce the budget"""
+        with self._lock:
+            if user_id not in self._open:
+                return
+            self._sizes[user_id] = estimate_bytes(self._open[user_id])
+            victims = self._over_budget(keep=user_id)
+        self._close_detached(victims)
+
+    def search_batch(self, requests: Sequence[Tuple[str, str]], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Answer (user_id, query) pairs for many users: one embedding call, one search per shard"""
+        if not requests:
+            return []
+        vectors = embed_queries(self.embeddings or resources.get_embeddings(), [query for _, query in requests])
+        rows_by_user: Dict[str, List[int]] = {}
+        for row, (user_id, _) in enumerate(requests):
+            rows_by_user.setdefault(user_id, []).append(row)
+
+        results: List[List[Tuple[Document, float]]] = [[] for _ in requests]
+        for user_id, rows in rows_by_user.items():
+            for row, hits in zip(rows, self.get(user_id).search_by_vectors(vectors[rows], k)):
+                results[row] = hits
+        return results
+
+    @property
+    def memory_used(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def loaded_users(self) -> List[str]:
+        with self._lock:
+            return list(self._open)
+
+    def evict(self, user_id: str) -> bool:
+        """Flush and close one shard
+
+        The shard is closed under its own lock, so later writes through a
+        reference callers still hold are rejected instead of lost, and a
+        concurrent `get()` of that user waits for the flush before reopening
+        the files. The shard-wide lock is not held while it flushes, so other
+        users' shards stay available.
+        """
+        with self._lock:
+            detached = self._detach(user_id)
+        if detached is None:
+            return False
+        self._close_detached([detached])
+        return True
+
+    def _detach(self, user_id: str) -> Optional[Tuple[str, GoalMemory, Future]]:
+        # Caller holds `_lock`. Takes the shard out of the LRU and makes
+        # `get()` wait on the returned future until it has been closed.
+        memory = self._open.pop(user_id, None)
+        self._sizes.pop(user_id, None)
+        if memory is None:
+            return None
+        closing = Future()
+        self._loading[user_id] = closing
+        return user_id, memory, closing
+
+    def _close_detached(self, detached: List[Tuple[str, GoalMemory, Future]]):
+        # Called without `_lock`: flushing (and any compaction) is slow
+        for user_id, memory, closing in detached:
+            try:
+                memory.close()
+            finally:
+                with self._lock:
+                    self._loading.pop(user_id, None)
+                closing.set_result(None)
+
+    def _over_budget(self, keep: str) -> List[Tuple[str, GoalMemory, Future]]:
+        """Detach least recently used shards until the budget holds (caller holds `_lock`)"""
+        victims = []
+        while self.memory_used > self.memory_budget and len(self._open) > 1:
+            victim = next(iter(self._open))
+            if victim == keep:
+                self._open.move_to_end(victim)
+                victim = next(iter(self._open))
+            victims.append(self._detach(victim))
+        return victims
+
+    # -------------------------------------------------------------------------
+    # recency and background preloading
+    # -------------------------------------------------------------------------
+
+    def _touch(self, user_id: str) -> bool:
+        """Mark a user active; True if the recent list is due to be saved"""
+        self._recent.pop(user_id, None)
+        self._recent[user_id] = None
+        while len(self._recent) > MAX_RECENT:
+            self._recent.popitem(last=False)
+        now = time.monotonic()
+        if now - self._recent_saved_at < SAVE_RECENT_INTERVAL:
+            return False
+        self._recent_saved_at = now
+        return True
+
+    def recent_users(self, limit: int = 50) -> List[str]:
+        with self._lock:
+            return list(reversed(self._recent))[:limit]
+
+    def preload(self, user_ids: Iterable[str]) -> List[Future]:
+        """Open shards in background threads; `get()` will wait on in-flight loads"""
+        futures = []
+        for user_id in user_ids:
+            with self._lock:
+                if user_id in self._open or user_id in self._loading:
+                    continue
+                if not os.path.isdir(self.path_for(user_id)):
+                    continue
+            futures.append(self._executor.submit(self._preload_one, user_id))
+        return futures
+
+    def _preload_one(self, user_id: str) -> Optional[GoalMemory]:
+        # Preloading never pushes out shards that are already warm
+        if self.memory_used >= self.memory_budget:
+            return None
+        return self.get(user_id, touch=False)
+
+    def preload_recent(self, limit: int = 50) -> List[Future]:
+        """Warm the most recently active users, newest first, until the budget is reached"""
+        return self.preload(self.recent_users(limit))
+
+    def _recent_path(self) -> str:
+        return os.path.join(self.root, RECENT_FILE)
+
+    def _load_recent(self):
+        try:
+            with open(self._recent_path(), encoding="utf-8") as recent:
+                for user_id in json.load(recent):
+                    self._recent[user_id] = None
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def save_recent(self):
+        """Write the recent-user list (also done every SAVE_RECENT_INTERVAL seconds of activity)"""
+        with self._lock:
+            users = list(self._recent)
+        with self._save_lock:
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self._recent_path() + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as recent:
+                json.dump(users, recent)
+            os.replace(tmp, self._recent_path())
+
+    def close(self):
+        """Flush every open shard and remember who was active"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            users = list(self._open)
+        for user_id in users:
+            self.evict(user_id)
+        self.save_recent()
@@ -0,0 +1,171 @@
+"""Response cache for LLM coaching text.
+
+Lookups try the exact prompt hash first and then fall back to semantic
+matching: the prompt is embedded and compared (cosine) with the prompts
+already answered, and a close enough one is reused. Callers pass a `bucket`
+naming the structured context the answer depends on (e.g. mood, energy and
+stress band); it is part of the exact key and semantic matches never cross
+buckets, so prompts that differ only in those words are not confused with
+each other. Entries expire after a
+TTL, the cache is bounded by entry count (least recently used evicted first)
+and it can be saved to / loaded from a JSON file.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_SIMILARITY = 0.95
+
+
+def prompt_key(prompt: str, bucket: str = "") -> str:
+    return hashlib.sha256(f"{bucket}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Exact + semantic prompt -> response cache with TTL and LRU eviction"""
+
+    def __init__(self, embeddings=None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, similarity_threshold: float = DEFAULT_SIMILARITY,
+                 path: Optional[str] = None):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.path = path
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # per bucket: unit-normalized prompt vectors and their keys, rebuilt lazily
+        self._matrices: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return now - entry["created"] > self.ttl_seconds
+
+    def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        if self.embeddings is None:
+            return None
+        vector = np.asarray(self.embeddings.embed_query(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _semantic_matrix(self, bucket: str) -> Tuple[np.ndarray, List[str]]:
+        if bucket not in self._matrices:
+            keys = [key for key, entry in self._entries.items()
+                    if entry["bucket"] == bucket and entry.get("vector") is not None]
+            matrix = np.stack([self._entries[key]["vector"] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+            self._matrices[bucket] = (matrix, keys)
+        return self._matrices[bucket]
+
+    def get(self, prompt: str, bucket: str = "") -> Optional[str]:
+        now = time.time()
+        key = prompt_key(prompt, bucket)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry, now):
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return entry["response"]
+                self._drop(key)
+
+        vector = self._embed(prompt)
+        if vector is not None:
+            with self._lock:
+                matrix, keys = self._semantic_matrix(bucket)
+                if len(keys):
+                    scores = matrix @ vector
+                    for row in np.argsort(-scores):
+                        if scores[row] < self.similarity_threshold:
+                            break
+                        entry = self._entries.get(keys[row])
+                        if entry is None or self._expired(entry, now):
+                            continue
+                        self._entries.move_to_end(keys[row])
+                        self.semantic_hits += 1
+                        return entry["response"]
+        self.misses += 1
+        return None
+
+    def put(self, prompt: str, response: str, bucket: str = ""):
+        vector = self._embed(prompt)
+        key = prompt_key(prompt, bucket)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {"response": response, "created": time.time(), "vector": vector, "bucket": bucket}
+            self._matrices = {}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _drop(self, key: str):
+        self._entries.pop(key, None)
+        self._matrices = {}
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if self._expired(entry, now)]
+            for key in expired:
+                self._drop(key)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------------------------------------------------------
+    # persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        self.purge_expired()
+        with self._lock:
+            payload = [
+                {
+                    "key": key,
+                    "response": entry["response"],
+                    "created": entry["created"],
+                    "bucket": entry["bucket"],
+                    "vector": None if entry["vector"] is None else entry["vector"].tolist(),
+                }
+                for key, entry in self._entries.items()
+            ]
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as out:
+            json.dump(payload, out)
+        os.replace(tmp, path)
+
+    def load(self, path: Optional[str] = None):
+        path = path or self.path
+        try:
+            with open(path, encoding="utf-8") as src:
+                payload = json.load(src)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        now = time.time()
+        with self._lock:
+            for item in payload:
+                entry = {
+                    "response": item["response"],
+                    "created": item["created"],
+                    "bucket": item.get("bucket", ""),
+                    "vector": None if item["vector"] is None else np.asarray(item["vector"], dtype=np.float32),
+                }
+                if not self._expired(entry, now):
+                    self._entries[item["key"]] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrices = {}
@@ -0,0 +1,178 @@
+"""Shared scheduler for LLM calls.
+
+All sessions in a process go through one LLMScheduler, which
+
+- caps concurrent requests with an asyncio semaphore,
+- coalesces identical in-flight prompts into a single request (which runs
+  as its own task, so one caller cancelling does not fail the others; it is
+  only cancelled once every caller waiting on it has gone),
+- keeps a per-minute token budget (token bucket, refilled continuously and
+  corrected with the usage the provider reports), and
+- retries rate-limit / transient errors with exponential backoff and jitter.
+
+The scheduler runs its own event loop in a daemon thread, so it can be used
+from synchronous graph nodes (`invoke`) and from any asyncio loop
+(`ainvoke`). Any LangChain chat model works, including the fakes in
+`langchain_core.language_models.fake_chat_models` for local testing.
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TOKENS_PER_MINUTE = 90_000
+DEFAULT_OUTPUT_TOKENS = 256
+
+RETRYABLE_ERRORS = {
+    "RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError",
+    "ServiceUnavailableError", "TimeoutError",
+}
+
+
+def estimate_tokens(prompt: Any, output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """Rough prompt size (~4 characters per token) plus the expected completion"""
+    return len(str(prompt)) // 4 + output_tokens
+
+
+def is_retryable(error: BaseException) -> bool:
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    status = getattr(error, "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+class TokenBudget:
+    """Token bucket holding at most one minute of budget"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: int):
+        tokens = min(tokens, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def adjust(self, delta: int):
+        """Credit (negative delta) or debit tokens once the real usage is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _SharedCall:
+    """One in-flight request and how many callers are waiting on it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class LLMScheduler:
+    """Concurrency-limited, token-budgeted, coalescing wrapper around a chat model"""
+
+    def __init__(self, llm, max_concurrency: int = DEFAULT_CONCURRENCY,
+                 tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE, max_retries: int = 4,
+                 base_delay: float = 0.5, max_delay: float = 20.0,
+                 output_tokens: int = DEFAULT_OUTPUT_TOKENS):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.output_tokens = output_tokens
+        self.requests = 0
+        self.coalesced = 0
+        self.retries = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-scheduler", daemon=True)
+        self._thread.start()
+        # loop-bound primitives are created on the scheduler's own loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._budget = TokenBudget(tokens_per_minute)
+        self._inflight: Dict[str, _SharedCall] = {}
+
+    # -------------------------------------------------------------------------
+    # entry points
+    # -------------------------------------------------------------------------
+
+    def invoke(self, prompt: Any, timeout: Optional[float] = None):
+        """Blocking call from synchronous code"""
+        return asyncio.run_coroutine_threadsafe(self._submit(prompt), self._loop).result(timeout)
+
+    async def ainvoke(self, prompt: Any):
+        """Awaitable from any event loop"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._submit(prompt), self._loop))
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    # -------------------------------------------------------------------------
+    # scheduler loop
+    # -------------------------------------------------------------------------
+
+    async def _submit(self, prompt: Any):
+        key = hashlib.sha256(repr(prompt).encode("utf-8")).hexdigest()
+        call = self._inflight.get(key)
+        if call is not None:
+            self.coalesced += 1
+        else:
+            call = self._inflight[key] = _SharedCall(self._loop.create_task(self._run(prompt)))
+
+            def forget(_):
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+
+            call.task.add_done_callback(forget)
+
+        call.waiters += 1
+        try:
+            # a caller's cancellation stops its own wait, not the shared request
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                call.task.cancel()  # nobody wants the answer any more
+
+    async def _run(self, prompt: Any):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        estimate = estimate_tokens(prompt, self.output_tokens)
+
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                await self._budget.acquire(estimate)
+                self.requests += 1
+                try:
+                    response = await self.llm.ainvoke(prompt)
+                except Exception as error:
+                    if attempt >= self.max_retries or not is_retryable(error):
+                        raise
+                    attempt += 1
+                    self.retries += 1
+                    delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                    continue
+
+                usage = getattr(response, "usage_metadata", None) or {}
+                if usage.get("total_tokens"):
+                    self._budget.adjust(usage["total_tokens"] - estimate)
+                return response
@@ -0,0 +1,194 @@
+"""Heap-backed "what should I do now?" index.
+
+Each open task is scored once, on insert:
+
+    priority + deadline urgency + energy match
+
+and kept in a binary heap (highest score on top), so the next action is an
+O(1) peek, and insert / complete / reprioritize are O(log n). Completed,
+removed and reprioritized tasks are deleted lazily: their old heap entry is
+marked dead and skipped when it reaches the top, and the heap is compacted
+once dead entries outnumber live ones.
+
+Urgency is measured from `now` at scoring time; `refresh` rescores
+everything (O(n)), e.g. when the user's energy changes or hours have passed.
+
+Works with the CLI's `Task` dicts (Enums) and the Streamlit app's task dicts
+(plain strings such as "High" / "Moderate" / "Pending").
+"""
+import heapq
+import itertools
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+PRIORITY_LEVELS = {"low": 1, "medium": 2, "high": 3, "urgent": 4}
+ENERGY_LEVELS = {"exhausted": 1, "low": 2, "moderate": 3, "medium": 3, "high": 4, "peak": 5}
+OPEN_STATUSES = {"pending", "in_progress"}
+
+PRIORITY_WEIGHT = 10.0
+URGENCY_WEIGHT = 30.0  # a task due now gains as much as three priority levels
+URGENCY_HALF_LIFE = 4.0  # hours left at which urgency is half the maximum
+ENERGY_SHORTFALL = 4.0  # per level the task needs beyond the user's energy
+ENERGY_SURPLUS = 1.0  # per level of energy the task would leave unused
+
+
+def level(value, names: Dict[str, int], default: int) -> int:
+    """Enum, int or name ("High", "MODERATE") -> numeric level"""
+    value = getattr(value, "value", value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return names.get(value.strip().lower().replace(" ", "_"), default)
+    return default
+
+
+def is_open(task: Dict) -> bool:
+    status = task.get("status")
+    return str(getattr(status, "value", status)).lower() in OPEN_STATUSES
+
+
+def action_score(task: Dict, energy: int, now: Optional[datetime] = None) -> float:
+    """Higher is more worth doing right now"""
+    score = PRIORITY_WEIGHT * level(task.get("priority"), PRIORITY_LEVELS, 2)
+
+    deadline = task.get("deadline")
+    if deadline:
+        try:
+            hours_left = (datetime.fromisoformat(deadline) - (now or datetime.now())).total_seconds() / 3600
+        except (TypeError, ValueError):
+            hours_left = None
+        if hours_left is not None:
+            score += URGENCY_WEIGHT / (1.0 + max(0.0, hours_left) / URGENCY_HALF_LIFE)
+
+    required = level(task.get("energy_required"), ENERGY_LEVELS, 3)
+    score -= ENERGY_SHORTFALL * max(0, required - energy) + ENERGY_SURPLUS * max(0, energy - required)
+    return score
+
+
+class NextActionQueue:
+    def __init__(self, tasks: Iterable[Dict] = (), energy=3, now: Optional[datetime] = None):
+        self.energy = level(energy, ENERGY_LEVELS, 3)
+        self.now = now
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()  # FIFO among equal scores
+        self._dead = 0
+        self._load(tasks)
+
+    def _entry(self, task: Dict) -> list:
+        # [negated score, insertion order, task, alive]
+        return [-action_score(task, self.energy, self.now), next(self._counter), task, True]
+
+    def _load(self, tasks: Iterable[Dict]):
+        self._heap = []
+        self._entries = {}
+        self._dead = 0
+        for task in tasks:
+            if is_open(task):
+                entry = self._entry(task)
+                self._entries[task["id"]] = entry
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    # -------------------------------------------------------------------------
+    # updates
+    # -------------------------------------------------------------------------
+
+    def push(self, task: Dict):
+        """Insert a task, or rescore it if already queued; closed tasks are removed"""
+        self.remove(task["id"])
+        if not is_open(task):
+            return
+        entry = self._entry(task)
+        self._entries[task["id"]] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, task_id: str) -> Optional[Dict]:
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return None
+        entry[3] = False
+        self._dead += 1
+        if self._dead > len(self._entries):
+            self._compact()
+        return entry[2]
+
+    complete = remove
+
+    def reprioritize(self, task_id: str, **changes) -> Optional[Dict]:
+        """Apply field changes (priority, deadline, energy_required, ...) and rescore"""
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        task = entry[2]
+        task.update(changes)
+        self.push(task)
+        return task
+
+    def refresh(self, energy=None, now: Optional[datetime] = None):
+        """Rescore every task (new energy level or time of day)"""
+        if energy is not None:
+            self.energy = level(energy, ENERGY_LEVELS, 3)
+        self.now = now
+        self._load([entry[2] for entry in self._entries.values()])
+
+    def clear(self):
+        self._load(())
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[3]]
+        heapq.heapify(self._heap)
+        self._dead = 0
+
+    # -------------------------------------------------------------------------
+    # queries
+    # -------------------------------------------------------------------------
+
+    def peek(self) -> Optional[Dict]:
+        """The task to do next (O(1) amortized)"""
+        while self._heap and not self._heap[0][3]:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self) -> Optional[Dict]:
+        task = self.peek()
+        if task is not None:
+            heapq.heappop(self._heap)[3] = False
+            del self._entries[task["id"]]
+        return task
+
+    def top(self, k: int) -> List[Dict]:
+        """The k best tasks in order, without changing the queue (O(k log n))"""
+        found: List[Dict] = []
+        frontier = [(self._heap[0][0], self._heap[0][1], 0)] if self._heap else []
+        while frontier and len(found) < k:
+            _, _, position = heapq.heappop(frontier)
+            entry = self._heap[position]
+            if entry[3]:
+                found.append(entry[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child][0], self._heap[child][1], child))
+        return found
+
+    def ranked(self, tasks: Iterable[Dict]) -> List[Dict]:
+        """Order a subset (e.g. a filtered view) by the queue's cached scores"""
+        entries = self._entries
+        return sorted(
+            (task for task in tasks if task["id"] in entries),
+            key=lambda task: (entries[task["id"]][0], entries[task["id"]][1]),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+
+def describe(task: Optional[Dict]) -> str:
+    """One-line next action for `LifeCoachState.next_action`"""
+    if task is None:
+        return ""
+    return f"{task['title']} ({task['estimated_time']} min)"
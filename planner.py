@@ -0,0 +1,112 @@
+"""Incremental replanning for mid-day task edits.
+
+`IncrementalPlanner` keeps today's plan current without invoking the graph.
+It maintains two aggregates:
+
+- `open_minutes`: time claimed by unfinished tasks, so `remaining_time` is
+  O(1) instead of a sum over the whole task list;
+- the suggestion set: AI suggestions currently in the plan, in the order they
+  were made.
+
+Adding or completing a task adjusts these by the changed task only, then runs
+the generator's own suggestion policy (`suggestions.suggest_tasks`) over the
+handful of candidate goals. When the budget is overrun, the newest pending
+suggestions are withdrawn (status RESCHEDULED); they come back as soon as time
+frees up again.
+
+Every edit returns a partial state update, so callers merge it with
+`agent.apply_update` exactly like a node's output; tasks whose status the edit
+changed in place (completed, withdrawn, reinstated) are listed in `changed`
+for persistence.
+"""
+from typing import Dict, List, Optional
+
+from suggestions import available_minutes, candidate_goals, suggest_tasks
+from task_store import TaskStore
+from task_types import OPEN_STATUSES, Task, TaskStatus
+
+
+class IncrementalPlanner:
+    def __init__(self, state: Dict, store: Optional[TaskStore] = None):
+        self.daily_context = state["daily_context"]
+        self.available_time = available_minutes(self.daily_context)
+        # goal retrieval happens once per session, not on every edit
+        self.goals = candidate_goals(state)
+        self.store = store if store is not None else TaskStore(state["current_tasks"])
+
+        self.open_minutes = 0
+        self.suggestions: Dict[str, None] = {}  # pending AI suggestions, oldest first
+        self.changed: List[Task] = []
+        for task in self.store:
+            self._count(task)
+
+    @property
+    def remaining_time(self) -> int:
+        return self.available_time - self.open_minutes
+
+    def _count(self, task: Task, sign: int = 1):
+        if task["status"] in OPEN_STATUSES:
+            self.open_minutes += sign * task["estimated_time"]
+            if not task.get("user_created", False):
+                if sign > 0:
+                    self.suggestions[task["id"]] = None
+                else:
+                    self.suggestions.pop(task["id"], None)
+
+    def _set_status(self, task: Task, status: TaskStatus, **changes):
+        self._count(task, -1)
+        self.store.set_status(task["id"], status, **changes)
+        self._count(task)
+        self.changed.append(task)
+
+    # -------------------------------------------------------------------------
+    # edits
+    # -------------------------------------------------------------------------
+
+    def add(self, task: Task) -> Dict:
+        """Add a task and rebalance suggestions; returns the partial state update"""
+        self.changed = []
+        self.store.add(task)
+        self._count(task)
+        return self._rebalance([task])
+
+    def complete(self, task_id: str, completed_at: str) -> Dict:
+        """Complete a task (freeing its time) and rebalance suggestions"""
+        self.changed = []
+        task = self.store.get(task_id)
+        if task is None or task["status"] == TaskStatus.COMPLETED:
+            return {}
+        self._set_status(task, TaskStatus.COMPLETED, completed_at=completed_at)
+        update = self._rebalance([])
+        update["completed_tasks"] = [task]
+        return update
+
+    def _rebalance(self, added: List[Task]) -> Dict:
+        # over budget: withdraw the newest pending suggestions first
+        while self.remaining_time < 0 and self.suggestions:
+            self._set_status(self.store.get(next(reversed(self.suggestions))), TaskStatus.RESCHEDULED)
+
+        # room left: the generator's policy over the (few) candidate goals;
+        # withdrawn suggestions are eligible again and are reinstated in place
+        planned = _PlannedIds(self.store)
+        for suggestion in suggest_tasks(self.daily_context, self.goals, self.remaining_time, planned):
+            previous = self.store.get(suggestion["id"])
+            if previous is not None:
+                self._set_status(previous, TaskStatus.PENDING)
+            else:
+                self.store.add(suggestion)
+                self._count(suggestion)
+                added.append(suggestion)
+
+        return {"current_tasks": added, "daily_todo_list": added} if added else {}
+
+
+class _PlannedIds:
+    """Membership view over the store that treats RESCHEDULED tasks as absent"""
+
+    def __init__(self, store: TaskStore):
+        self.store = store
+
+    def __contains__(self, task_id: str) -> bool:
+        task = self.store.get(task_id)
+        return task is not None and task["status"] != TaskStatus.RESCHEDULED
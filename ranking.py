@@ -0,0 +1,117 @@
+"""Vectorized task scoring and top-k selection.
+
+Tasks are encoded once into columnar NumPy arrays (priority, energy
+required, minutes, age in hours, hours to deadline); a score is then one
+weighted expression over whole columns, and the best k come from
+`np.argpartition` (O(n)) plus a sort of just those k.
+
+    score = priority                      x w["priority"]
+          + deadline urgency              x w["urgency"]
+          - energy mismatch vs. today     x w["energy"]
+          + log(1 + age in hours)         x w["age"]      (old tasks bubble up)
+          - hours of effort               x w["effort"]   (quick wins first)
+
+Energy mismatch and urgency use the same shape as next_action.action_score,
+so the ranked list and the "do this next" pick agree. Works with CLI `Task`
+dicts (Enums) and the app's string-valued task dicts.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from next_action import (
+    ENERGY_LEVELS,
+    ENERGY_SHORTFALL,
+    ENERGY_SURPLUS,
+    PRIORITY_LEVELS,
+    URGENCY_HALF_LIFE,
+    level,
+)
+
+DEFAULT_WEIGHTS = {
+    "priority": 10.0,
+    "urgency": 30.0,
+    "energy": 1.0,
+    "age": 0.5,
+    "effort": 2.0,
+}
+
+
+def _parse_time(value) -> float:
+    """ISO string -> POSIX seconds (NaN if missing or unparseable)"""
+    if not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class TaskColumns:
+    """Struct-of-arrays view of a task list"""
+
+    __slots__ = ("tasks", "priority", "energy", "minutes", "created", "deadline")
+
+    def __init__(self, tasks: Sequence[Dict]):
+        self.tasks = list(tasks)
+        n = len(self.tasks)
+        self.priority = np.fromiter((level(t.get("priority"), PRIORITY_LEVELS, 2) for t in self.tasks),
+                                    dtype=np.int8, count=n)
+        self.energy = np.fromiter((level(t.get("energy_required"), ENERGY_LEVELS, 3) for t in self.tasks),
+                                  dtype=np.int8, count=n)
+        self.minutes = np.fromiter((t.get("estimated_time") or 0 for t in self.tasks), dtype=np.float32, count=n)
+        self.created = np.fromiter((_parse_time(t.get("created_at")) for t in self.tasks), dtype=np.float64, count=n)
+        self.deadline = np.fromiter((_parse_time(t.get("deadline")) for t in self.tasks), dtype=np.float64, count=n)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+
+def score(columns: TaskColumns, energy=3, weights: Optional[Dict[str, float]] = None,
+          now: Optional[datetime] = None) -> np.ndarray:
+    """Score every task in one pass; higher is better"""
+    w = DEFAULT_WEIGHTS if weights is None else {**DEFAULT_WEIGHTS, **weights}
+    now_ts = (now or datetime.now()).timestamp()
+    energy = level(energy, ENERGY_LEVELS, 3)
+
+    hours_left = np.maximum((columns.deadline - now_ts) / 3600.0, 0.0)
+    urgency = np.nan_to_num(1.0 / (1.0 + hours_left / URGENCY_HALF_LIFE), nan=0.0)
+    required = columns.energy.astype(np.float32)
+    mismatch = ENERGY_SHORTFALL * np.maximum(required - energy, 0) + ENERGY_SURPLUS * np.maximum(energy - required, 0)
+    age_hours = np.nan_to_num(np.maximum((now_ts - columns.created) / 3600.0, 0.0), nan=0.0)
+
+    return (
+        w["priority"] * columns.priority
+        + w["urgency"] * urgency
+        - w["energy"] * mismatch
+        + w["age"] * np.log1p(age_hours)
+        - w["effort"] * columns.minutes / 60.0
+    )
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties keep input order)"""
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        # argpartition picks arbitrarily among ties at the cut; take the earliest
+        cut = scores[candidates].min()
+        above = candidates[scores[candidates] > cut]
+        tied = np.flatnonzero(scores == cut)[:k - len(above)]
+        candidates = np.concatenate((above, tied))
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def rank_tasks(tasks, k: Optional[int] = None, energy=3, weights: Optional[Dict[str, float]] = None,
+               now: Optional[datetime] = None) -> List[Dict]:
+    """The k best tasks (all of them if k is None), best first"""
+    columns = tasks if isinstance(tasks, TaskColumns) else TaskColumns(tasks)
+    scores = score(columns, energy, weights, now)
+    indices = top_k_indices(scores, len(columns) if k is None else k)
+    return [columns.tasks[i] for i in indices]
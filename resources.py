@@ -0,0 +1,241 @@
+"""Lazy, per-process providers for the expensive LangChain components.
+
+Nothing here is built at import time. Each resource is created the first time
+it is requested, cached for the lifetime of the process and can be replaced
+with a stand-in via ``override`` (handy for offline runs and fakes).
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+GOAL_MEMORY_PATH = "goal_memory_index"
+RESPONSE_CACHE_PATH = ".llm_response_cache.json"
+CHECKPOINT_PATH = "life_coach_checkpoints.sqlite"
+
+_factories: Dict[str, Callable[[], Any]] = {}
+_instances: Dict[str, Any] = {}
+_lock = threading.RLock()
+_owner_pid = os.getpid()
+
+
+def register(name: str):
+    """Register a zero-argument factory for the resource ``name``"""
+    def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+        _factories[name] = factory
+        return factory
+    return decorator
+
+
+def _check_pid():
+    """Drop cached clients inherited through fork; each worker builds its own"""
+    global _owner_pid
+    pid = os.getpid()
+    if pid != _owner_pid:
+        _instances.clear()
+        _owner_pid = pid
+
+
+def get(name: str) -> Any:
+    """Return the cached resource, building it on first use"""
+    _check_pid()
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _instances:
+            if name not in _factories:
+                raise KeyError(f"Unknown resource: {name}")
+            _instances[name] = _factories[name]()
+        return _instances[name]
+
+
+def is_loaded(name: str) -> bool:
+    """True if the resource has already been built (or injected) in this process"""
+    _check_pid()
+    return name in _instances
+
+
+def override(name: str, value: Any):
+    """Inject a stand-in for a resource (fake LLM, in-memory store, ...)"""
+    with _lock:
+        _check_pid()
+        _instances[name] = value
+
+
+def reset(name: Optional[str] = None):
+    """Forget one cached resource, or all of them"""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+# =============================================================================
+# DEFAULT FACTORIES
+# =============================================================================
+
+@register("embeddings")
+def _build_embeddings():
+    import atexit
+    from langchain_openai import OpenAIEmbeddings
+    from embedding_cache import CachedEmbeddings
+
+    embeddings = CachedEmbeddings(OpenAIEmbeddings())
+    atexit.register(embeddings.close)  # writes buffered last-used stamps
+    return embeddings
+
+
+@register("llm")
+def _build_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(temperature=0.7)
+
+
+@register("db")
+def _build_db():
+    import atexit
+    from db import LifeCoachDB
+
+    db = LifeCoachDB()
+    atexit.register(db.close)
+    return db
+
+
+@register("checkpointer")
+def _build_checkpointer():
+    import atexit
+    import sqlite3
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from task_types import EnergyLevel, MoodLevel, TaskPriority, TaskStatus
+
+    try:
+        # the state holds these Enums; registering them keeps them loadable
+        # once langgraph blocks unregistered types
+        serde = JsonPlusSerializer(allowed_msgpack_modules=[MoodLevel, EnergyLevel, TaskPriority, TaskStatus])
+    except TypeError:  # older langgraph: no allowlist, every type loads
+        serde = None
+    conn = sqlite3.connect(CHECKPOINT_PATH, check_same_thread=False)
+    atexit.register(conn.close)
+    return SqliteSaver(conn, serde=serde)
+
+
+@register("task_journal")
+def _build_task_journal():
+    import atexit
+    from task_journal import TaskJournal
+
+    journal = TaskJournal()
+    atexit.register(journal.close)
+    return journal
+
+
+@register("llm_scheduler")
+def _build_llm_scheduler():
+    from llm_scheduler import LLMScheduler
+    return LLMScheduler(get_llm())
+
+
+@register("response_cache")
+def _build_response_cache():
+    import atexit
+    from llm_cache import ResponseCache
+
+    cache = ResponseCache(embeddings=get_embeddings(), path=RESPONSE_CACHE_PATH)
+    atexit.register(cache.save)
+    return cache
+
+
+@register("goal_memory")
+def _build_goal_memory():
+    from goal_index import index_config_from_env
+    from goal_memory import GoalMemory
+
+    memory = GoalMemory(GOAL_MEMORY_PATH, get_embeddings(), index_config=index_config_from_env())
+    if len(memory):
+        print("✅ Loaded existing goal memory")
+    else:
+        print("🆕 Created new goal memory")
+    return memory
+
+
+@register("goal_memory_reader")
+def _build_goal_memory_reader():
+    from goal_memory import MappedGoalMemory
+
+    # Workers prefer the memory-mapped, pickle-free export when one exists
+    if MappedGoalMemory.exists():
+        return MappedGoalMemory(embeddings=get_embeddings())
+    return get_goal_memory()
+
+
+@register("goal_shards")
+def _build_goal_shards():
+    import atexit
+    from goal_index import index_config_from_env
+    from goal_shards import GoalMemoryShards
+
+    shards = GoalMemoryShards(embeddings=get_embeddings(), index_config=index_config_from_env())
+    atexit.register(shards.close)  # flushes open shards and saves the recent-user list
+    shards.preload_recent()
+    return shards
+
+
+@register("vectorstore")
+def _build_vectorstore():
+    memory = get_goal_memory()
+    if memory.store is not None:
+        return memory.store
+
+    from langchain_community.vectorstores import FAISS
+    return FAISS.from_texts(["Personal goals and habits"], get_embeddings())
+
+
+def get_embeddings():
+    return get("embeddings")
+
+
+def get_llm():
+    return get("llm")
+
+
+def get_db():
+    return get("db")
+
+
+def get_checkpointer():
+    """SQLite saver for LangGraph checkpoints (one thread per user and day)"""
+    return get("checkpointer")
+
+
+def get_task_journal():
+    return get("task_journal")
+
+
+def get_llm_scheduler():
+    """All LLM calls should go through this shared scheduler"""
+    return get("llm_scheduler")
+
+
+def get_response_cache():
+    return get("response_cache")
+
+
+def get_goal_memory():
+    return get("goal_memory")
+
+
+def get_goal_memory_reader():
+    return get("goal_memory_reader")
+
+
+def get_user_goal_memory(user_id: str):
+    """The goal memory shard for one user (namespace)"""
+    return get("goal_shards").get(user_id)
+
+
+def get_vectorstore():
+    return get("vectorstore")
@@ -0,0 +1,311 @@
+"""Energy- and priority-aware packing of tasks into the day's time blocks.
+
+Blocks are the `{"start": "02:00 PM", "end": "04:00 PM"}` dicts built by
+`availability.plan_time_blocks` (any length; a block ending past midnight wraps).
+Each block gets an energy level from a circadian curve shifted by the user's
+energy today, and every task/block pair a value:
+
+    priority weight x deadline urgency x energy fit
+
+- Large instances use a greedy pass: tasks in (priority, deadline, energy)
+  order, each into the feasible block that fits its energy need best.
+  O(tasks x blocks), a few milliseconds for thousands of tasks.
+- Small instances (at most `EXACT_SEARCH_LIMIT` task -> block assignments to
+  enumerate) are solved exactly by branch and bound, seeded with the greedy
+  solution.
+
+A task only goes into a block where it would finish before its deadline.
+
+Mid-day edits don't repack the day: `unschedule` frees the slots of tasks that
+were completed or withdrawn and `schedule_more` fits new tasks into the free
+time, both touching only the changed tasks and leaving the rest in place.
+Tasks are plain `Task` dicts; Enum fields are read through `.value`, so the
+module does not depend on agent.py.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CLOCK_FORMAT = "%I:%M %p"
+EXACT_SEARCH_LIMIT = 200_000  # (blocks + 1) ** tasks
+MODERATE_ENERGY = 3
+
+# Typical energy (1-5) by hour of day: morning peak, post-lunch dip, early
+# evening recovery.
+ENERGY_CURVE = [
+    1, 1, 1, 1, 1, 1,  # 00-05
+    2, 3, 4, 5, 5, 5,  # 06-11
+    4, 3, 2, 3, 4, 4,  # 12-17
+    3, 3, 3, 2, 2, 1,  # 18-23
+]
+
+_NO_DEADLINE = float("inf")
+
+
+def _level(value) -> int:
+    return getattr(value, "value", value)
+
+
+def parse_clock(text: str) -> int:
+    """'02:30 PM' -> minutes since midnight"""
+    parsed = datetime.strptime(text.strip(), CLOCK_FORMAT)
+    return parsed.hour * 60 + parsed.minute
+
+
+def block_span(block: Dict[str, str]) -> Tuple[int, int]:
+    """(start, end) in minutes since midnight; end > start even across midnight"""
+    start, end = parse_clock(block["start"]), parse_clock(block["end"])
+    if end <= start:
+        end += 24 * 60
+    return start, end
+
+
+def block_minutes(block: Dict[str, str]) -> int:
+    start, end = block_span(block)
+    return end - start
+
+
+def block_energy(start: int, end: int, day_energy=MODERATE_ENERGY) -> int:
+    """Mean curve energy over the block, shifted by how the user feels today"""
+    hours = range(start // 60, max(start // 60 + 1, -(-end // 60)))
+    mean = sum(ENERGY_CURVE[hour % 24] for hour in hours) / len(hours)
+    return max(1, min(5, round(mean + _level(day_energy) - MODERATE_ENERGY)))
+
+
+def _deadline_minute(deadline: Optional[str], day: datetime) -> float:
+    """Deadline as minutes since the plan day's midnight (inf if none)"""
+    if not deadline:
+        return _NO_DEADLINE
+    try:
+        parsed = datetime.fromisoformat(deadline)
+    except ValueError:
+        return _NO_DEADLINE
+    return (parsed.replace(tzinfo=None) - day) / timedelta(minutes=1)
+
+
+def energy_fit(required: int, available: int) -> float:
+    """1.0 for an exact match; short energy hurts much more than spare energy"""
+    if available >= required:
+        return 1.0 - 0.05 * (available - required)
+    return max(0.1, 1.0 - 0.3 * (required - available))
+
+
+class _Block:
+    __slots__ = ("index", "start", "end", "energy", "free", "cursor")
+
+    def __init__(self, index: int, block: Dict[str, str], day_energy):
+        self.index = index
+        self.start, self.end = block_span(block)
+        self.energy = block_energy(self.start, self.end, day_energy)
+        self.free = self.end - self.start
+        self.cursor = self.start  # where the next task would start
+
+
+class _Item:
+    __slots__ = ("task", "minutes", "weight", "energy", "deadline")
+
+    def __init__(self, task: Dict, day: datetime):
+        self.task = task
+        self.minutes = task["estimated_time"]
+        self.energy = _level(task["energy_required"])
+        self.deadline = _deadline_minute(task.get("deadline"), day)
+        urgency = 1.0 if self.deadline == _NO_DEADLINE else 1.0 + 24 * 60 / max(60.0, self.deadline)
+        self.weight = 2 ** (_level(task["priority"]) - 1) * urgency
+
+    def sort_key(self):
+        return (-self.weight, self.deadline, -self.energy, self.minutes)
+
+
+def _greedy(items: List[_Item], blocks: List[_Block]) -> List[Optional[int]]:
+    assignment: List[Optional[int]] = [None] * len(items)
+    max_free = max((block.free for block in blocks), default=0)
+    for position, item in enumerate(items):
+        if item.minutes > max_free:
+            continue
+        best, best_key = None, None
+        for block in blocks:
+            if block.free < item.minutes or block.cursor + item.minutes > item.deadline:
+                continue
+            key = (-energy_fit(item.energy, block.energy), block.start)
+            if best_key is None or key < best_key:
+                best, best_key = block, key
+        if best is not None:
+            best.free -= item.minutes
+            best.cursor += item.minutes
+            assignment[position] = best.index
+            if best.free + item.minutes == max_free:
+                max_free = max(block.free for block in blocks)
+    return assignment
+
+
+def _value(items: List[_Item], blocks: List[_Block], assignment: Sequence[Optional[int]]) -> float:
+    return sum(
+        item.weight * energy_fit(item.energy, blocks[index].energy)
+        for item, index in zip(items, assignment) if index is not None
+    )
+
+
+def _exact(items: List[_Item], blocks: List[_Block], seed: List[Optional[int]]) -> List[Optional[int]]:
+    """Branch and bound; items are in sort_key order, so tasks that fit earlier
+    in a block also respect deadlines when placed in that order"""
+    best = {"value": _value(items, blocks, seed), "assignment": list(seed)}
+    free = [block.end - block.start for block in blocks]
+    cursor = [block.start for block in blocks]
+    current: List[Optional[int]] = [None] * len(items)
+    # optimistic value of everything from position i onwards
+    suffix = [0.0] * (len(items) + 1)
+    for position in range(len(items) - 1, -1, -1):
+        suffix[position] = suffix[position + 1] + items[position].weight
+
+    def search(position: int, value: float):
+        if value + suffix[position] <= best["value"]:
+            return
+        if position == len(items):
+            best["value"], best["assignment"] = value, list(current)
+            return
+        item = items[position]
+        for index, block in enumerate(blocks):
+            if free[index] < item.minutes or cursor[index] + item.minutes > item.deadline:
+                continue
+            free[index] -= item.minutes
+            cursor[index] += item.minutes
+            current[position] = index
+            search(position + 1, value + item.weight * energy_fit(item.energy, block.energy))
+            free[index] += item.minutes
+            cursor[index] -= item.minutes
+        current[position] = None
+        search(position + 1, value)
+
+    search(0, 0.0)
+    return best["assignment"]
+
+
+def _clock(minute: int) -> str:
+    return (datetime(2000, 1, 1) + timedelta(minutes=minute)).strftime(CLOCK_FORMAT)
+
+
+def schedule_day(tasks: Sequence[Dict], time_blocks: Sequence[Dict[str, str]],
+                 day_energy=MODERATE_ENERGY, date: Optional[str] = None) -> Dict:
+    """Pack tasks into the day's blocks
+
+    Returns {"blocks": [{"start", "end", "energy", "free_minutes", "tasks":
+    [{"id", "title", "start", "end"}]}], "unscheduled": [task ids]}.
+    """
+    day = datetime.strptime(date, "%Y-%m-%d") if date else datetime.now().replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    blocks = [_Block(index, block, day_energy) for index, block in enumerate(time_blocks)]
+    items = sorted((_Item(task, day) for task in tasks), key=_Item.sort_key)
+
+    assignment = _greedy(items, blocks)
+    if items and (len(blocks) + 1) ** len(items) <= EXACT_SEARCH_LIMIT:
+        assignment = _exact(items, blocks, assignment)
+
+    placed: List[List[_Item]] = [[] for _ in blocks]
+    unscheduled = []
+    for item, index in zip(items, assignment):
+        if index is None:
+            unscheduled.append(item.task["id"])
+        else:
+            placed[index].append(item)
+
+    result = []
+    for block, block_items in zip(blocks, placed):
+        cursor = block.start
+        entries = []
+        for item in block_items:  # already in priority/deadline order
+            entries.append({
+                "id": item.task["id"],
+                "title": item.task["title"],
+                "start": _clock(cursor),
+                "end": _clock(cursor + item.minutes),
+            })
+            cursor += item.minutes
+        result.append({
+            "start": _clock(block.start),
+            "end": _clock(block.end),
+            "energy": block.energy,
+            "free_minutes": block.end - cursor,
+            "tasks": entries,
+        })
+    return {"blocks": result, "unscheduled": unscheduled}
+
+
+def _entry_span(entry: Dict[str, str], block_start: int) -> Tuple[int, int]:
+    """An entry's (start, end) on the same minute scale as its block's span"""
+    start, end = parse_clock(entry["start"]), parse_clock(entry["end"])
+    if start < block_start:
+        start += 24 * 60
+    while end < start:
+        end += 24 * 60
+    return start, end
+
+
+def _earliest_gap(block: Dict, minutes: int, deadline: float) -> Optional[int]:
+    """Start of the first free stretch of `minutes` in a scheduled block"""
+    start, end = block_span(block)
+    cursor = start
+    for entry in block["tasks"]:
+        entry_start, entry_end = _entry_span(entry, start)
+        if entry_start - cursor >= minutes:
+            break
+        cursor = max(cursor, entry_end)
+    if cursor + minutes > min(end, deadline):
+        return None
+    return cursor
+
+
+def unschedule(schedule: Dict, task_ids) -> Dict:
+    """Take tasks out of a `schedule_day` result, leaving their slots free
+
+    Returns a new schedule; blocks without any of the tasks are shared with
+    the old one, the other tasks keep their times.
+    """
+    task_ids = set(task_ids)
+    blocks = []
+    for block in schedule["blocks"]:
+        kept = [entry for entry in block["tasks"] if entry["id"] not in task_ids]
+        if len(kept) < len(block["tasks"]):
+            start = block_span(block)[0]
+            used = sum(end - begin for begin, end in (_entry_span(entry, start) for entry in kept))
+            block = dict(block, tasks=kept, free_minutes=block_minutes(block) - used)
+        blocks.append(block)
+    unscheduled = [task_id for task_id in schedule["unscheduled"] if task_id not in task_ids]
+    return {"blocks": blocks, "unscheduled": unscheduled}
+
+
+def schedule_more(schedule: Dict, tasks: Sequence[Dict], date: Optional[str] = None) -> Dict:
+    """Fit new tasks into the free time of a `schedule_day` result
+
+    Tasks already placed stay where they are. The new ones go in priority,
+    deadline and energy order, each into the earliest gap of the block that
+    fits its energy need best (as in the greedy pass); what doesn't fit is
+    added to "unscheduled". Returns a new schedule.
+    """
+    day = datetime.strptime(date, "%Y-%m-%d") if date else datetime.now().replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    blocks = list(schedule["blocks"])
+    unscheduled = list(schedule["unscheduled"])
+    for item in sorted((_Item(task, day) for task in tasks), key=_Item.sort_key):
+        best, best_start, best_key = None, None, None
+        for index, block in enumerate(blocks):
+            if block["free_minutes"] < item.minutes:
+                continue
+            start = _earliest_gap(block, item.minutes, item.deadline)
+            if start is None:
+                continue
+            key = (-energy_fit(item.energy, block["energy"]), block_span(block)[0])
+            if best_key is None or key < best_key:
+                best, best_start, best_key = index, start, key
+        if best is None:
+            unscheduled.append(item.task["id"])
+            continue
+        block = blocks[best]
+        entries = list(block["tasks"])
+        position = sum(1 for entry in entries if _entry_span(entry, block_span(block)[0])[0] < best_start)
+        entries.insert(position, {
+            "id": item.task["id"],
+            "title": item.task["title"],
+            "start": _clock(best_start),
+            "end": _clock(best_start + item.minutes),
+        })
+        blocks[best] = dict(block, tasks=entries, free_minutes=block["free_minutes"] - item.minutes)
+    return {"blocks": blocks, "unscheduled": unscheduled}
@@ -0,0 +1,26 @@
+"""JSON conversion for graph state (Enums travel as their names)."""
+from enum import Enum
+from typing import Any, Type, Union
+
+
+def to_jsonable(value: Any) -> Any:
+    """Recursively convert state values into JSON-serializable data"""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def parse_enum(enum_cls: Type[Enum], value: Union[str, int, Enum]) -> Enum:
+    """Accept an Enum member, its name ("HIGH") or its value (3 / "pending")"""
+    if isinstance(value, enum_cls):
+        return value
+    if isinstance(value, str):
+        if value.upper() in enum_cls.__members__:
+            return enum_cls[value.upper()]
+        if value.isdigit():
+            value = int(value)
+    return enum_cls(value)
@@ -0,0 +1,180 @@
+"""HTTP planning service.
+
+The life-coach graph is compiled once at startup and shared by all requests.
+`POST /plan` returns the finished plan; `POST /plan/stream` streams every
+node's output as a server-sent event as soon as that node finishes, followed
+by a final `end` event.
+
+    uvicorn server:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional, Union
+
+from fastapi import FastAPI, Request
+from pydantic import BaseModel, Field, field_validator
+from sse_starlette.sse import EventSourceResponse
+
+from agent import (
+    DEFAULT_SLEEP_SCHEDULE,
+    DEFAULT_WORK_SCHEDULE,
+    EnergyLevel,
+    MoodLevel,
+    TaskPriority,
+    build_initial_state,
+    create_enhanced_life_coach_graph,
+)
+from availability import local_datetime, plan_time_blocks
+from scheduler import parse_clock
+from serialization import parse_enum, to_jsonable
+
+MAX_CONCURRENT_PLANS = int(os.getenv("MAX_CONCURRENT_PLANS", "256"))
+
+
+def check_enum(enum_cls, value: Union[int, str]) -> Union[int, str]:
+    """Reject unknown enum names/values during validation (a 422, not a 500)"""
+    try:
+        parse_enum(enum_cls, value)
+    except (KeyError, ValueError):
+        raise ValueError(f"expected one of {', '.join(enum_cls.__members__)} or 1-{len(enum_cls)}") from None
+    return value
+
+
+class TaskInput(BaseModel):
+    title: str
+    description: str = ""
+    priority: Union[int, str] = "MEDIUM"
+    estimated_time: int = 30
+    category: str = "personal"
+    energy_required: Union[int, str] = "MODERATE"
+
+    @field_validator("priority")
+    @classmethod
+    def check_priority(cls, value):
+        return check_enum(TaskPriority, value)
+
+    @field_validator("energy_required")
+    @classmethod
+    def check_energy_required(cls, value):
+        return check_enum(EnergyLevel, value)
+
+
+class TimeBlock(BaseModel):
+    start: str  # "09:00 AM"
+    end: str
+
+    @field_validator("start", "end")
+    @classmethod
+    def check_clock(cls, value):
+        """Same "%I:%M %p" format the scheduler reads"""
+        try:
+            parse_clock(value)
+        except ValueError:
+            raise ValueError('expected a time like "09:00 AM"') from None
+        return value
+
+
+class PlanRequest(BaseModel):
+    name: str = "User"
+    mood: Union[int, str] = "NEUTRAL"
+    energy: Union[int, str] = "MODERATE"
+    stress_level: int = Field(5, ge=1, le=10)
+    available_hours: int = Field(4, ge=0, le=24)
+    available_time_blocks: Optional[List[TimeBlock]] = None
+    calendar_events: List[dict] = []  # {"title", "start", "end"} with ISO times
+    motivation_style: str = "encouraging"
+    goals: List[str] = []
+    tasks: List[TaskInput] = []
+
+    @field_validator("mood")
+    @classmethod
+    def check_mood(cls, value):
+        return check_enum(MoodLevel, value)
+
+    @field_validator("energy")
+    @classmethod
+    def check_energy(cls, value):
+        return check_enum(EnergyLevel, value)
+
+    @field_validator("calendar_events")
+    @classmethod
+    def check_calendar_events(cls, events):
+        """Require ISO start/end times and store them as local time, like .ics imports"""
+        try:
+            return [dict(event, start=local_datetime(event["start"]).isoformat(),
+                         end=local_datetime(event["end"]).isoformat()) for event in events]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('each event needs ISO "start" and "end" times') from None
+
+
+def state_from_request(plan: PlanRequest):
+    """Same initial state the CLI builds, from a JSON request"""
+    user_data = {
+        "name": plan.name,
+        "mood": parse_enum(MoodLevel, plan.mood),
+        "energy": parse_enum(EnergyLevel, plan.energy),
+        "stress_level": plan.stress_level,
+        "available_time_blocks": [block.model_dump() for block in plan.available_time_blocks or []]
+        or plan_time_blocks(DEFAULT_SLEEP_SCHEDULE, DEFAULT_WORK_SCHEDULE, plan.calendar_events, plan.available_hours),
+        "calendar_events": plan.calendar_events,
+        "motivation_style": plan.motivation_style,
+    }
+    custom_tasks = [
+        {
+            "title": task.title,
+            "description": task.description or task.title,
+            "priority": parse_enum(TaskPriority, task.priority),
+            "estimated_time": task.estimated_time,
+            "category": task.category,
+            "energy_required": parse_enum(EnergyLevel, task.energy_required),
+        }
+        for task in plan.tasks
+    ]
+    return build_initial_state(user_data, plan.goals, custom_tasks)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.graph = create_enhanced_life_coach_graph()
+    app.state.slots = asyncio.Semaphore(MAX_CONCURRENT_PLANS)
+    yield
+
+
+app = FastAPI(title="AI Life Coach", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/plan")
+async def plan(plan: PlanRequest, request: Request):
+    async with request.app.state.slots:
+        final_state = await request.app.state.graph.ainvoke(state_from_request(plan))
+    return to_jsonable(final_state)
+
+
+@app.post("/plan/stream")
+async def plan_stream(plan: PlanRequest, request: Request):
+    graph = request.app.state.graph
+    initial_state = state_from_request(plan)
+
+    async def events():
+        async with request.app.state.slots:
+            async for update in graph.astream(initial_state, stream_mode="updates"):
+                if await request.is_disconnected():
+                    return
+                for node, output in update.items():
+                    yield {"event": node, "data": json.dumps(to_jsonable(output))}
+        yield {"event": "end", "data": "{}"}
+
+    return EventSourceResponse(events())
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("HOST", "127.0.0.1"), port=int(os.getenv("PORT", "8000")))
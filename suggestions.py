@@ -0,0 +1,115 @@
+"""The AI suggestion policy shared by the graph and the incremental planner.
+
+agent.py's task generator and planner.py both decide what to suggest with
+`suggest_tasks`: a step towards each candidate goal and a break when stressed,
+ranked against today's energy and added while they fit the remaining time.
+
+States and daily contexts are the plain dicts built by agent.py; this module
+does not import agent.py, so when the CLI runs as `python agent.py` (loaded as
+`__main__`) the planner still shares one copy of these functions with it.
+"""
+import uuid
+from datetime import datetime
+from typing import Dict, List
+
+from ranking import rank_tasks
+from scheduler import block_minutes
+from task_types import OPEN_STATUSES, EnergyLevel, Task, TaskPriority, TaskStatus
+
+RETRIEVED_GOAL_TASKS = 2  # extra goal tasks drawn from goal memory
+SUGGESTION_SLACK = 15  # minutes left free around each AI suggestion
+
+
+def retrieve_relevant_goals(state: Dict, k: int = RETRIEVED_GOAL_TASKS) -> List[str]:
+    """Stored goals matching today's mood, energy, stress and task categories"""
+    from goal_retrieval import retrieve_goals_for_context
+
+    categories = sorted({task["category"] for task in state["current_tasks"]})
+    try:
+        hits = retrieve_goals_for_context(state["user_profile"]["name"], state["daily_context"], categories, k)
+    except Exception as error:  # no API key, no index yet, ... plan without memory
+        print(f"⚠️  Goal memory unavailable: {error}")
+        return []
+    return [doc.page_content for doc, _ in hits]
+
+
+def ai_task_id(date: str, source: str) -> str:
+    """Stable id for an AI suggestion: same day + same source (e.g. the full
+    goal text, not the truncated title) -> same task"""
+    return "ai_task_" + uuid.uuid5(uuid.NAMESPACE_OID, f"{date}:{source}").hex[:12]
+
+
+def available_minutes(daily_context: Dict) -> int:
+    return sum(block_minutes(block) for block in daily_context["available_time_blocks"])
+
+
+def open_minutes(tasks: List[Task]) -> int:
+    """Time still claimed by unfinished tasks"""
+    return sum(task["estimated_time"] for task in tasks if task["status"] in OPEN_STATUSES)
+
+
+def candidate_goals(state: Dict) -> List[str]:
+    """Today's typed goal first, then stored goals that fit today's context"""
+    goals = state["goals"][:1]
+    for goal in retrieve_relevant_goals(state):
+        if goal not in goals:
+            goals.append(goal)
+    return goals[:1 + RETRIEVED_GOAL_TASKS]
+
+
+def ai_suggestion(date: str, source: str, title: str, description: str, priority: TaskPriority,
+                  estimated_time: int, category: str, energy_required: EnergyLevel) -> Task:
+    return Task(
+        id=ai_task_id(date, source),
+        title=title,
+        description=description,
+        priority=priority,
+        estimated_time=estimated_time,
+        category=category,
+        deadline=None,
+        energy_required=energy_required,
+        status=TaskStatus.PENDING,
+        created_at=datetime.now().isoformat(),
+        completed_at=None,
+        user_created=False
+    )
+
+
+def suggest_tasks(daily_context: Dict, goals: List[str], remaining_time: int, existing_ids) -> List[Task]:
+    """AI suggestions that fit in `remaining_time` and are not already planned
+
+    Candidates (a step towards each goal, a break when stressed) are ranked
+    against today's energy (ranking.py) and added best first while they fit.
+    Ids are derived from the day and title, so a suggestion that is already in
+    the plan is not added twice.
+    """
+    date = daily_context["date"]
+    candidates = []
+
+    # Add AI-suggested tasks only if there's room
+    if remaining_time > 30:  # At least 30 minutes left
+        for goal in goals:
+            candidates.append(ai_suggestion(
+                date, f"goal:{goal}", f"Progress: {goal[:25]}...", f"Take a step towards: {goal}",
+                TaskPriority.MEDIUM, 30, "personal", EnergyLevel.MODERATE
+            ))
+
+    # Add wellness task if stressed
+    if daily_context["stress_level"] >= 6:
+        candidates.append(ai_suggestion(
+            date, "stress-relief", "Stress Relief Break", "Take time for yourself - breathe, walk, or relax",
+            TaskPriority.HIGH, 15, "health", EnergyLevel.LOW
+        ))
+
+    ai_tasks = []
+    unique = {}
+    for task in candidates:
+        if task["id"] not in existing_ids:
+            unique.setdefault(task["id"], task)
+    candidates = list(unique.values())
+    for task in rank_tasks(candidates, energy=daily_context["energy"]):
+        if remaining_time >= task["estimated_time"] + SUGGESTION_SLACK:
+            ai_tasks.append(task)
+            remaining_time -= task["estimated_time"]
+
+    return ai_tasks
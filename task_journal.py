@@ -0,0 +1,234 @@
+"""Append-only task event journal with snapshots and compaction.
+
+Every task mutation is recorded as one JSON line in the user's journal:
+
+    {"seq": 42, "type": "add" | "update" | "complete" | "delete" | "clear", ...}
+
+Writes are group-committed: a background thread gathers everything recorded
+within `commit_interval` and appends it with a single write + fsync per
+journal, so recording an event costs the caller only a queue put.
+
+Once a user's journal holds `snapshot_every` events past the last snapshot,
+the writer folds them into `snapshot.json` (atomically replaced) and rewrites
+the journal with only the events after it. Recovery is therefore always
+"load the snapshot, replay a short tail".
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from serialization import to_jsonable
+from task_store import TaskStore
+
+JOURNAL_ROOT = "task_journal"
+JOURNAL_FILE = "journal.log"
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_EVERY = 1000
+COMMIT_INTERVAL = 0.005  # seconds events wait to share an fsync
+
+_STOP = object()
+
+
+def user_dirname(user_id: str) -> str:
+    """Stable, filesystem-safe directory name for a user id"""
+    return hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:16]
+
+
+def apply_event(store: TaskStore, event: Dict):
+    """Replay one journal event onto a TaskStore"""
+    kind = event["type"]
+    if kind == "add":
+        store.add(dict(event["task"]))
+    elif kind in ("update", "complete"):
+        store.update(event["task_id"], **event["changes"])
+    elif kind == "delete":
+        store.remove(event["task_id"])
+    elif kind == "clear":
+        store.clear()
+
+
+class TaskJournal:
+    def __init__(self, root: str = JOURNAL_ROOT, snapshot_every: int = SNAPSHOT_EVERY,
+                 commit_interval: float = COMMIT_INTERVAL):
+        self.root = root
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+        self._seq: Dict[str, int] = {}
+        self._since_snapshot: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="task-journal-writer", daemon=True)
+        self._writer.start()
+
+    def _dir(self, user_id: str) -> str:
+        return os.path.join(self.root, user_dirname(user_id))
+
+    # -------------------------------------------------------------------------
+    # recording
+    # -------------------------------------------------------------------------
+
+    def _next_seq(self, user_id: str) -> int:
+        # Caller holds `_lock`
+        if user_id not in self._seq:
+            _, seq, tail = self._read(user_id, repair=True)
+            self._seq[user_id] = seq
+            self._since_snapshot[user_id] = tail
+        self._seq[user_id] += 1
+        return self._seq[user_id]
+
+    def record(self, user_id: str, event_type: str, **fields):
+        """Queue an event; it is durable after the next group commit (see `sync`)"""
+        payload = to_jsonable(fields)
+        # Enqueue under the same lock that hands out seqs, so events reach the
+        # journal in seq order and replay never skips a lower seq written late.
+        with self._lock:
+            event = {"seq": self._next_seq(user_id), "type": event_type, "ts": time.time()}
+            event.update(payload)
+            self._queue.put((user_id, event))
+
+    def task_added(self, user_id: str, task: Dict, source: str = "user"):
+        self.record(user_id, "add", task=task, source=source)
+
+    def task_updated(self, user_id: str, task_id: str, **changes):
+        self.record(user_id, "update", task_id=task_id, changes=changes)
+
+    def task_completed(self, user_id: str, task_id: str, **changes):
+        self.record(user_id, "complete", task_id=task_id, changes=changes)
+
+    def task_deleted(self, user_id: str, task_id: str):
+        self.record(user_id, "delete", task_id=task_id)
+
+    def tasks_cleared(self, user_id: str):
+        self.record(user_id, "clear")
+
+    def sync(self):
+        """Block until every event recorded so far is on disk"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    # -------------------------------------------------------------------------
+    # group commit
+    # -------------------------------------------------------------------------
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            by_user: Dict[str, List[Dict]] = {}
+            for item in batch:
+                if item is not _STOP:
+                    by_user.setdefault(item[0], []).append(item[1])
+            for user_id, events in by_user.items():
+                try:
+                    self._append(user_id, events)
+                except OSError as error:
+                    print(f"⚠️  Failed to journal {len(events)} event(s) for {user_id}: {error}")
+            for _ in batch:
+                self._queue.task_done()
+            if any(item is _STOP for item in batch):
+                return
+
+    def _append(self, user_id: str, events: List[Dict]):
+        directory = self._dir(user_id)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, JOURNAL_FILE), "a", encoding="utf-8") as journal:
+            journal.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+            journal.flush()
+            os.fsync(journal.fileno())
+        with self._lock:
+            self._since_snapshot[user_id] = self._since_snapshot.get(user_id, 0) + len(events)
+            due = self._since_snapshot[user_id] >= self.snapshot_every
+        if due:
+            self.compact(user_id)
+
+    # -------------------------------------------------------------------------
+    # snapshots and recovery
+    # -------------------------------------------------------------------------
+
+    def _read(self, user_id: str, repair: bool = False) -> Tuple[List[Dict], int, int]:
+        """(tasks, last seq, tail length) from snapshot + journal tail
+
+        With `repair`, a torn last line is truncated away so the next append
+        starts on a fresh line instead of being glued onto it.
+        """
+        directory = self._dir(user_id)
+        store = TaskStore()
+        seq = 0
+        try:
+            with open(os.path.join(directory, SNAPSHOT_FILE), encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            for task in snapshot["tasks"]:
+                store.add(task)
+            seq = snapshot["seq"]
+        except FileNotFoundError:
+            pass
+
+        tail = 0
+        journal_path = os.path.join(directory, JOURNAL_FILE)
+        intact = 0  # bytes up to the end of the last complete event
+        try:
+            with open(journal_path, "rb") as journal:
+                for line in journal:
+                    if not line.endswith(b"\n"):
+                        break  # torn last line from a crash; nothing after it was acknowledged
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    intact += len(line)
+                    if event["seq"] <= seq:
+                        continue
+                    apply_event(store, event)
+                    seq = event["seq"]
+                    tail += 1
+            if repair and intact < os.path.getsize(journal_path):
+                with open(journal_path, "r+b") as journal:
+                    journal.truncate(intact)
+        except FileNotFoundError:
+            pass
+        return list(store), seq, tail
+
+    def recover(self, user_id: str) -> List[Dict]:
+        """A user's tasks (JSON form) as of the last recorded event"""
+        self.sync()
+        return self._read(user_id)[0]
+
+    def has_history(self, user_id: str) -> bool:
+        directory = self._dir(user_id)
+        return any(os.path.exists(os.path.join(directory, name)) for name in (SNAPSHOT_FILE, JOURNAL_FILE))
+
+    def compact(self, user_id: str):
+        """Fold the journal into a new snapshot and drop the events it covers"""
+        directory = self._dir(user_id)
+        tasks, seq, _ = self._read(user_id)
+
+        snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        with open(snapshot_path + ".tmp", "w", encoding="utf-8") as snapshot_file:
+            json.dump({"seq": seq, "tasks": tasks}, snapshot_file, separators=(",", ":"))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+
+        # Only the writer thread appends, and it is the one compacting, so
+        # nothing can land in the journal between reading and replacing it.
+        journal_path = os.path.join(directory, JOURNAL_FILE)
+        open(journal_path + ".tmp", "w").close()
+        os.replace(journal_path + ".tmp", journal_path)
+        with self._lock:
+            self._since_snapshot[user_id] = 0
@@ -0,0 +1,171 @@
+"""Compact task representation and bulk codec.
+
+`CompactTask` is a `__slots__` object holding integer-coded enums (priority,
+energy, status, category) and integer timestamps (microseconds since the
+epoch), which takes a fraction of the memory of the `Task` dict form and is
+trivially JSON-serializable. `from_task` / `to_task` convert losslessly to and
+from the dict form used by agent.py: a timestamp string is only converted if
+it reads back identically, otherwise the string itself is kept.
+
+`encode_tasks` / `decode_tasks` move whole task lists as struct-of-arrays
+JSON (one list per field, no repeated keys), which the C JSON codec handles
+much faster than a list of dicts.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Union
+
+from task_types import EnergyLevel, Task, TaskPriority, TaskStatus
+from serialization import parse_enum
+
+FORMAT_VERSION = 1
+
+STATUSES = list(TaskStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Category names are interned process-wide; tasks store the small int code.
+_categories: List[str] = []
+_category_codes: Dict[str, int] = {}
+
+
+def category_code(name: str) -> int:
+    code = _category_codes.get(name)
+    if code is None:
+        code = _category_codes[name] = len(_categories)
+        _categories.append(name)
+    return code
+
+
+def category_name(code: int) -> str:
+    return _categories[code]
+
+
+Timestamp = Union[int, str, None]
+
+
+def encode_time(value: Optional[str]) -> Timestamp:
+    """ISO string -> microseconds since the epoch (the string itself if that would lose detail)"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    micros = (parsed - (_EPOCH_UTC if parsed.tzinfo else _EPOCH)) // _MICROSECOND
+    if parsed.tzinfo or decode_time(micros) != value:
+        return value
+    return micros
+
+
+def decode_time(value: Timestamp) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return (_EPOCH + value * _MICROSECOND).isoformat()
+
+
+class CompactTask:
+    __slots__ = (
+        "id", "title", "description", "priority", "estimated_time", "category",
+        "deadline", "energy_required", "status", "created_at", "completed_at", "user_created",
+    )
+
+    def __init__(self, id: str, title: str, description: str, priority: int, estimated_time: int,
+                 category: int, deadline: Timestamp, energy_required: int, status: int,
+                 created_at: Timestamp, completed_at: Timestamp, user_created: bool):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.estimated_time = estimated_time
+        self.category = category
+        self.deadline = deadline
+        self.energy_required = energy_required
+        self.status = status
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.user_created = user_created
+
+    @classmethod
+    def from_task(cls, task: Task) -> "CompactTask":
+        return cls(
+            task["id"],
+            task["title"],
+            task["description"],
+            task["priority"].value,
+            task["estimated_time"],
+            category_code(task["category"]),
+            encode_time(task["deadline"]),
+            task["energy_required"].value,
+            STATUS_CODES[task["status"]],
+            encode_time(task["created_at"]),
+            encode_time(task["completed_at"]),
+            task.get("user_created", False),
+        )
+
+    def to_task(self) -> Task:
+        return Task(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            priority=TaskPriority(self.priority),
+            estimated_time=self.estimated_time,
+            category=category_name(self.category),
+            deadline=decode_time(self.deadline),
+            energy_required=EnergyLevel(self.energy_required),
+            status=STATUSES[self.status],
+            created_at=decode_time(self.created_at),
+            completed_at=decode_time(self.completed_at),
+            user_created=self.user_created,
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactTask):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"CompactTask(id={self.id!r}, title={self.title!r}, status={STATUSES[self.status].name})"
+
+
+def task_from_jsonable(data: Dict) -> Task:
+    """Rebuild a Task dict from its JSON form (Enums stored by name)"""
+    task = dict(data)
+    task["priority"] = parse_enum(TaskPriority, task["priority"])
+    task["energy_required"] = parse_enum(EnergyLevel, task["energy_required"])
+    task["status"] = parse_enum(TaskStatus, task["status"])
+    return Task(**task)
+
+
+# =============================================================================
+# BULK CODEC (struct of arrays)
+# =============================================================================
+
+def encode_tasks(tasks: Iterable[Union[Task, CompactTask]]) -> bytes:
+    """Serialize many tasks as one JSON object of per-field columns"""
+    compact = [task if isinstance(task, CompactTask) else CompactTask.from_task(task) for task in tasks]
+    columns = {field: [getattr(task, field) for task in compact] for field in CompactTask.__slots__}
+    # category codes are process-local, so ship the names they refer to
+    used = sorted(set(columns["category"]))
+    remap = {code: position for position, code in enumerate(used)}
+    columns["category"] = [remap[code] for code in columns["category"]]
+    payload = {"v": FORMAT_VERSION, "categories": [category_name(code) for code in used], "columns": columns}
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def decode_compact(data: bytes) -> List[CompactTask]:
+    payload = json.loads(data)
+    if payload.get("v") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported task encoding version: {payload.get('v')}")
+    columns = payload["columns"]
+    codes = [category_code(name) for name in payload["categories"]]
+    columns["category"] = [codes[position] for position in columns["category"]]
+    return [CompactTask(*row) for row in zip(*(columns[field] for field in CompactTask.__slots__))]
+
+
+def decode_tasks(data: bytes) -> List[Task]:
+    """Inverse of encode_tasks, back to the Task dict form"""
+    return [task.to_task() for task in decode_compact(data)]
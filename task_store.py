@@ -0,0 +1,145 @@
+"""Indexed in-memory task collection shared by the CLI and the Streamlit app.
+
+Tasks stay plain dicts (the CLI's `Task` TypedDict or the app's task dicts);
+the store adds O(1) lookup by id and secondary indexes by status, category
+and priority, so status transitions and filtered views never scan the whole
+backlog. Index buckets are insertion-ordered, so views list tasks in the
+order they were added.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+INDEXED_FIELDS = ("status", "category", "priority")
+
+
+class TaskStore:
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        self._tasks: Dict[str, Dict] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in INDEXED_FIELDS}
+        for task in tasks:
+            self.add(task)
+
+    # -------------------------------------------------------------------------
+    # index maintenance
+    # -------------------------------------------------------------------------
+
+    def _index(self, task: Dict):
+        for field in INDEXED_FIELDS:
+            self._indexes[field].setdefault(task.get(field), {})[task["id"]] = None
+
+    def _unindex(self, task: Dict, fields=INDEXED_FIELDS):
+        for field in fields:
+            bucket = self._indexes[field].get(task.get(field))
+            if bucket is not None:
+                bucket.pop(task["id"], None)
+                if not bucket:
+                    del self._indexes[field][task.get(field)]
+
+    # -------------------------------------------------------------------------
+    # mutations
+    # -------------------------------------------------------------------------
+
+    def add(self, task: Dict) -> Dict:
+        """Insert a task (replacing any task with the same id)"""
+        if task["id"] in self._tasks:
+            self.remove(task["id"])
+        self._tasks[task["id"]] = task
+        self._index(task)
+        return task
+
+    def remove(self, task_id: str) -> Optional[Dict]:
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._unindex(task)
+        return task
+
+    def update(self, task_id: str, **changes) -> Optional[Dict]:
+        """Change fields of a task in place, re-indexing only what changed"""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        moved = [field for field in INDEXED_FIELDS if field in changes and changes[field] != task.get(field)]
+        self._unindex(task, moved)
+        task.update(changes)
+        for field in moved:
+            self._indexes[field].setdefault(task.get(field), {})[task_id] = None
+        return task
+
+    def set_status(self, task_id: str, status: Any, **changes) -> Optional[Dict]:
+        """O(1) status transition (plus any extra fields, e.g. completed_at)"""
+        return self.update(task_id, status=status, **changes)
+
+    def clear(self):
+        self._tasks.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    # -------------------------------------------------------------------------
+    # queries
+    # -------------------------------------------------------------------------
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        return self._tasks.get(task_id)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._tasks.values())
+
+    def _ids(self, field: str, values) -> Iterable[str]:
+        if isinstance(values, (list, tuple, set, frozenset)):
+            if len(values) == 1:
+                return self._indexes[field].get(next(iter(values)), {})
+            merged: Dict[str, None] = {}
+            for value in values:
+                merged.update(self._indexes[field].get(value, {}))
+            return merged
+        return self._indexes[field].get(values, {})
+
+    def _candidates(self, criteria: Dict[str, Any]) -> List[Iterable[str]]:
+        """Id buckets for each criterion, smallest first"""
+        for field in criteria:
+            if field not in self._indexes:
+                raise KeyError(f"{field!r} is not indexed; choose from {INDEXED_FIELDS}")
+        return sorted((self._ids(field, values) for field, values in criteria.items()), key=len)
+
+    def where(self, **criteria) -> List[Dict]:
+        """Tasks matching every criterion; a criterion is a value or a collection of values"""
+        criteria = {field: values for field, values in criteria.items() if values is not None}
+        if not criteria:
+            return list(self._tasks.values())
+
+        # start from the smallest bucket and probe the others
+        smallest, *others = self._candidates(criteria)
+        return [self._tasks[task_id] for task_id in smallest if all(task_id in ids for ids in others)]
+
+    def by_status(self, status: Any) -> List[Dict]:
+        return self.where(status=status)
+
+    def by_category(self, category: Any) -> List[Dict]:
+        return self.where(category=category)
+
+    def by_priority(self, priority: Any) -> List[Dict]:
+        return self.where(priority=priority)
+
+    def count(self, field: str, value: Any) -> int:
+        return len(self._indexes[field].get(value, {}))
+
+    def counts(self, field: str, **criteria) -> Dict[Any, int]:
+        """Bucket sizes for one indexed field, e.g. tasks per category
+
+        With criteria (as for `where`), only matching tasks are counted, via
+        id-set intersections rather than a pass over the tasks themselves.
+        """
+        criteria = {name: values for name, values in criteria.items() if values is not None}
+        if not criteria:
+            return {value: len(ids) for value, ids in self._indexes[field].items()}
+        smallest, *others = self._candidates(criteria)
+        matching = set(smallest)
+        for ids in others:
+            matching &= ids.keys()
+        counts = {value: len(ids.keys() & matching) for value, ids in self._indexes[field].items()}
+        return {value: count for value, count in counts.items() if count}
@@ -0,0 +1,52 @@
+"""Task enums and the Task record shared by agent.py and its helper modules.
+
+They live outside agent.py so every module sees the same classes: when the
+CLI runs as `python agent.py`, agent.py is loaded as `__main__`, and helpers
+importing `agent` would otherwise get a second, unequal copy of each Enum.
+"""
+from enum import Enum
+from typing import Optional, TypedDict
+
+
+class MoodLevel(Enum):
+    VERY_LOW = 1
+    LOW = 2
+    NEUTRAL = 3
+    GOOD = 4
+    EXCELLENT = 5
+
+class EnergyLevel(Enum):
+    EXHAUSTED = 1
+    LOW = 2
+    MODERATE = 3
+    HIGH = 4
+    PEAK = 5
+
+class TaskPriority(Enum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    URGENT = 4
+
+class TaskStatus(Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    MISSED = "missed"
+    RESCHEDULED = "rescheduled"
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+class Task(TypedDict):
+    id: str
+    title: str
+    description: str
+    priority: TaskPriority
+    estimated_time: int  # minutes
+    category: str  # work, personal, health, learning
+    deadline: Optional[str]
+    energy_required: EnergyLevel
+    status: TaskStatus
+    created_at: str
+    completed_at: Optional[str]
+    user_created: bool  # NEW: Track if user created this task
@@ -0,0 +1,171 @@
+import os
+import runpy
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+import agent  # noqa: E402
+import suggestions  # noqa: E402
+from agent import (  # noqa: E402
+    EnergyLevel,
+    MoodLevel,
+    TaskPriority,
+    append_items,
+    build_initial_state,
+    create_enhanced_life_coach_graph,
+    plan_session,
+    session_config,
+    same_context,
+)
+from habits import HabitTracker, empty_habits  # noqa: E402
+from serialization import to_jsonable  # noqa: E402
+from task_model import task_from_jsonable  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_goal_memory(monkeypatch):
+    # plan from the typed goals only; goal memory needs an embedding API
+    monkeypatch.setattr(suggestions, "retrieve_relevant_goals", lambda state, k=suggestions.RETRIEVED_GOAL_TASKS: [])
+
+
+def make_state(stress_level=7):
+    user_data = {
+        "name": "Tester",
+        "mood": MoodLevel.GOOD,
+        "energy": EnergyLevel.HIGH,
+        "stress_level": stress_level,
+        "available_time_blocks": [{"start": "09:00 AM", "end": "11:00 AM"}],
+    }
+    custom_tasks = [{
+        "title": "Write report", "description": "Quarterly report", "priority": TaskPriority.HIGH,
+        "estimated_time": 30, "category": "work", "energy_required": EnergyLevel.HIGH,
+    }]
+    return build_initial_state(user_data, ["Learn to play the piano"], custom_tasks)
+
+
+def test_append_items_leaves_the_previous_value_untouched():
+    previous = [1, 2]
+    assert append_items(previous, [3]) == [1, 2, 3]
+    assert previous == [1, 2]
+    assert append_items(previous, agent.Replace([9])) == [9]
+
+
+def test_merge_tasks_replaces_tasks_by_id():
+    previous = [{"id": "a", "status": "pending"}, {"id": "b", "status": "pending"}]
+    done = {"id": "a", "status": "completed"}
+    assert agent.merge_tasks(previous, [done, {"id": "c"}]) == [done, previous[1], {"id": "c"}]
+    assert previous[0]["status"] == "pending"
+    assert agent.merge_tasks(previous, agent.Replace([done])) == [done]
+    assert agent.merge_tasks(None, [done]) == [done]
+
+
+def test_planner_does_not_load_a_second_copy_of_agent():
+    # with `python agent.py` the CLI is `__main__`; importing agent again
+    # would rerun the module and split its state between two copies
+    code = "import sys, planner; print('agent' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(agent.__file__),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_streamed_snapshots_are_not_changed_by_later_steps():
+    app = create_enhanced_life_coach_graph()
+    snapshots = [
+        (values["current_tasks"], len(values["current_tasks"]))
+        for values in app.stream(make_state(), stream_mode="values")
+    ]
+    assert [len(tasks) for tasks, _ in snapshots] == [count for _, count in snapshots]
+    assert snapshots[-1][1] > snapshots[0][1]
+
+
+def test_goals_sharing_a_title_prefix_get_separate_suggestions():
+    state = make_state(stress_level=3)
+    goals = ["Improve my Spanish speaking skills", "Improve my Spanish reading skills"]
+    suggested = suggestions.suggest_tasks(state["daily_context"], goals, 240, set())
+    assert len({task["id"] for task in suggested}) == 2
+
+
+def test_same_context_ignores_time_blocks():
+    previous, resumed = make_state(), make_state()
+    resumed["daily_context"]["available_time_blocks"] = [{"start": "10:17 AM", "end": "11:00 AM"}]
+    assert same_context(previous, resumed)
+    assert not same_context(previous, make_state(stress_level=3))
+
+
+def test_restored_tasks_are_open_when_agent_runs_as_a_script():
+    # `python agent.py` loads agent.py as a second module; its statuses must still match
+    script = runpy.run_path(agent.__file__, run_name="__cli__")
+    task = script["user_task_integrator_node"](make_state())["current_tasks"][0]
+    restored = task_from_jsonable(to_jsonable(task))
+    assert restored["status"] in script["OPEN_STATUSES"]
+    assert script["open_minutes"]([restored]) == 30
+
+
+def test_resuming_with_a_new_context_keeps_the_checkpointed_habits():
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    app = create_enhanced_life_coach_graph(InMemorySaver())
+    tracker = HabitTracker()
+    tracker.record("Read")
+    first = make_state()
+    first["habits_tracking"] = tracker.to_dict()
+    config = session_config("Tester", first["daily_context"]["date"])
+    plan_session(app, first, config)
+
+    resumed = make_state(stress_level=3)  # context changed: the whole graph reruns
+    resumed["habits_tracking"] = empty_habits()
+    final = plan_session(app, resumed, config)
+    assert HabitTracker.from_dict(final["habits_tracking"]).habits == ["Read"]
+
+
+def test_independent_nodes_share_a_superstep():
+    app = create_enhanced_life_coach_graph()
+    steps = {}
+    for event in app.stream(make_state(), stream_mode="debug"):
+        if event["type"] == "task":
+            steps.setdefault(event["step"], set()).add(event["payload"]["name"])
+    assert list(steps.values()) == [
+        {"context_analyzer", "user_task_integrator"},
+        {"enhanced_task_generator"},
+        {"motivation_coach", "scheduler", "next_action"},
+    ]
+    # every declared dependency ran in an earlier step
+    step_of = {name: step for step, names in steps.items() for name in names}
+    for name, dependencies in agent.NODE_DEPENDENCIES.items():
+        assert all(step_of[dependency] < step_of[name] for dependency in dependencies)
+
+
+def test_new_free_time_on_the_same_day_is_scheduled(tmp_path, monkeypatch, caplog):
+    import atexit
+
+    from langgraph.checkpoint.serde import jsonplus
+
+    import resources
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(atexit, "register", lambda close: None)
+    # the warning is only logged once per process
+    monkeypatch.setattr(jsonplus, "_warned_unregistered_types", set(), raising=False)
+    checkpointer = resources._build_checkpointer()
+    app = create_enhanced_life_coach_graph(checkpointer)
+    first = make_state()
+    config = session_config("Tester", first["daily_context"]["date"])
+    planned = plan_session(app, first, config)
+    assert [block["start"] for block in planned["schedule"]["blocks"]] == ["09:00 AM"]
+
+    unchanged = make_state()
+    unchanged["pending_user_tasks"] = []
+    assert plan_session(app, unchanged, config)["schedule"] == planned["schedule"]
+
+    freed = make_state()
+    freed["pending_user_tasks"] = []
+    freed["daily_context"]["available_time_blocks"].append({"start": "02:00 PM", "end": "04:00 PM"})
+    replanned = plan_session(app, freed, config)
+    assert replanned["daily_context"]["available_time_blocks"] == freed["daily_context"]["available_time_blocks"]
+    assert [block["start"] for block in replanned["schedule"]["blocks"]] == ["09:00 AM", "02:00 PM"]
+    assert len(replanned["current_tasks"]) == len(planned["current_tasks"])
+    assert "unregistered type" not in caplog.text
+    checkpointer.conn.close()
@@ -0,0 +1,34 @@
+import pytest
+
+from app_tasks import MAX_AI_SUGGESTIONS, create_task, suggest_tasks
+
+
+@pytest.mark.parametrize("energy, first, excluded", [
+    ("Exhausted", "Gentle Self-Care", "Tackle Challenging Project"),
+    ("Low", "Gentle Self-Care", "Tackle Challenging Project"),
+    ("High", "Tackle Challenging Project", "Gentle Self-Care"),
+    ("Peak", "Tackle Challenging Project", "Gentle Self-Care"),
+])
+def test_energy_suggestions_match_todays_energy(energy, first, excluded):
+    titles = [task["title"] for task in suggest_tasks("Good", energy, 3, ["Learn to play the piano"])]
+    assert titles[0] == first
+    assert excluded not in titles
+
+
+def test_moderate_energy_gets_neither_energy_suggestion():
+    suggested = suggest_tasks("Good", "Moderate", 3, ["Learn to play the piano"])
+    assert [task["title"] for task in suggested] == ["Progress on: Learn to play the piano..."]
+    assert not suggested[0]["user_created"] and suggested[0]["status"] == "Pending"
+
+
+def test_suggestions_are_capped():
+    goals = [f"Goal number {i}" for i in range(10)]
+    titles = [task["title"] for task in suggest_tasks("Low", "Low", 8, goals)]
+    assert len(titles) == MAX_AI_SUGGESTIONS
+    assert "Stress Relief Activity" in titles and "Connect with Someone" in titles
+
+
+def test_created_tasks_get_their_own_ids():
+    first, second = (create_task("Read", "", "Low", 15, "Personal", "Low") for _ in range(2))
+    assert first["id"] != second["id"]
+    assert first["user_created"] and first["completed_at"] is None
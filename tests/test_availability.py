@@ -0,0 +1,122 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from availability import Availability, events_from_ics, plan_time_blocks
+
+START = datetime(2026, 10, 17, 0, 0)
+HORIZON = 7 * 24 * 60
+
+
+def at(minute):
+    return START + timedelta(minutes=minute)
+
+
+def brute_first_free(busy, minutes, after):
+    taken = [False] * HORIZON
+    for lo, hi in busy:
+        for minute in range(max(0, lo), min(HORIZON, hi)):
+            taken[minute] = True
+    run_start = None
+    for minute in range(after, HORIZON + 1):
+        if minute < HORIZON and not taken[minute]:
+            run_start = minute if run_start is None else run_start
+            continue
+        if run_start is not None and minute - run_start >= minutes:
+            return at(run_start), at(minute)
+        run_start = None
+    return None
+
+
+def test_first_free_matches_brute_force():
+    rng = random.Random(11)
+    for _ in range(50):
+        availability = Availability(START, at(HORIZON))
+        busy = []
+        for _ in range(rng.randint(0, 60)):
+            lo = rng.randrange(HORIZON)
+            busy.append((lo, lo + rng.randint(5, 600)))
+            availability.add_busy(at(busy[-1][0]), at(busy[-1][1]))
+        for _ in range(20):
+            minutes, after = rng.randint(1, 900), rng.randrange(HORIZON)
+            assert availability.first_free(minutes, at(after)) == brute_first_free(busy, minutes, after)
+
+
+def test_busy_intervals_merge_when_overlapping_or_touching():
+    availability = Availability(START, at(600))
+    availability.add_busy(at(60), at(120))
+    availability.add_busy(at(120), at(180))
+    availability.add_busy(at(300), at(360))
+    availability.add_busy(at(170), at(310))
+    availability.add_busy(at(-30), at(10))
+    assert list(zip(availability._busy_starts, availability._busy_ends)) == [(0, 10), (60, 360)]
+    assert availability.free_slots() == [(at(10), at(60)), (at(360), at(600))]
+    assert availability.free_slots(60) == [(at(360), at(600))]
+    assert availability.free_slots(after=at(30), before=at(400)) == [(at(30), at(60)), (at(360), at(400))]
+    assert availability.free_minutes() == 50 + 240
+
+
+def test_daily_blocks_cover_overnight_sleep():
+    availability = Availability(START, at(24 * 60))
+    availability.add_sleep({"bedtime": "11:00 PM", "wake_time": "7:00 AM"})
+    assert availability.free_slots() == [(at(7 * 60), at(23 * 60))]
+
+
+def test_events_from_ics(tmp_path):
+    calendar = tmp_path / "calendar.ics"
+    calendar.write_text("\r\n".join([
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT",
+        "SUMMARY:Dentist\\, checkup",
+        "DTSTART:20261017T100000",
+        "DTEND:20261017T110000",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "SUMMARY:Long",
+        " er meeting",
+        "DTSTART;TZID=Europe/Berlin:20261017T140000",
+        "DURATION:PT1H30M",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "SUMMARY:Holiday",
+        "DTSTART;VALUE=DATE:20261016",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ]))
+    assert events_from_ics([str(calendar)]) == [
+        {"title": "Holiday", "start": "2026-10-16T00:00:00", "end": "2026-10-17T00:00:00"},
+        {"title": "Dentist, checkup", "start": "2026-10-17T10:00:00", "end": "2026-10-17T11:00:00"},
+        {"title": "Longer meeting", "start": "2026-10-17T14:00:00", "end": "2026-10-17T15:30:00"},
+    ]
+
+
+def test_ics_utc_times_are_read_as_local(tmp_path):
+    calendar = tmp_path / "calendar.ics"
+    calendar.write_text("BEGIN:VEVENT\nDTSTART:20261017T120000Z\nDTEND:20261017T130000Z\nEND:VEVENT\n")
+    (event,) = events_from_ics([str(calendar)])
+    start = datetime(2026, 10, 17, 12, tzinfo=timezone.utc).astimezone()
+    assert event["start"] == start.replace(tzinfo=None).isoformat()
+
+
+def test_plan_time_blocks_skips_busy_time_and_respects_budget():
+    events = [{"start": "2026-10-17T19:00:00", "end": "2026-10-17T20:00:00"}]
+    blocks = plan_time_blocks({"bedtime": "11:00 PM", "wake_time": "7:00 AM"}, {}, events, 4,
+                              start=datetime(2026, 10, 17, 17, 2))
+    assert blocks == [
+        {"start": "05:05 PM", "end": "07:00 PM"},
+        {"start": "08:00 PM", "end": "10:00 PM"},  # max block; 5 min left is too short
+    ]
+
+
+def test_events_with_utc_offsets_are_converted_to_local_time():
+    availability = Availability(START, at(24 * 60))
+    start = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+    availability.add_events([{"start": start.isoformat(), "end": "2026-10-17T13:00:00Z"}])
+    local = start.astimezone().replace(tzinfo=None)
+    assert availability.free_slots() == [(START, local), (local + timedelta(hours=1), at(24 * 60))]
+
+
+def test_ics_date_values_without_value_date_param(tmp_path):
+    calendar = tmp_path / "calendar.ics"
+    calendar.write_text("BEGIN:VEVENT\nSUMMARY:Trip\nDTSTART:20261017\nDTEND:20261019\nEND:VEVENT\n")
+    assert events_from_ics([str(calendar)]) == [
+        {"title": "Trip", "start": "2026-10-17T00:00:00", "end": "2026-10-19T00:00:00"}]
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from batch_planner import aplan_many  # noqa: E402
+
+
+class SlowApp:
+    def __init__(self):
+        self.cancelled = 0
+
+    async def ainvoke(self, state):
+        try:
+            await asyncio.sleep(state["delay"])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return state
+
+
+def test_stopping_early_cancels_runs_in_flight():
+    app = SlowApp()
+    states = [{"delay": 0.01}] + [{"delay": 10}] * 3
+
+    async def first_result():
+        results = aplan_many(states, concurrency=4, app=app)
+        async for index, _ in results:
+            await results.aclose()
+            return index, app.cancelled
+
+    assert asyncio.run(asyncio.wait_for(first_result(), 2)) == (0, 3)
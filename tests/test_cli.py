@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from db import LifeCoachDB
+from habits import HabitTracker
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+AGENT = Path(__file__).resolve().parent.parent / "agent.py"
+
+
+def run_cli(cwd, lines):
+    env = dict(os.environ, OPENAI_API_KEY="", LIFE_COACH_LLM_COACHING="0", LIFE_COACH_CALENDAR="")
+    result = subprocess.run(
+        [sys.executable, str(AGENT)], input="\n".join(lines) + "\n", cwd=cwd, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def journal_events(cwd):
+    (journal,) = Path(cwd, "task_journal").glob("*/journal.log")
+    return [json.loads(line) for line in journal.read_text().splitlines()]
+
+
+def test_script_entry_plans_and_journals_with_one_set_of_enums(tmp_path):
+    output = run_cli(tmp_path, [
+        "Tester", "4", "4", "3", "0", "",          # no free hours today
+        "Learn to play the piano", "",
+        "y", "Write report", "", "3", "90", "work", "3", "",
+        "1", "Gym", "", "2", "60", "health",        # add a task mid-day
+        "2", "1",                                   # complete "Write report"
+        "5",
+    ])
+    # both open tasks count against the (empty) day, so nothing is suggested
+    assert "-150 minutes left to plan" in output
+    assert "Suggested:" not in output
+    completed = [event for event in journal_events(tmp_path) if event["type"] == "complete"]
+    assert [event["changes"]["status"] for event in completed] == ["COMPLETED"]
+
+
+def test_second_run_of_the_day_keeps_the_habit_history(tmp_path):
+    intro = ["Tester", "4", "4", "{stress}", "0", "", "", "n"]
+    run_cli(tmp_path, [line.format(stress=3) for line in intro] + ["4", "Read", "5"])
+    run_cli(tmp_path, [line.format(stress=8) for line in intro] + ["4", "Run", "5"])
+
+    db = LifeCoachDB(str(tmp_path / "life_coach.db"))
+    try:
+        assert sorted(HabitTracker.from_dict(db.load_habits("Tester")).habits) == ["Read", "Run"]
+    finally:
+        db.close()
+
+
+def test_mid_day_edits_reach_the_checkpoint_once(tmp_path):
+    import sqlite3
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    from agent import create_enhanced_life_coach_graph, session_config
+
+    run_cli(tmp_path, [
+        "Tester", "4", "4", "3", "2", "",
+        "Learn to play the piano", "",
+        "y", "Write report", "", "3", "30", "work", "3", "",
+        "1", "Gym", "", "2", "30", "health",
+        "2", "1",                                   # complete "Write report"
+        "5",
+    ])
+    conn = sqlite3.connect(tmp_path / "life_coach_checkpoints.sqlite")
+    try:
+        app = create_enhanced_life_coach_graph(SqliteSaver(conn))
+        state = app.get_state(session_config("Tester")).values
+    finally:
+        conn.close()
+    ids = [task["id"] for task in state["current_tasks"]]
+    assert len(ids) == len(set(ids))
+    assert len(state["daily_todo_list"]) == len(ids)
+    status = {task["title"]: task["status"].name for task in state["current_tasks"]}
+    assert status["Write report"] == "COMPLETED" and status["Gym"] == "PENDING"
+    assert [task["title"] for task in state["completed_tasks"]] == ["Write report"]
+    # every open task is either placed once or listed as not fitting
+    placed = [entry["id"] for block in state["schedule"]["blocks"] for entry in block["tasks"]]
+    open_ids = {task["id"] for task in state["current_tasks"] if task["status"].name == "PENDING"}
+    assert sorted(placed + state["schedule"]["unscheduled"]) == sorted(open_ids)
@@ -0,0 +1,29 @@
+import pytest
+
+from db import LifeCoachDB, PersistenceError
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = LifeCoachDB(str(tmp_path / "life_coach.db"))
+    yield db
+    db.close()
+
+
+def task(task_id, status="Pending"):
+    return {"id": task_id, "title": task_id, "status": status, "created_at": "2026-10-17T09:00:00",
+            "category": "work", "priority": "High", "estimated_time": 30}
+
+
+def test_a_failing_write_does_not_drop_the_rest_of_its_batch(db):
+    db.save_task("alice", task("a1"))
+    db._enqueue("INSERT INTO no_such_table VALUES (?)", (1,))
+    db.save_task("bob", task("b1"))
+
+    with pytest.raises(PersistenceError) as raised:
+        db.flush()
+
+    assert len(raised.value.failures) == 1
+    assert [row["id"] for row in db.load_tasks("alice")] == ["a1"]
+    assert [row["id"] for row in db.load_tasks("bob")] == ["b1"]
+    db.flush()  # reported once
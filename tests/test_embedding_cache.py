@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+import embedding_cache  # noqa: E402
+from embedding_cache import CachedEmbeddings  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+
+class CountingEmbeddings(Embeddings):
+    model = "fake-embedding-1"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 1.0]
+
+
+def rows(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT key, last_used FROM embeddings"))
+
+
+def test_hits_skip_the_model_and_misses_call_it_once(tmp_path):
+    underlying = CountingEmbeddings()
+    cache = CachedEmbeddings(underlying, path=str(tmp_path / "cache.sqlite"))
+    assert cache.embed_documents(["a", "bb", "a"]) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert cache.embed_documents(["bb", "ccc"]) == [[2.0, 1.0], [3.0, 1.0]]
+    assert cache.embed_query("ccc") == [3.0, 1.0]
+    assert underlying.calls == [["a", "bb"], ["ccc"]]
+    assert (cache.hits, cache.misses) == (3, 3)
+    cache.close()
+
+
+def test_keys_are_stable_across_instances_and_depend_on_the_model(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = CachedEmbeddings(CountingEmbeddings(), path=path)
+    first.embed_documents(["goal"])
+    first.close()
+
+    underlying = CountingEmbeddings()
+    reopened = CachedEmbeddings(underlying, path=path)
+    assert reopened._key("goal") == first._key("goal")
+    reopened.embed_query("goal")
+    assert underlying.calls == []
+    reopened.close()
+
+    other_model = CachedEmbeddings(CountingEmbeddings(), path=path, model_name="another-model")
+    assert other_model._key("goal") != first._key("goal")
+    other_model.close()
+
+
+def test_hits_are_reads_until_the_touch_batch_is_due(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "TOUCH_BATCH", 3)
+    path = str(tmp_path / "cache.sqlite")
+    cache = CachedEmbeddings(CountingEmbeddings(), path=path)
+    cache.embed_documents(["a", "b", "c"])
+    stored = rows(path)
+
+    cache.embed_query("a")
+    cache.embed_query("b")
+    assert rows(path) == stored  # buffered, nothing written
+    cache.embed_query("c")
+    assert all(used > stored[key] for key, used in rows(path).items())
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = CachedEmbeddings(CountingEmbeddings(), path=path, max_entries=3)
+    for text in ("a", "b", "c"):
+        cache.embed_query(text)
+    cache.embed_query("a")  # a is now more recent than b and c
+    cache.embed_documents(["d", "e"])
+    assert cache._count == 3
+    assert set(rows(path)) == {cache._key(text) for text in ("a", "d", "e")}
+    cache.close()
+
+    reopened = CachedEmbeddings(CountingEmbeddings(), path=path, max_entries=3)
+    assert reopened._count == 3
+    reopened.close()
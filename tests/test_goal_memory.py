@@ -0,0 +1,156 @@
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+
+import goal_index  # noqa: E402
+import goal_memory  # noqa: E402
+from goal_memory import DELTA_LOG, MAPPED_DIR, GoalMemory, MappedGoalMemory  # noqa: E402
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    documents: int = 0
+
+    def embed_documents(self, texts):
+        self.documents += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings():
+    return DeterministicFakeEmbedding(size=16)
+
+
+def test_torn_delta_log_tail_is_dropped_and_later_edits_survive(tmp_path, embeddings):
+    path = str(tmp_path / "goals")
+    memory = GoalMemory(path, embeddings)
+    memory.upsert("a", "alpha")
+    memory.flush()
+    with open(os.path.join(path, DELTA_LOG), "a", encoding="utf-8") as log:
+        log.write('{"op": "upsert", "id": "torn", "te')  # crash mid-write
+
+    memory = GoalMemory(path, embeddings)
+    assert memory.ids() == ["a"]
+    memory.upsert("b", "beta")
+    memory.flush()
+
+    assert sorted(GoalMemory(path, embeddings).ids()) == ["a", "b"]
+
+
+@pytest.mark.parametrize("kind", ["hnsw", "ivf"])
+def test_compaction_reuses_stored_vectors(tmp_path, kind):
+    embeddings = CountingEmbedding(size=16)
+    config = goal_index.index_config(kind=kind, switch_over=200, nlist=4)
+    memory = GoalMemory(str(tmp_path / "goals"), embeddings, compact_after=10**6, index_config=config)
+    memory.upsert_many([(f"g{i}", f"goal {i}", None) for i in range(300)])
+    for i in range(0, 300, 3):
+        memory.delete(f"g{i}")
+    assert memory.tombstones
+
+    embedded = embeddings.documents
+    memory.compact()
+
+    assert embeddings.documents == embedded
+    assert memory.tombstones == 0 and len(memory) == 200
+    query = np.asarray([embeddings.embed_query("goal 5")])
+    assert memory.search_by_vectors(query, 1)[0][0][0].page_content == "goal 5"
+
+
+def test_flush_writes_only_the_delta_until_the_export_is_due(tmp_path, embeddings, monkeypatch):
+    path = str(tmp_path / "goals")
+    memory = GoalMemory(path, embeddings)
+    memory.upsert_many([("a", "alpha", None), ("b", "beta", None)])
+    memory.flush()
+    memory.export_mapped()
+    reader = MappedGoalMemory(os.path.join(path, MAPPED_DIR), embeddings, refresh_interval=0)
+    version = reader.version
+    assert "b" in reader
+
+    memory.delete("b")
+    memory.upsert("c", "gamma")
+    memory.flush()
+    assert reader.version == version  # a fresh export is not rewritten per flush
+
+    monkeypatch.setattr(goal_memory, "EXPORT_INTERVAL", 0)
+    memory.upsert("d", "delta")
+    memory.flush()
+    assert reader.version != version
+    assert "b" not in reader
+    assert reader.get("c").page_content == "gamma"
+    assert {doc.page_content for doc, _ in reader.search("beta", k=3)} == {"alpha", "gamma", "delta"}
+
+
+def test_mapped_reader_closes_replaced_exports_and_throttles_checks(tmp_path, embeddings):
+    path = str(tmp_path / "goals")
+    memory = GoalMemory(path, embeddings)
+    memory.upsert("a", "alpha")
+    memory.export_mapped()
+    reader = MappedGoalMemory(os.path.join(path, MAPPED_DIR), embeddings, refresh_interval=3600)
+    first = reader._export
+
+    memory.upsert("b", "beta")
+    memory.export_mapped()
+    assert "b" not in reader  # CURRENT is not reread within the interval
+    assert reader.refresh(force=True)
+    assert "b" in reader
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.conn.execute("SELECT 1")
+    assert first.index is None
+
+
+def test_export_in_use_is_closed_when_its_lookup_finishes(tmp_path, embeddings):
+    path = str(tmp_path / "goals")
+    memory = GoalMemory(path, embeddings)
+    memory.upsert("a", "alpha")
+    memory.export_mapped()
+    reader = MappedGoalMemory(os.path.join(path, MAPPED_DIR), embeddings, refresh_interval=3600)
+
+    with reader._current() as export:
+        memory.upsert("b", "beta")
+        memory.export_mapped()
+        reader.refresh(force=True)
+        assert export.conn.execute("SELECT COUNT(*) FROM docs").fetchone() == (1,)
+    assert export.index is None
+
+
+def test_cache_key_survives_reopening_and_tracks_contents(tmp_path, embeddings):
+    path = str(tmp_path / "goals")
+    memory = GoalMemory(path, embeddings)
+    memory.upsert_many([("a", "alpha", None), ("b", "beta", None)])
+    memory.upsert("a", "alpha, revised")
+    memory.close()
+    reopened = GoalMemory(path, embeddings)
+    assert reopened.cache_key == memory.cache_key
+
+    before = reopened.cache_key
+    reopened.compact()
+    compacted = reopened.cache_key
+    assert compacted != before
+    reopened.delete("b")
+    assert reopened.cache_key != compacted
+    reopened.close()
+    assert GoalMemory(path, embeddings).cache_key == reopened.cache_key
+
+
+def test_search_batch_embeds_once_and_ranks_per_query(tmp_path, embeddings):
+    memory = GoalMemory(str(tmp_path / "goals"), embeddings)
+    goals = ["run a marathon", "learn the cello", "read more books"]
+    memory.upsert_many([(f"g{i}", text, None) for i, text in enumerate(goals)])
+
+    calls = []
+    embed = embeddings.embed_documents
+    object.__setattr__(embeddings, "embed_documents", lambda texts: calls.append(list(texts)) or embed(texts))
+    queries = ["learn the cello", "run a marathon"]
+    results = memory.search_batch(queries, k=2)
+
+    assert calls == [queries]
+    assert [hits[0][0].page_content for hits in results] == queries
+    assert results == [memory.search(query, k=2) for query in queries]
+    assert memory.search_batch([], k=2) == []
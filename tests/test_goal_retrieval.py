@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from goal_retrieval import context_fingerprint, context_queries
+
+
+def context(stress_level, mood="GOOD", energy="HIGH"):
+    return {
+        "mood": SimpleNamespace(name=mood),
+        "energy": SimpleNamespace(name=energy),
+        "stress_level": stress_level,
+    }
+
+
+def test_fingerprint_changes_exactly_when_the_queries_do():
+    for low, high in [(5, 6), (3, 4), (6, 7), (1, 10)]:
+        same_queries = context_queries(context(low), ["work"]) == context_queries(context(high), ["work"])
+        same_key = context_fingerprint(context(low), ["work"]) == context_fingerprint(context(high), ["work"])
+        assert same_queries == same_key
+
+
+def test_fingerprint_ignores_category_order_and_duplicates():
+    assert context_fingerprint(context(5), ["work", "health", "work"]) == context_fingerprint(context(5), ["health", "work"])
+
+
+def test_memo_is_keyed_on_contents_not_on_the_memory_object(tmp_path, monkeypatch):
+    pytest.importorskip("faiss")
+    pytest.importorskip("langchain_community")
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    import goal_retrieval
+    import resources
+    from goal_shards import GoalMemoryShards
+
+    shards = GoalMemoryShards(str(tmp_path / "users"), embeddings=DeterministicFakeEmbedding(size=8))
+    monkeypatch.setitem(resources._instances, "goal_shards", shards)
+    retriever = goal_retrieval.GoalRetriever()
+    today = context(3)
+
+    shards.get("alice").upsert("g1", "run a marathon")
+    assert [doc.page_content for doc, _ in retriever.retrieve("alice", today, [], k=3)] == ["run a marathon"]
+    shards.evict("alice")
+    assert len(retriever._memo) == 1
+    retriever.retrieve("alice", today, [], k=3)
+    assert len(retriever._memo) == 1  # same contents after reopening: memo hit
+
+    shards.get("alice").upsert("g2", "learn the cello")
+    shards.evict("alice")
+    hits = retriever.retrieve("alice", today, [], k=3)
+    assert {doc.page_content for doc, _ in hits} == {"run a marathon", "learn the cello"}
+    shards.close()
@@ -0,0 +1,111 @@
+import atexit
+import threading
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+
+import goal_shards  # noqa: E402
+import resources  # noqa: E402
+from goal_shards import GoalMemoryShards  # noqa: E402
+
+
+@pytest.fixture
+def shards(tmp_path):
+    shards = GoalMemoryShards(str(tmp_path / "users"), embeddings=DeterministicFakeEmbedding(size=8))
+    yield shards
+    shards.close()
+
+
+def test_evicted_shard_is_flushed_and_rejects_writes(shards):
+    memory = shards.get("alice")
+    memory.upsert("g1", "run a marathon")
+
+    assert shards.evict("alice")
+    with pytest.raises(ValueError):
+        memory.upsert("g2", "learn the cello")
+
+    reopened = shards.get("alice")
+    assert reopened is not memory
+    assert reopened.ids() == ["g1"]
+
+
+def test_recent_users_are_saved_while_active_and_preloaded_on_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(goal_shards, "SAVE_RECENT_INTERVAL", 0)
+    root = str(tmp_path / "users")
+    first = GoalMemoryShards(root, embeddings=DeterministicFakeEmbedding(size=8))
+    first.get("alice").upsert("g1", "run a marathon")
+    first.evict("alice")
+    first.get("bob")
+    # saved during activity, before (and without) close()
+    restarted = GoalMemoryShards(root, embeddings=DeterministicFakeEmbedding(size=8))
+    assert restarted.recent_users() == ["bob", "alice"]
+
+    for future in restarted.preload_recent():
+        future.result()
+    assert restarted.loaded_users() == ["alice"]  # bob never wrote anything to disk
+    first.close()
+    restarted.close()
+
+
+def test_shards_built_by_resources_are_closed_at_exit(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setitem(resources._instances, "embeddings", DeterministicFakeEmbedding(size=8))
+    shards = resources._build_goal_shards()
+    assert shards.close in registered
+    shards.close()
+
+
+def test_other_users_are_served_while_an_evicted_shard_flushes(shards):
+    alice = shards.get("alice")
+    alice.upsert("g1", "run a marathon")
+    shards.resize("alice")
+    shards.get("bob")
+    shards.memory_budget = 0  # the next load pushes alice (non-empty) out
+
+    flushing, release = threading.Event(), threading.Event()
+    close = alice.close
+
+    def slow_close():
+        flushing.set()
+        release.wait(5)
+        close()
+
+    alice.close = slow_close
+    loader = threading.Thread(target=shards.get, args=("carol",))
+    loader.start()
+    assert flushing.wait(5)
+
+    reader = threading.Thread(target=shards.get, args=("bob",))
+    reader.start()
+    reader.join(2)
+    served = not reader.is_alive()
+    release.set()
+    loader.join()
+    reader.join()
+    assert served
+    assert shards.get("alice").ids() == ["g1"]
+
+
+def test_search_batch_answers_each_user_from_their_own_shard(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=8)
+    shards = GoalMemoryShards(str(tmp_path / "users"), embeddings=embeddings)
+    shards.get("alice").upsert_many([("a1", "run a marathon", None), ("a2", "learn the cello", None)])
+    shards.get("bob").upsert("b1", "read more books")
+
+    calls = []
+    embed = embeddings.embed_documents
+    object.__setattr__(embeddings, "embed_documents", lambda texts: calls.append(list(texts)) or embed(texts))
+    results = shards.search_batch([("alice", "learn the cello"), ("bob", "learn the cello"),
+                                   ("alice", "run a marathon")], k=1)
+
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert [[doc.page_content for doc, _ in hits] for hits in results] == [
+        ["learn the cello"], ["read more books"], ["run a marathon"]]
+    assert shards.search_batch([]) == []
+    shards.close()
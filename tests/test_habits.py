@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from habits import HabitTracker, empty_habits
+
+START = date(2026, 10, 1)
+
+
+def days(*offsets):
+    return [START + timedelta(days=offset) for offset in offsets]
+
+
+def test_streaks_across_gaps():
+    tracker = HabitTracker(START)
+    tracker.record_many("Read", days(0, 1, 2, 5, 6))
+    assert tracker.streaks(as_of=START + timedelta(days=6)) == {"Read": {"current": 2, "longest": 3}}
+    # an unchecked today doesn't break the streak, a missed yesterday does
+    assert tracker.streaks(as_of=START + timedelta(days=7))["Read"]["current"] == 2
+    assert tracker.streaks(as_of=START + timedelta(days=8))["Read"]["current"] == 0
+
+
+def test_streak_spanning_the_whole_history_and_byte_boundaries():
+    tracker = HabitTracker(START)
+    tracker.record_many("Run", days(*range(17)))
+    assert tracker.streaks(as_of=START + timedelta(days=16)) == {"Run": {"current": 17, "longest": 17}}
+    tracker.record("Run", START + timedelta(days=8), done=False)
+    assert tracker.streaks(as_of=START + timedelta(days=16)) == {"Run": {"current": 8, "longest": 8}}
+
+
+def test_empty_and_not_yet_started():
+    assert HabitTracker(START).streaks(as_of=START) == {}
+    tracker = HabitTracker(START)
+    tracker.add_habit("Meditate")
+    assert tracker.streaks(as_of=START) == {"Meditate": {"current": 0, "longest": 0}}
+    assert tracker.streaks(as_of=START - timedelta(days=3)) == {"Meditate": {"current": 0, "longest": 0}}
+
+
+def test_recording_before_start_shifts_history():
+    tracker = HabitTracker(START)
+    tracker.record_many("Read", days(0, 1))
+    tracker.record("Read", START - timedelta(days=1))
+    assert tracker.start == START - timedelta(days=1)
+    assert tracker.history("Read", as_of=START + timedelta(days=1)).tolist() == [True, True, True]
+
+
+def test_adherence_windows():
+    tracker = HabitTracker(START)
+    tracker.record_many("Read", days(*range(0, 30, 2)))  # every other day for 30 days
+    today = START + timedelta(days=29)
+    assert tracker.adherence(as_of=today, windows=(7, 30)) == {"Read": {7: 3 / 7, 30: 15 / 30}}
+    rolling = tracker.rolling_adherence(7, as_of=today)
+    assert rolling.shape == (1, 30)
+    assert rolling[0, -1] == 3 / 7
+
+
+def test_adherence_of_a_short_history_counts_the_days_tracked():
+    tracker = HabitTracker(START)
+    tracker.record_many("Read", days(0, 1, 2))
+    tracker.record_many("Run", days(1))
+    today = START + timedelta(days=2)
+    assert tracker.adherence(as_of=today) == {"Read": {7: 1.0, 30: 1.0}, "Run": {7: 1 / 3, 30: 1 / 3}}
+    assert tracker.rolling_adherence(7, as_of=today)[0].tolist() == [1.0, 1.0, 1.0]
+    assert tracker.rolling_adherence(2, as_of=today)[1].tolist() == [0.0, 0.5, 0.5]
+    # not tracked yet
+    assert tracker.adherence(as_of=START - timedelta(days=1)) == {"Read": {7: 0.0, 30: 0.0}, "Run": {7: 0.0, 30: 0.0}}
+
+
+def test_round_trip_through_the_compact_form():
+    tracker = HabitTracker(START)
+    tracker.record_many("Read", days(0, 3, 9))
+    tracker.record_many("Run", days(1, 2, 3))
+    restored = HabitTracker.from_dict(tracker.to_dict())
+    today = START + timedelta(days=9)
+    assert restored.habits == ["Read", "Run"]
+    assert (restored.matrix(as_of=today) == tracker.matrix(as_of=today)).all()
+    assert HabitTracker.from_dict(empty_habits(START)).habits == []
+
+
+def test_correlation():
+    tracker = HabitTracker(START)
+    tracker.record_many("A", days(0, 2, 4))
+    tracker.record_many("B", days(0, 2, 4))
+    tracker.record_many("C", days(1, 3))
+    correlation = tracker.correlation(as_of=START + timedelta(days=4))
+    assert correlation["A"]["B"] == 1.0
+    assert correlation["A"]["C"] == -1.0
@@ -0,0 +1,30 @@
+from llm_cache import ResponseCache
+
+
+class ConstantEmbedding:
+    """Every prompt looks identical to the semantic matcher"""
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+
+def test_semantic_hits_stay_within_the_context_bucket():
+    cache = ResponseCache(embeddings=ConstantEmbedding())
+    cache.put("Mood: excellent. Energy: peak.", "Go conquer the day!", bucket="EXCELLENT|PEAK|low")
+
+    assert cache.get("Mood: very low. Energy: exhausted.", bucket="VERY_LOW|EXHAUSTED|high") is None
+    assert cache.get("Mood: excellent. Energy: peak!", bucket="EXCELLENT|PEAK|low") == "Go conquer the day!"
+    assert cache.semantic_hits == 1
+
+
+def test_bucket_is_part_of_the_exact_key_and_survives_persistence(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(path=path)
+    cache.put("same prompt", "calm answer", bucket="calm")
+    cache.put("same prompt", "stressed answer", bucket="stressed")
+    cache.save()
+
+    reloaded = ResponseCache(path=path)
+    assert reloaded.get("same prompt", bucket="calm") == "calm answer"
+    assert reloaded.get("same prompt", bucket="stressed") == "stressed answer"
+    assert reloaded.get("same prompt") is None
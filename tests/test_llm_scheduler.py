@@ -0,0 +1,52 @@
+import asyncio
+import concurrent.futures
+import time
+
+import pytest
+
+from llm_scheduler import LLMScheduler
+
+
+class SlowLLM:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"answer to {prompt}"
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = LLMScheduler(SlowLLM())
+    yield scheduler
+    scheduler.close()
+
+
+def submit(scheduler, prompt):
+    return asyncio.run_coroutine_threadsafe(scheduler._submit(prompt), scheduler._loop)
+
+
+def test_owner_cancellation_does_not_fail_coalesced_waiters(scheduler):
+    owner = submit(scheduler, "plan my day")
+    time.sleep(0.05)
+    waiter = submit(scheduler, "plan my day")
+    time.sleep(0.05)
+    owner.cancel()
+
+    assert waiter.result(timeout=2) == "answer to plan my day"
+    assert scheduler.llm.calls == 1 and scheduler.coalesced == 1
+    with pytest.raises(concurrent.futures.CancelledError):
+        owner.result(timeout=2)
+
+
+def test_request_is_cancelled_once_every_waiter_is_gone(scheduler):
+    first, second = submit(scheduler, "hello"), submit(scheduler, "hello")
+    time.sleep(0.05)
+    first.cancel()
+    second.cancel()
+    time.sleep(0.05)
+
+    assert not scheduler._inflight
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from next_action import NextActionQueue, action_score, describe
+
+NOW = datetime(2026, 10, 17, 9, 0)
+
+
+def make_task(task_id, priority="Medium", energy="Moderate", status="Pending", deadline=None):
+    return {"id": task_id, "title": task_id, "estimated_time": 30, "priority": priority,
+            "energy_required": energy, "status": status, "deadline": deadline}
+
+
+def make_queue():
+    tasks = [make_task("low", "Low"), make_task("medium"), make_task("high", "High"), make_task("urgent", "Urgent")]
+    return NextActionQueue(tasks, energy=3, now=NOW)
+
+
+def test_peek_follows_score_and_skips_closed_tasks():
+    queue = NextActionQueue([make_task("done", "Urgent", status="Completed"), make_task("a"), make_task("b", "High")],
+                            energy=3, now=NOW)
+    assert "done" not in queue
+    assert queue.peek()["id"] == "b"
+    assert len(queue) == 2
+
+
+def test_removed_entries_are_skipped_lazily_and_compacted():
+    queue = make_queue()
+    queue.remove("urgent")
+    assert queue.peek()["id"] == "high"
+    assert len(queue._heap) == 3  # the dead entry was popped off the top
+
+    queue.remove("low")  # buried entry: only marked dead
+    assert queue.top(5) == [queue._entries["high"][2], queue._entries["medium"][2]]
+    queue.remove("medium")  # dead entries now outnumber live ones
+    assert [entry[2]["id"] for entry in queue._heap] == ["high"]
+    assert queue._dead == 0
+
+
+def test_reprioritize_and_push_rescore():
+    queue = make_queue()
+    queue.reprioritize("low", priority="Urgent", deadline=(NOW + timedelta(hours=1)).isoformat())
+    assert queue.peek()["id"] == "low"
+    assert len(queue) == 4
+
+    queue.push(make_task("low", status="Completed"))
+    assert "low" not in queue
+    assert queue.peek()["id"] == "urgent"
+    assert queue.reprioritize("missing", priority="High") is None
+
+
+def test_top_and_pop_agree_with_scores():
+    queue = make_queue()
+    queue.remove("high")
+    expected = ["urgent", "medium", "low"]
+    assert [task["id"] for task in queue.top(10)] == expected
+    assert [queue.pop()["id"] for _ in range(3)] == expected
+    assert queue.pop() is None and queue.peek() is None
+
+
+def test_equal_scores_keep_insertion_order():
+    queue = NextActionQueue([make_task(str(i)) for i in range(5)], energy=3, now=NOW)
+    assert [task["id"] for task in queue.top(5)] == ["0", "1", "2", "3", "4"]
+
+
+def test_score_prefers_matching_energy_and_near_deadlines():
+    tired = action_score(make_task("hard", energy="High"), energy=1, now=NOW)
+    easy = action_score(make_task("easy", energy="Low"), energy=1, now=NOW)
+    assert easy > tired
+    soon = action_score(make_task("soon", deadline=(NOW + timedelta(hours=1)).isoformat()), 3, NOW)
+    later = action_score(make_task("later", deadline=(NOW + timedelta(days=3)).isoformat()), 3, NOW)
+    assert soon > later > action_score(make_task("none"), 3, NOW)
+
+
+def test_refresh_rescores_for_new_energy():
+    queue = NextActionQueue([make_task("hard", energy="Peak"), make_task("easy", energy="Exhausted")],
+                            energy="Peak", now=NOW)
+    assert queue.peek()["id"] == "hard"
+    queue.refresh(energy="Exhausted", now=NOW)
+    assert queue.peek()["id"] == "easy"
+
+
+def test_describe():
+    assert describe(None) == ""
+    assert describe(make_task("Read")) == "Read (30 min)"
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ranking import TaskColumns, rank_tasks, score, top_k_indices
+
+NOW = datetime(2026, 10, 17, 9, 0)
+
+
+def make_task(task_id, priority="Medium", energy="Moderate", minutes=30, deadline=None):
+    return {"id": task_id, "priority": priority, "energy_required": energy, "estimated_time": minutes,
+            "created_at": NOW.isoformat(), "deadline": deadline}
+
+
+def test_top_k_breaks_ties_in_input_order():
+    scores = np.array([1.0, 3.0, 3.0, 3.0, 2.0, 3.0])
+    assert top_k_indices(scores, 2).tolist() == [1, 2]
+    assert top_k_indices(scores, 5).tolist() == [1, 2, 3, 5, 4]
+    assert top_k_indices(scores, 0).tolist() == []
+    assert top_k_indices(np.array([]), 3).tolist() == []
+
+
+def test_top_k_matches_a_stable_sort():
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        scores = rng.integers(0, 5, size=rng.integers(1, 40)).astype(np.float64)
+        stable = np.argsort(-scores, kind="stable")
+        for k in (1, 3, len(scores) // 2, len(scores), len(scores) + 2):
+            assert top_k_indices(scores, k).tolist() == stable[:k].tolist()
+
+
+def test_score_matches_weights():
+    tasks = [make_task("a", "High", "High", 60), make_task("b", "Low", "Low", 30)]
+    scores = score(TaskColumns(tasks), energy=4, now=NOW)
+    # 10 x priority - energy mismatch - 2 x hours of effort (no age, no deadline)
+    assert np.allclose(scores, [30 - 0 - 2, 10 - 2 - 1])
+
+
+def test_rank_tasks_weighs_urgency_energy_and_effort():
+    due = (NOW + timedelta(hours=1)).isoformat()
+    tasks = [make_task("plain"), make_task("due", deadline=due), make_task("quick", minutes=5)]
+    assert [task["id"] for task in rank_tasks(tasks, now=NOW)] == ["due", "quick", "plain"]
+
+    tasks = [make_task("hard", energy="Peak"), make_task("easy", energy="Exhausted")]
+    assert rank_tasks(tasks, k=1, energy="Exhausted", now=NOW)[0]["id"] == "easy"
+    assert rank_tasks(tasks, k=1, energy="Peak", now=NOW)[0]["id"] == "hard"
+
+
+def test_custom_weights_override_defaults():
+    tasks = [make_task("long", "High", minutes=240), make_task("short", "Low", minutes=5)]
+    assert rank_tasks(tasks, now=NOW)[0]["id"] == "long"
+    assert rank_tasks(tasks, weights={"effort": 20.0}, now=NOW)[0]["id"] == "short"
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import resources
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def clean_resources():
+    resources.reset()
+    yield
+    resources.reset()
+
+
+def test_importing_agent_builds_nothing():
+    pytest.importorskip("langgraph")
+    code = ("import sys, agent, resources; "
+            "print(sorted(resources._instances), 'langchain_openai' in sys.modules, 'faiss' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[] False False"
+
+
+def test_resources_are_built_once_and_can_be_overridden(monkeypatch):
+    calls = []
+    monkeypatch.setitem(resources._factories, "llm", lambda: calls.append(1) or object())
+    first = resources.get_llm()
+    assert resources.get_llm() is first and calls == [1]
+    assert resources.is_loaded("llm")
+
+    fake = object()
+    resources.override("llm", fake)
+    assert resources.get_llm() is fake
+    resources.reset("llm")
+    assert not resources.is_loaded("llm")
+    assert resources.get_llm() is not fake and calls == [1, 1]
+
+
+def test_unknown_resource():
+    with pytest.raises(KeyError):
+        resources.get("missing")
+
+
+def test_a_forked_process_rebuilds_its_clients(monkeypatch):
+    resources.override("llm", "parent client")
+    monkeypatch.setattr(resources, "_owner_pid", os.getpid() + 1)  # as seen from a forked child
+    monkeypatch.setitem(resources._factories, "llm", lambda: "child client")
+    assert resources.get_llm() == "child client"
+    assert resources._owner_pid == os.getpid()
@@ -0,0 +1,137 @@
+import itertools
+import random
+from datetime import datetime
+
+from scheduler import _Block, _exact, _greedy, _Item, _value, block_minutes, schedule_day, schedule_more, unschedule
+
+DAY = "2026-10-17"
+
+
+def make_task(task_id, minutes, priority=2, energy=3, deadline=None):
+    return {"id": task_id, "title": task_id, "estimated_time": minutes, "priority": priority,
+            "energy_required": energy, "deadline": deadline}
+
+
+def brute_force(items, blocks):
+    """Best value over every assignment, placing tasks in item order like the solvers"""
+    best = 0.0
+    for assignment in itertools.product([None] + list(range(len(blocks))), repeat=len(items)):
+        free = [block.end - block.start for block in blocks]
+        cursor = [block.start for block in blocks]
+        feasible = True
+        for item, index in zip(items, assignment):
+            if index is None:
+                continue
+            if free[index] < item.minutes or cursor[index] + item.minutes > item.deadline:
+                feasible = False
+                break
+            free[index] -= item.minutes
+            cursor[index] += item.minutes
+        if feasible:
+            best = max(best, _value(items, blocks, assignment))
+    return best
+
+
+def random_instance(rng):
+    day = datetime.strptime(DAY, "%Y-%m-%d")
+    tasks = [
+        make_task(str(i), rng.choice([15, 30, 45, 60, 90]), rng.randint(1, 4), rng.randint(1, 5),
+                  rng.choice([None, None, f"{DAY}T{rng.randint(8, 20):02d}:00:00"]))
+        for i in range(rng.randint(1, 5))
+    ]
+    time_blocks = [{"start": "08:00 AM", "end": "09:30 AM"}, {"start": "01:00 PM", "end": "02:00 PM"},
+                   {"start": "07:00 PM", "end": "08:00 PM"}][:rng.randint(1, 3)]
+    items = sorted((_Item(task, day) for task in tasks), key=_Item.sort_key)
+    return items, time_blocks, rng.randint(1, 5)
+
+
+def test_exact_search_matches_brute_force_and_never_loses_to_greedy():
+    rng = random.Random(7)
+    improved = 0
+    for _ in range(300):
+        items, time_blocks, energy = random_instance(rng)
+        greedy = _greedy(items, [_Block(i, block, energy) for i, block in enumerate(time_blocks)])
+        blocks = [_Block(i, block, energy) for i, block in enumerate(time_blocks)]
+        exact = _exact(items, blocks, greedy)
+        greedy_value, exact_value = _value(items, blocks, greedy), _value(items, blocks, exact)
+        assert exact_value >= greedy_value - 1e-9
+        assert abs(exact_value - brute_force(items, blocks)) < 1e-9
+        improved += exact_value > greedy_value + 1e-9
+    assert improved  # the exact solver matters on some instances
+
+
+def test_tasks_only_go_where_they_finish_before_the_deadline():
+    blocks = [{"start": "09:00 AM", "end": "10:00 AM"}, {"start": "02:00 PM", "end": "04:00 PM"}]
+    tasks = [
+        make_task("due-ten", 60, deadline=f"{DAY}T10:00:00"),
+        make_task("due-half-nine", 60, priority=4, deadline=f"{DAY}T09:30:00"),
+        make_task("anytime", 60),
+    ]
+    schedule = schedule_day(tasks, blocks, 3, DAY)
+    placed = {entry["id"]: block["start"] for block in schedule["blocks"] for entry in block["tasks"]}
+    assert placed == {"due-ten": "09:00 AM", "anytime": "02:00 PM"}
+    assert schedule["unscheduled"] == ["due-half-nine"]
+
+
+def test_entries_are_laid_out_back_to_back_within_a_block():
+    schedule = schedule_day([make_task("a", 30, priority=3), make_task("b", 45)],
+                            [{"start": "09:00 AM", "end": "11:00 AM"}], 3, DAY)
+    block = schedule["blocks"][0]
+    assert [(entry["id"], entry["start"], entry["end"]) for entry in block["tasks"]] == [
+        ("a", "09:00 AM", "09:30 AM"), ("b", "09:30 AM", "10:15 AM")]
+    assert block["free_minutes"] == 45
+
+
+def test_large_instances_fall_back_to_greedy():
+    tasks = [make_task(str(i), 30, priority=1 + i % 4) for i in range(40)]
+    blocks = [{"start": "09:00 AM", "end": "11:00 AM"}, {"start": "02:00 PM", "end": "03:00 PM"}]
+    schedule = schedule_day(tasks, blocks, 3, DAY)
+    assert sum(len(block["tasks"]) for block in schedule["blocks"]) == 6
+    assert len(schedule["unscheduled"]) == 34
+
+
+def test_block_past_midnight_wraps():
+    assert block_minutes({"start": "11:00 PM", "end": "01:00 AM"}) == 120
+
+
+def layout(schedule):
+    return [[(entry["id"], entry["start"], entry["end"]) for entry in block["tasks"]] for block in schedule["blocks"]]
+
+
+def test_edits_only_move_the_changed_tasks():
+    blocks = [{"start": "09:00 AM", "end": "11:00 AM"}, {"start": "11:00 PM", "end": "01:00 AM"}]
+    schedule = schedule_day([make_task("a", 30, priority=4), make_task("b", 45, priority=3), make_task("c", 45)],
+                            blocks[:1], 3, DAY)
+    schedule["blocks"].append(schedule_day([make_task("late", 90)], blocks[1:], 3, DAY)["blocks"][0])
+    assert layout(schedule)[0] == [("a", "09:00 AM", "09:30 AM"), ("b", "09:30 AM", "10:15 AM"),
+                                   ("c", "10:15 AM", "11:00 AM")]
+
+    freed = unschedule(schedule, {"b", "missing"})
+    assert layout(freed)[0] == [("a", "09:00 AM", "09:30 AM"), ("c", "10:15 AM", "11:00 AM")]
+    assert freed["blocks"][0]["free_minutes"] == 45
+    assert freed["blocks"][1] is schedule["blocks"][1]
+    assert layout(schedule)[0][1][0] == "b"  # the old schedule is left as it was
+
+    # new tasks take the earliest gap that fits, in priority order
+    more = schedule_more(freed, [make_task("d", 30), make_task("e", 15, priority=4), make_task("f", 60)], DAY)
+    assert layout(more)[0] == [("a", "09:00 AM", "09:30 AM"), ("e", "09:30 AM", "09:45 AM"),
+                               ("d", "09:45 AM", "10:15 AM"), ("c", "10:15 AM", "11:00 AM")]
+    assert more["blocks"][0]["free_minutes"] == 0
+    # the midnight block has 30 minutes left, after "late"; f needs 60
+    assert layout(more)[1] == [("late", "11:00 PM", "12:30 AM")]
+    assert more["unscheduled"] == ["f"]
+    assert unschedule(more, ["f"])["unscheduled"] == []
+
+    wrapped = schedule_more(more, [make_task("g", 30)], DAY)
+    assert layout(wrapped)[1] == [("late", "11:00 PM", "12:30 AM"), ("g", "12:30 AM", "01:00 AM")]
+
+
+def test_added_tasks_respect_deadlines_and_energy():
+    blocks = [{"start": "09:00 AM", "end": "10:00 AM"}, {"start": "02:00 PM", "end": "03:00 PM"}]
+    schedule = schedule_day([], blocks, 3, DAY)
+    assert schedule["blocks"][0]["energy"] > schedule["blocks"][1]["energy"]
+    more = schedule_more(schedule, [make_task("focus", 30, energy=5), make_task("easy", 30, energy=1),
+                                    make_task("due-two", 30, energy=1, deadline=f"{DAY}T09:20:00")], DAY)
+    placed = {entry["id"]: entry["start"] for block in more["blocks"] for entry in block["tasks"]}
+    assert placed == {"focus": "09:00 AM", "easy": "02:00 PM"}
+    assert more["unscheduled"] == ["due-two"]
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("langgraph")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    with TestClient(server.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("body, field", [
+    ({"mood": "cheerful"}, "mood"),
+    ({"energy": 9}, "energy"),
+    ({"tasks": [{"title": "Write report", "priority": "huge"}]}, "priority"),
+    ({"tasks": [{"title": "Write report", "energy_required": "wired"}]}, "energy_required"),
+])
+def test_unknown_enum_values_are_rejected_with_422(client, body, field):
+    response = client.post("/plan", json=body)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == field
+
+
+def test_calendar_events_with_utc_offsets_are_read_as_local_time():
+    events = [{"title": "Call", "start": "2026-10-17T15:00:00Z", "end": "2026-10-17T16:00:00+00:00"}]
+    plan = server.PlanRequest(calendar_events=events)
+    start = server.local_datetime("2026-10-17T15:00:00Z")
+    assert plan.calendar_events[0]["start"] == start.isoformat()
+    assert start.tzinfo is None
+    assert server.state_from_request(plan)["daily_context"]["calendar_events"] == plan.calendar_events
+
+
+@pytest.mark.parametrize("event", [{"title": "Call"}, {"start": "tomorrow", "end": "later"}])
+def test_malformed_calendar_events_are_rejected_with_422(client, event):
+    response = client.post("/plan", json={"calendar_events": [event]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == "calendar_events"
+
+
+@pytest.mark.parametrize("block", [{"start": "9am", "end": "10am"}, {"start": "09:00 AM"}, {"start": 9, "end": 10}])
+def test_malformed_time_blocks_are_rejected_with_422(client, block):
+    response = client.post("/plan", json={"available_time_blocks": [block]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:3] == ["body", "available_time_blocks", 0]
+
+
+def test_time_blocks_reach_the_plan_as_given():
+    plan = server.PlanRequest(available_time_blocks=[{"start": "09:00 AM", "end": "10:30 AM"}])
+    blocks = server.state_from_request(plan)["daily_context"]["available_time_blocks"]
+    assert blocks == [{"start": "09:00 AM", "end": "10:30 AM"}]
@@ -0,0 +1,41 @@
+import os
+import threading
+
+from task_journal import JOURNAL_FILE, TaskJournal
+
+
+def journal_path(journal, user_id):
+    return os.path.join(journal._dir(user_id), JOURNAL_FILE)
+
+
+def test_concurrent_records_reach_journal_in_seq_order(tmp_path):
+    journal = TaskJournal(root=str(tmp_path), snapshot_every=10_000)
+    journal.task_added("u", {"id": "seed", "title": "seed"})
+
+    def add_many(prefix):
+        for i in range(200):
+            journal.task_added("u", {"id": f"{prefix}{i}", "title": "t"})
+
+    threads = [threading.Thread(target=add_many, args=(prefix,)) for prefix in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(journal.recover("u")) == 801
+    journal.close()
+
+
+def test_torn_tail_is_truncated_before_next_append(tmp_path):
+    journal = TaskJournal(root=str(tmp_path))
+    journal.task_added("u", {"id": "1", "title": "first"})
+    journal.sync()
+    journal.close()
+    with open(journal_path(journal, "u"), "a", encoding="utf-8") as torn:
+        torn.write('{"seq":2,"type":"add","ta')
+
+    journal = TaskJournal(root=str(tmp_path))
+    journal.task_added("u", {"id": "2", "title": "second"})
+    journal.task_added("u", {"id": "3", "title": "third"})
+    assert [task["id"] for task in journal.recover("u")] == ["1", "2", "3"]
+    journal.close()
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import task_model
+from task_model import CompactTask, decode_compact, decode_tasks, decode_time, encode_tasks, encode_time
+from task_types import EnergyLevel, Task, TaskPriority, TaskStatus
+
+
+def make_task(task_id="t1", category="work", **overrides):
+    task = Task(
+        id=task_id,
+        title=f"Task {task_id}",
+        description="something to do",
+        priority=TaskPriority.HIGH,
+        estimated_time=45,
+        category=category,
+        deadline="2026-10-20T17:00:00",
+        energy_required=EnergyLevel.MODERATE,
+        status=TaskStatus.PENDING,
+        created_at="2026-10-17T09:30:15.250000",
+        completed_at=None,
+        user_created=True,
+    )
+    task.update(overrides)
+    return task
+
+
+@pytest.fixture
+def fresh_categories(monkeypatch):
+    """Start from an empty category table, as a new process would"""
+    def reset():
+        monkeypatch.setattr(task_model, "_categories", [])
+        monkeypatch.setattr(task_model, "_category_codes", {})
+    reset()
+    return reset
+
+
+def test_compact_task_round_trip():
+    task = make_task(status=TaskStatus.COMPLETED, completed_at="2026-10-17T11:00:00")
+    compact = CompactTask.from_task(task)
+    assert isinstance(compact.deadline, int) and isinstance(compact.created_at, int)
+    assert compact.priority == TaskPriority.HIGH.value
+    assert compact.to_task() == task
+    assert CompactTask.from_task(compact.to_task()) == compact
+
+
+def test_encode_time_keeps_what_it_cannot_reproduce():
+    assert encode_time(None) is None and decode_time(None) is None
+    # naive timestamps become integers and read back identically
+    for value in ("2026-10-17T09:30:00", "2026-10-17T09:30:15.250000", "1969-12-31T23:59:59"):
+        micros = encode_time(value)
+        assert isinstance(micros, int)
+        assert decode_time(micros) == value
+    assert encode_time("1970-01-01T00:00:01") == 1_000_000
+    # offsets, date-only values and free text are kept verbatim
+    for value in ("2026-10-17T09:30:00+02:00", "2026-10-17", "tomorrow"):
+        assert encode_time(value) == value
+        assert decode_time(value) == value
+
+
+def test_encode_decode_tasks_round_trip():
+    tasks = [
+        make_task("a"),
+        make_task("b", category="health", deadline=None, user_created=False),
+        make_task("c", category="work", deadline="2026-10-20", status=TaskStatus.IN_PROGRESS),
+        make_task("d", category="learning", created_at="2026-10-17T09:30:00+00:00"),
+    ]
+    data = encode_tasks(tasks)
+    assert decode_tasks(data) == tasks
+    # compact and dict tasks can be mixed on the way in
+    assert decode_tasks(encode_tasks([CompactTask.from_task(tasks[0]), tasks[1]])) == tasks[:2]
+    assert encode_tasks([]) and decode_tasks(encode_tasks([])) == []
+
+
+def test_category_codes_are_remapped_between_processes(fresh_categories):
+    task_model.category_code("errands")
+    task_model.category_code("work")
+    tasks = [make_task("a", category="health"), make_task("b", category="work"), make_task("c", category="health")]
+    data = encode_tasks(tasks)
+    # only the categories in use are shipped, by name
+    assert json.loads(data)["categories"] == ["work", "health"]
+
+    fresh_categories()
+    task_model.category_code("health")
+    decoded = decode_compact(data)
+    assert [task_model.category_name(task.category) for task in decoded] == ["health", "work", "health"]
+    assert [task.to_task() for task in decoded] == tasks
+
+
+def test_unknown_version_is_rejected():
+    payload = json.loads(encode_tasks([make_task()]))
+    payload["v"] = task_model.FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="version"):
+        decode_tasks(json.dumps(payload).encode())
+    del payload["v"]
+    with pytest.raises(ValueError):
+        decode_tasks(json.dumps(payload).encode())
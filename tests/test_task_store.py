@@ -0,0 +1,25 @@
+from task_store import TaskStore
+
+
+def make_tasks():
+    return [
+        {"id": "1", "status": "Pending", "category": "work", "priority": "High"},
+        {"id": "2", "status": "Pending", "category": "work", "priority": "Low"},
+        {"id": "3", "status": "Completed", "category": "work", "priority": "High"},
+        {"id": "4", "status": "Pending", "category": "health", "priority": "High"},
+        {"id": "5", "status": "Completed", "category": "learning", "priority": "Low"},
+    ]
+
+
+def test_counts_restricted_to_matching_tasks():
+    store = TaskStore(make_tasks())
+    assert store.counts("category") == {"work": 3, "health": 1, "learning": 1}
+    assert store.counts("category", status="Pending") == {"work": 2, "health": 1}
+    assert store.counts("priority", status="Pending", category="work") == {"High": 1, "Low": 1}
+
+
+def test_counts_follow_status_transitions():
+    store = TaskStore(make_tasks())
+    store.set_status("4", "Completed")
+    assert store.counts("category", status="Pending") == {"work": 2}
+    assert store.count("status", "Completed") == 3